@@ -0,0 +1,91 @@
+"""
+Benchmark for the history trend analysis behind `caniscrape history`.
+
+Fills a temporary scan history with a year of synthetic scans of many hosts (scores drifting and
+jumping as WAFs and CAPTCHAs come and go), then times the per-host trend summary and the full
+history of the busiest host and URL.
+
+Usage:
+    python benchmarks/history_trends.py [--hosts 300] [--scans 5000] [--runs 5]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from caniscrape.history import host_trends, target_history
+from caniscrape.history_store import ScanStore
+
+def _scan(rng: random.Random, waf: bool, captcha: bool) -> dict:
+    score = (3 if waf else 0) + (5 if captcha else 0) + rng.choice((0, 0, 0, 1))
+    return {
+        'score_card': {'score': min(score, 10), 'label': 'Hard' if score >= 5 else 'Easy'},
+        'protections': {
+            'waf': {'status': 'success', 'wafs': [{'name': 'Cloudflare'}] if waf else []},
+            'captcha': {'status': 'success', 'captcha_detected': captcha},
+            'rate_limit': {'status': rng.choice(('success', 'success', 'error'))},
+            'tls': {'status': 'active' if waf else 'inactive'},
+        }
+    }
+
+def fill_store(store: ScanStore, hosts: int, scans: int, seed: int = 1) -> None:
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    pages = [(f'https://site{h}.example.com/{page}', rng.random() < 0.3, rng.random() < 0.1) for h in range(hosts) for page in ('', 'products')]
+    for i in range(scans):
+        index = rng.randrange(len(pages))
+        url, waf, captcha = pages[index]
+        if rng.random() < 0.02:
+            waf = not waf
+        if rng.random() < 0.01:
+            captcha = not captcha
+        pages[index] = (url, waf, captcha)
+        scanned_at = start + timedelta(minutes=i * 365 * 24 * 60 / scans)
+        store.add_scan(url, _scan(rng, waf, captcha), cli_version='bench', scanned_at=scanned_at, upload_status=None)
+
+def _median(fn, runs: int) -> tuple[float, object]:
+    times = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--hosts', type=int, default=300, help='Number of synthetic hosts (two URLs each).')
+    parser.add_argument('--scans', type=int, default=5000, help='Total number of stored scans.')
+    parser.add_argument('--runs', type=int, default=5, help='Timed runs per query (median is reported).')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ScanStore(Path(directory) / 'history.db')
+        started = time.perf_counter()
+        fill_store(store, args.hosts, args.scans)
+        print(f'Stored {args.scans} scans of {args.hosts} hosts in {time.perf_counter() - started:.1f}s, {args.runs} runs per query\n')
+
+        seconds, trends = _median(lambda: host_trends(store), args.runs)
+        print(f'{"host trends":<22} {seconds * 1000:>8.1f}ms  {len(trends)} hosts')
+
+        busiest = max(trends, key=lambda trend: trend.scans).host
+        seconds, history = _median(lambda: target_history(store, busiest), args.runs)
+        print(f'{"busiest host":<22} {seconds * 1000:>8.1f}ms  {len(history.series)} scans, {len(history.events)} events')
+
+        url = history.series[0].url
+        seconds, history = _median(lambda: target_history(store, url), args.runs)
+        print(f'{"one URL":<22} {seconds * 1000:>8.1f}ms  {len(history.series)} scans, {len(history.events)} events')
+        store.close()
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
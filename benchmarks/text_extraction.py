@@ -0,0 +1,107 @@
+"""
+Benchmark for the visible-text extraction backends used by the JS rendering analyzer.
+
+Generates a large synthetic e-commerce page (product grid, inline scripts and styles,
+JSON state blobs), checks that every backend produces the same output as the
+BeautifulSoup reference, and reports timing and peak memory.
+
+Usage:
+    python benchmarks/text_extraction.py [--size-mb 4] [--runs 5]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from caniscrape.utils.text_extractor import BACKENDS
+
+WORDS = ('wireless', 'headphones', 'noise', 'cancelling', 'bluetooth', 'cotton', 'organic', 'sale',
+         'limited', 'edition', 'free', 'shipping', 'returns', 'reviews', 'stars', 'color', 'size',
+         'café', 'naïve', '&amp;', '&nbsp;', '&#8364;')
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(n))
+
+def build_page(size_mb: float, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    head = [
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Shop - All Products</title>',
+        '<style>.card{display:flex}.price{color:red}</style>',
+        '<script>window.__STATE__ = {"items": [' + ','.join('{"id": %d}' % i for i in range(2000)) + ']};</script>',
+        '</head><body><header><nav><a href="/">Home</a> <a href="/sale">Sale</a></nav></header><main id="grid">',
+    ]
+    parts = list(head)
+    size = sum(len(p) for p in parts)
+    target = int(size_mb * 1024 * 1024)
+    i = 0
+    while size < target:
+        card = (
+            f'<div class="card" data-id="{i}">\n'
+            f'  <h2 class="title">{_sentence(rng, 4)}</h2>\n'
+            f'  <p class="desc">{_sentence(rng, 30)}</p>\n'
+            f'  <span class="price">${rng.randint(5, 500)}.99</span>  <!-- price {i} -->\n'
+            f'  <script type="application/ld+json">{{"@type": "Product", "sku": "{i}"}}</script>\n'
+            f'  <ul><li>{_sentence(rng, 3)}</li><li>{_sentence(rng, 3)}</li></ul>\n'
+            f'</div>\n'
+        )
+        parts.append(card)
+        size += len(card)
+        i += 1
+    parts.append('</main><footer><p>&copy; 2024 Shop Inc. All rights reserved.</p></footer></body></html>')
+    return ''.join(parts)
+
+def _measure(fn, html: str, runs: int) -> tuple[float, float, str]:
+    times = []
+    output = ''
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = fn(html)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak / (1024 * 1024), output
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size-mb', type=float, default=4.0, help='Approximate size of the generated page.')
+    parser.add_argument('--runs', type=int, default=5, help='Timed runs per backend (median is reported).')
+    args = parser.parse_args()
+
+    html = build_page(args.size_mb)
+    print(f'Page size: {len(html) / (1024 * 1024):.2f} MB, {args.runs} runs per backend\n')
+
+    results = {}
+    for name, fn in BACKENDS.items():
+        try:
+            results[name] = _measure(fn, html, args.runs)
+        except ImportError as e:
+            print(f'{name:<8} skipped ({e})')
+
+    reference = results.get('bs4')
+    print(f'{"backend":<8} {"median":>10} {"peak mem":>10} {"speedup":>9}  output')
+    failed = False
+    for name, (seconds, peak_mb, output) in results.items():
+        speedup = f'{reference[0] / seconds:.1f}x' if reference else '-'
+        if reference is None:
+            matches = 'n/a'
+        elif output == reference[2]:
+            matches = 'identical'
+        else:
+            matches = 'DIFFERS'
+            failed = True
+        print(f'{name:<8} {seconds * 1000:>8.1f}ms {peak_mb:>8.1f}MB {speedup:>9}  {matches}')
+
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,30 +4,23 @@ from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeo
 import math
 import random
 
-from ..utils.playwright_proxy_parser import parse_proxy_for_playwright
+from ..utils.browser_launcher import open_browser, open_context
 from ..utils.browser_identities import MODERN_BROWSER_IDENTITIES
 
 TEST_IDENTITY = random.choice(MODERN_BROWSER_IDENTITIES)
 
 HONEYPOT_THRESHOLD = 3
 
-def detect_honeypots(url: str, scan_depth: str = 'default', proxies: tuple[str, ...] = ()) -> dict[str, any]:
+def detect_honeypots(url: str, scan_depth: str = 'default', proxies: tuple[str, ...] = (), browser_endpoint: str | None = None) -> dict[str, any]:
     """
     Launches a headless browser to analyze a page for honeypots, which are traps for bots.
     """
+    proxy = random.choice(proxies) if proxies else None
     try:
-        with sync_playwright() as p:
-            launch_options = {'headless': True}
-            if proxies:
-                proxy = random.choice(proxies)
-                proxy_config = parse_proxy_for_playwright(proxy)
-                if proxy_config:
-                    launch_options['proxy'] = proxy_config
-                
-            browser = p.chromium.launch(**launch_options)
-            page = browser.new_page(extra_http_headers=TEST_IDENTITY)
+        with sync_playwright() as p, open_browser(p, browser_endpoint) as browser, open_context(browser, 'behavioral', proxy, extra_http_headers=TEST_IDENTITY) as context:
+            page = context.new_page()
 
-            page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "font", "media"] else route.continue_())
+            page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "font", "media"] else route.fallback())
 
             page.goto(url, wait_until='domcontentloaded', timeout=30000)
 
@@ -35,7 +28,6 @@ def detect_honeypots(url: str, scan_depth: str = 'default', proxies: tuple[str,
             total_links = links_locator.count()
 
             if total_links == 0:
-                browser.close()
                 return {'status': 'success', 'total_links': 0, 'invisible_links': 0, 'honeypot_detected': False}
             
             links_to_check = 0
@@ -51,8 +43,6 @@ def detect_honeypots(url: str, scan_depth: str = 'default', proxies: tuple[str,
                 link = links_locator.nth(i)
                 if not link.is_visible():
                     invisible_links_count += 1
-            
-            browser.close()
 
             honeypot_detected = invisible_links_count > HONEYPOT_THRESHOLD
 
@@ -4,7 +4,8 @@ from playwright.sync_api import sync_playwright, Page, TimeoutError as Playwrigh
 import random
 
 from ..utils.captcha_solvers import get_solver, CaptchaSolverError
-from ..utils.playwright_proxy_parser import parse_proxy_for_playwright
+from ..utils.browser_launcher import open_browser, open_context
+from ..utils.page_readiness import PageReadinessTracker
 
 CAPTCHA_FINGERPRINTS = {
     "reCAPTCHA": [
@@ -33,36 +34,29 @@ def _scan_for_captcha_fingerprints(page: Page, network_requests: list[str]) -> s
                     return provider
     return None
 
-def detect_captcha(url: str, service_name: str | None, api_key: str | None, proxies: tuple[str, ...] = ()) -> dict[str, any]:
+def detect_captcha(url: str, service_name: str | None, api_key: str | None, proxies: tuple[str, ...] = (), browser_endpoint: str | None = None) -> dict[str, any]:
     """
     Analyzes a URL to detect the presence and type of CAPTCHA.
     """
+    proxy = random.choice(proxies) if proxies else None
     try:
-        with sync_playwright() as p:
-            launch_options = {'headless': True}
-            if proxies:
-                proxy = random.choice(proxies)
-                proxy_config = parse_proxy_for_playwright(proxy)
-                if proxy_config:
-                    launch_options['proxy'] = proxy_config
+        with sync_playwright() as p, open_browser(p, browser_endpoint) as browser, open_context(browser, 'captcha', proxy) as context:
+            page = context.new_page()
 
-            browser = p.chromium.launch(**launch_options)
-            page = browser.new_page()
-
-            page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "font", "media"] else route.continue_())
+            page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "font", "media"] else route.fallback())
 
             captured_requests = []
             def capture_request(request):
                 captured_requests.append(request.url.lower())
             page.on('request', capture_request)
+            readiness = PageReadinessTracker(page)
 
             try:
                 page.goto(url, wait_until='load', timeout=60000)
-                page.wait_for_load_state('networkidle', timeout=5000)
             except:
                 pass
 
-            page.wait_for_timeout(2000)
+            readiness_wait_ms = readiness.wait_until_quiet()
 
             captcha_on_load = _scan_for_captcha_fingerprints(page, captured_requests)
 
@@ -86,14 +80,11 @@ def detect_captcha(url: str, service_name: str | None, api_key: str | None, prox
                         else:
                             raise CaptchaSolverError(f'Solving for "{captcha_on_load}" is not yet supported.')
                         
-                        browser.close()
-                        return {'status': 'success', 'captcha_detected': True, 'captcha_type': captcha_on_load, 'trigger_condition': 'on page load', 'solve_status': 'solved', 'details': f'A {captcha_on_load} was detected and successfully solved by the {service_name} service.'}
+                        return {'status': 'success', 'captcha_detected': True, 'captcha_type': captcha_on_load, 'trigger_condition': 'on page load', 'solve_status': 'solved', 'details': f'A {captcha_on_load} was detected and successfully solved by the {service_name} service.', 'readiness_wait_ms': readiness_wait_ms}
                     except (CaptchaSolverError, ValueError, ImportError) as e:
-                        browser.close()
-                        return {'status': 'success', 'captcha_detected': True, 'captcha_type': captcha_on_load, 'trigger_condition': 'on page load', 'solve_status': 'failed', 'details': f'A {captcha_on_load} was detected but the solving attempt failed: {str(e)}'}
+                        return {'status': 'success', 'captcha_detected': True, 'captcha_type': captcha_on_load, 'trigger_condition': 'on page load', 'solve_status': 'failed', 'details': f'A {captcha_on_load} was detected but the solving attempt failed: {str(e)}', 'readiness_wait_ms': readiness_wait_ms}
                 else:
-                    browser.close()
-                    return {'status': 'success', 'captcha_detected': True, 'captcha_type': captcha_on_load, 'trigger_condition': 'on page load', 'solve_status': 'not attempted', 'details': f'A {captcha_on_load} was detected. Provide --captcha-service <your-captcha-service> --captcha-api-key <your-captchasolver-key> to attempt solving.'}
+                    return {'status': 'success', 'captcha_detected': True, 'captcha_type': captcha_on_load, 'trigger_condition': 'on page load', 'solve_status': 'not attempted', 'details': f'A {captcha_on_load} was detected. Provide --captcha-service <your-captcha-service> --captcha-api-key <your-captchasolver-key> to attempt solving.', 'readiness_wait_ms': readiness_wait_ms}
             
             captured_requests.clear()
 
@@ -101,12 +92,11 @@ def detect_captcha(url: str, service_name: str | None, api_key: str | None, prox
                 page.reload(wait_until='domcontentloaded')
             
             captcha_after_burst = _scan_for_captcha_fingerprints(page, captured_requests)
-            browser.close()
 
             if captcha_after_burst:
-                return {'status': 'success', 'captcha_detected': True, 'captcha_type': captcha_after_burst, 'trigger_condition': 'after burst of requests'}
+                return {'status': 'success', 'captcha_detected': True, 'captcha_type': captcha_after_burst, 'trigger_condition': 'after burst of requests', 'readiness_wait_ms': readiness_wait_ms}
             
-            return {'status': 'success', 'captcha_detected': False}
+            return {'status': 'success', 'captcha_detected': False, 'readiness_wait_ms': readiness_wait_ms}
     except PlaywrightTimeoutError:
         return {'status': 'error', 'message': 'Page load timed out.'}
     except Exception as e:
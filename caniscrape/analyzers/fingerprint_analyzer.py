@@ -4,7 +4,8 @@ from playwright.sync_api import sync_playwright, Playwright, Page, TimeoutError
 from typing import Any
 import json
 
-from ..utils.playwright_proxy_parser import parse_proxy_for_playwright
+from ..utils.browser_launcher import open_browser, open_context
+from ..utils.page_readiness import PageReadinessTracker
 
 KNOWN_BOT_DETECTION_SCRIPTS = {
     "PerimeterX (HUMAN)": [
@@ -77,7 +78,7 @@ JS_PROBE_SCRIPT = """
 };
 """
 
-def analyze_fingerprinting(url: str, proxies: tuple[str, ...] = ()) ->  dict[str, Any]:
+def analyze_fingerprinting(url: str, proxies: tuple[str, ...] = (), browser_endpoint: str | None = None) ->  dict[str, Any]:
     """
     Launches a headless browser to probe for advanced, client-side protections
     and behavioral analysis
@@ -87,31 +88,26 @@ def analyze_fingerprinting(url: str, proxies: tuple[str, ...] = ()) ->  dict[str
         'message': 'Analysis did not complete.',
         'detected_services': [],
         'canvas_fingerprinting_signal': False,
-        'behavioral_listeners_detected': []
+        'behavioral_listeners_detected': [],
+        'readiness_wait_ms': None
     }
 
     captured_script_urls = set()
 
+    proxy = random.choice(proxies) if proxies else None
     try:
-        with sync_playwright() as p:
-            launch_options = {'headless': True}
-            if proxies:
-                proxy = random.choice(proxies)
-                proxy_config = parse_proxy_for_playwright(proxy)
-                if proxy_config:
-                    launch_options['proxy'] = proxy_config
+        with sync_playwright() as p, open_browser(p, browser_endpoint) as browser, open_context(browser, 'fingerprint', proxy) as context:
+            page = context.new_page()
 
-            browser = p.chromium.launch(**launch_options)
-            page = browser.new_page()
-
-            page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "font", "media"] else route.continue_())
+            page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "font", "media"] else route.fallback())
 
             page.add_init_script(JS_PROBE_SCRIPT)
 
             page.on('request', lambda request: captured_script_urls.add(request.url))
+            readiness = PageReadinessTracker(page)
 
             page.goto(url, wait_until='load', timeout=30000)
-            page.wait_for_timeout(3000)
+            results['readiness_wait_ms'] = readiness.wait_until_quiet()
 
             static_probes = page.evaluate(f"""
             () => {{
@@ -136,8 +132,6 @@ def analyze_fingerprinting(url: str, proxies: tuple[str, ...] = ()) ->  dict[str
 
             listener_log = page.evaluate('() => window.__caniscrape_listeners_log')
 
-            browser.close()
-
             for service, patterns in KNOWN_BOT_DETECTION_SCRIPTS.items():
                 for url_part in patterns:
                     if any(url_part in script_url for script_url in captured_script_urls):
@@ -1,8 +1,13 @@
 from __future__ import annotations
 import random
-from playwright.sync_api import sync_playwright, Playwright, Page, TimeoutError as PlaywrightTimeoutError
+import json
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from playwright.sync_api import sync_playwright, Playwright, Browser, Page, TimeoutError as PlaywrightTimeoutError
 
-from ..utils.playwright_proxy_parser import parse_proxy_for_playwright
+from ..utils.browser_launcher import open_browser, open_context
 
 FUNCTIONS_TO_CHECK = [
     "HTMLCanvasElement.prototype.toDataURL",
@@ -32,6 +37,10 @@ FUNCTION_SUSPICION_MAP = {
     "console.log": "Indicator of anti-debugging techniques."
 }
 
+BASELINE_CACHE_FILE = Path.home() / '.caniscrape' / 'integrity_baseline.json'
+
+_baseline_cache: dict[str, dict[str, str]] | None = None
+
 def _get_function_signatures(page: Page, functions: list[str]) -> dict[str, str]:
     """
     Excecutes JS in the page to get the string representations of functions.
@@ -60,10 +69,95 @@ def _get_function_signatures(page: Page, functions: list[str]) -> dict[str, str]
     """
     return page.evaluate(js_script, functions)
 
-def analyze_function_integrity(url: str, proxies: tuple[str, ...] = ()) -> dict[str, any]:
+def _baseline_cache_key(browser: Browser, functions: list[str]) -> str:
+    """
+    Clean signatures only change with the browser build or the list of checked functions.
+    """
+    functions_hash = hashlib.sha1(json.dumps(functions).encode()).hexdigest()[:12]
+    return f'{browser.browser_type.name}-{browser.version}-{functions_hash}'
+
+def _load_baseline_cache() -> dict[str, dict[str, str]]:
+    """
+    Load cached clean signatures from disk (once per process).
+    """
+    global _baseline_cache
+    if _baseline_cache is None:
+        try:
+            with open(BASELINE_CACHE_FILE, 'r') as f:
+                _baseline_cache = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            _baseline_cache = {}
+    return _baseline_cache
+
+def _save_baseline_cache(cache: dict[str, dict[str, str]]) -> None:
+    """
+    Save cached clean signatures to disk. A failed write only costs a re-computation next time.
+    Each write goes through its own temporary file, so concurrent scans never interleave on one.
+    """
+    temp_file = None
+    try:
+        BASELINE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=BASELINE_CACHE_FILE.parent, prefix=f'{BASELINE_CACHE_FILE.stem}.', suffix='.tmp', delete=False) as f:
+            temp_file = Path(f.name)
+            json.dump(cache, f, indent=2)
+        os.replace(temp_file, BASELINE_CACHE_FILE)
+    except Exception:
+        if temp_file is not None:
+            temp_file.unlink(missing_ok=True)
+
+def _get_clean_signatures(browser: Browser) -> dict[str, str]:
+    """
+    Returns the function signatures of a clean page for this browser build,
+    from the on-disk cache if possible, otherwise from a fresh about:blank context.
+    """
+    cache = _load_baseline_cache()
+    cache_key = _baseline_cache_key(browser, FUNCTIONS_TO_CHECK)
+
+    if cache_key in cache:
+        return cache[cache_key]
+
+    # Not opened with open_context: about:blank has no traffic to capture, and a default context keeps the
+    # baseline independent of the scan's context options.
+    clean_context = browser.new_context()
+    try:
+        clean_page = clean_context.new_page()
+        clean_page.goto('about:blank')
+        clean_signatures = _get_function_signatures(clean_page, FUNCTIONS_TO_CHECK)
+    finally:
+        clean_context.close()
+
+    cache[cache_key] = clean_signatures
+    _save_baseline_cache(cache)
+    return clean_signatures
+
+def _find_modified_functions(browser: Browser, url: str, proxies: tuple[str, ...] = ()) -> dict[str, str]:
+    """
+    Loads the target page and returns the functions whose signatures differ from the clean baseline.
+    """
+    clean_signatures = _get_clean_signatures(browser)
+
+    proxy = random.choice(proxies) if proxies else None
+    with open_context(browser, 'integrity', proxy) as target_context:
+        target_page = target_context.new_page()
+
+        target_page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "font", "media"] else route.fallback())
+
+        target_page.goto(url, wait_until='load', timeout=30000)
+
+        target_signatures = _get_function_signatures(target_page, FUNCTIONS_TO_CHECK)
+
+    modified = {}
+    for func_path, clean_sig in clean_signatures.items():
+        target_sig = target_signatures.get(func_path)
+        if clean_sig != target_sig:
+            modified[func_path] = FUNCTION_SUSPICION_MAP.get(func_path, 'Unknown modification.')
+    return modified
+
+def analyze_function_integrity(url: str, proxies: tuple[str, ...] = (), browser_endpoint: str | None = None, browser: Browser | None = None) -> dict[str, any]:
     """
     Compares critical browser functions on a target page to
     functions on a "clean" page.
+    If a browser is supplied it is used as-is and left open for the caller.
     """
     results = {
         'status': 'error',
@@ -72,47 +166,16 @@ def analyze_function_integrity(url: str, proxies: tuple[str, ...] = ()) -> dict[
     }
 
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-
-            clean_context = browser.new_context()
-            clean_page = clean_context.new_page()
-
-            clean_page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "font", "media"] else route.continue_())
-
-            clean_page.goto('about:blank')
-            clean_signatures = _get_function_signatures(clean_page, FUNCTIONS_TO_CHECK)
-            clean_context.close()
-
-            target_context_options = {}
-            if proxies:
-                proxy = random.choice(proxies)
-                proxy_config = parse_proxy_for_playwright(proxy)
-                if proxy_config:
-                    target_context_options['proxy'] = proxy_config
-            
-            target_context = browser.new_context(**target_context_options)
-            target_page = target_context.new_page()
-
-            target_page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "font", "media"] else route.continue_())
-            
-            target_page.goto(url, wait_until='load', timeout=30000)
-            
-            target_signatures = _get_function_signatures(target_page, FUNCTIONS_TO_CHECK)
-            target_context.close()
-
-            browser.close()
-
-            modified = {}
-            for func_path, clean_sig in clean_signatures.items():
-                target_sig = target_signatures.get(func_path)
-                if clean_sig != target_sig:
-                    modified[func_path] = FUNCTION_SUSPICION_MAP.get(func_path, 'Unknown modification.')
-
-            results['status'] = 'success'
-            results['message'] = 'Analysis complete.'
-            results['modified_functions'] = modified
-            return results
+        if browser is not None:
+            modified = _find_modified_functions(browser, url, proxies)
+        else:
+            with sync_playwright() as p, open_browser(p, browser_endpoint) as launched_browser:
+                modified = _find_modified_functions(launched_browser, url, proxies)
+
+        results['status'] = 'success'
+        results['message'] = 'Analysis complete.'
+        results['modified_functions'] = modified
+        return results
     
     except PlaywrightTimeoutError:
         results['message'] = 'Page load time out.'
@@ -120,4 +183,3 @@ def analyze_function_integrity(url: str, proxies: tuple[str, ...] = ()) -> dict[
     except Exception as e:
         results['message'] = str(e)
         return results
-
@@ -2,32 +2,45 @@ from __future__ import annotations
 
 import random
 from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
 from curl_cffi.requests import Session as CurlCffiSession
 
 from ..utils.browser_identities import MODERN_BROWSER_IDENTITIES
 from ..utils.impersonate_target import get_impersonate_target
-from ..utils.playwright_proxy_parser import parse_proxy_for_playwright
+from ..utils.browser_launcher import open_browser, open_context
+from ..utils.page_readiness import PageReadinessTracker
+from ..utils.scan_capture import get_active_capture
+from ..utils.response_log import observe_response
+from ..utils.text_extractor import extract_visible_text, extract_visible_text_by_region
+from ..utils.similarity import shingle_hashes, containment, jaccard, build_signature
 
 TEST_IDENTITY = random.choice(MODERN_BROWSER_IDENTITIES)
+JS_ONLY_REGION_THRESHOLD = 0.8
+MIN_REGION_SHINGLES = 3
+MAX_REPORTED_REGIONS = 10
 
 def _extract_visible_text(html_content: str) -> str:
     """
     Parses HTML and extracts the clean, visible text.
     """
-    if not html_content:
-        return
-    soup = BeautifulSoup(html_content, 'html.parser')
-
-    for script_or_style in soup(['script', 'style']):
-        script_or_style.decompose()
-    
-    text = soup.get_text()
-    lines = (line.strip() for line in text.splitlines())
-    chunks = (phrase.strip() for line in lines for phrase in line.split(' '))
-    return '\n'.join(chunk for chunk in chunks if chunk)
-
-def analyze_js_rendering(url: str, proxies: tuple[str, ...] = ()) -> dict[str, any]:
+    return extract_visible_text(html_content)
+
+def _find_js_only_regions(regions: dict[str, str], no_js_shingles: set[int]) -> list[dict[str, any]]:
+    """
+    Regions of the rendered page whose content is (almost) entirely absent without JavaScript.
+    """
+    js_only = []
+    for region, text in regions.items():
+        region_shingles = shingle_hashes(text)
+        if len(region_shingles) < MIN_REGION_SHINGLES:
+            continue
+        missing = 1 - containment(region_shingles, no_js_shingles)
+        if missing >= JS_ONLY_REGION_THRESHOLD:
+            js_only.append({'region': region, 'words': len(text.split()), 'missing_%': round(missing * 100, 2)})
+
+    js_only.sort(key=lambda r: r['words'], reverse=True)
+    return js_only[:MAX_REPORTED_REGIONS]
+
+def analyze_js_rendering(url: str, proxies: tuple[str, ...] = (), browser_endpoint: str | None = None) -> dict[str, any]:
     """
     Analyzes a URL to determine if JavaScript is required to render its main content.
     """
@@ -36,49 +49,63 @@ def analyze_js_rendering(url: str, proxies: tuple[str, ...] = ()) -> dict[str, a
 
     proxy = random.choice(proxies) if proxies else None
     proxies_dict = {"http": proxy, "https": proxy} if proxy else None
+    capture = get_active_capture()
     try:
-        with CurlCffiSession(impersonate=impersonate_target, proxies=proxies_dict) as session:
-            no_js_response = session.get(url, headers=TEST_IDENTITY, timeout=30)
-            no_js_response.raise_for_status()
-            no_js_text = _extract_visible_text(no_js_response.text)
-            len_no_js = len(no_js_text)
-
-        with sync_playwright() as p:
-            launch_options = {'headless': True}
-            if proxies:
-                proxy = random.choice(proxies)
-                proxy_config = parse_proxy_for_playwright(proxy)
-                if proxy_config:
-                    launch_options['proxy'] = proxy_config
-
-            browser = p.chromium.launch(**launch_options)
-            page = browser.new_page(extra_http_headers=TEST_IDENTITY)
-
-            page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "font", "media"] else route.continue_())
+        if capture and capture.replaying:
+            no_js_response = capture.replay_response('js', url)
+        else:
+            with CurlCffiSession(impersonate=impersonate_target, proxies=proxies_dict) as session:
+                no_js_response = session.get(url, headers=TEST_IDENTITY, timeout=30)
+            observe_response('js', url, no_js_response.status_code, no_js_response.headers, no_js_response.text)
+
+        no_js_response.raise_for_status()
+        no_js_text = _extract_visible_text(no_js_response.text)
+        len_no_js = len(no_js_text)
+        no_js_shingles = shingle_hashes(no_js_text)
+
+        proxy = random.choice(proxies) if proxies else None
+        with sync_playwright() as p, open_browser(p, browser_endpoint) as browser, open_context(browser, 'js', proxy, extra_http_headers=TEST_IDENTITY) as context:
+            page = context.new_page()
+
+            page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "font", "media"] else route.fallback())
+            readiness = PageReadinessTracker(page)
             
             try:
                 page.goto(url, wait_until='load', timeout=30000)
-                page.wait_for_load_state('networkidle', timeout=5000)
             except:
                 pass
 
-            page.wait_for_timeout(2000)
+            readiness_wait_ms = readiness.wait_until_quiet()
 
             js_html = page.content()
-            browser.close()
         
-        js_text = _extract_visible_text(js_html)
+        js_text, js_regions = extract_visible_text_by_region(js_html)
         len_js = len(js_text)
 
         if len_js == 0:
             return {'status': 'error', 'message': 'Could not extract content from the page with JS enabled.'}
-        
-        difference_percentage = (1 - (len_no_js / len_js)) * 100
+
+        js_shingles = shingle_hashes(js_text)
+
+        # Share of the rendered content that is missing without JS. Boilerplate present in both
+        # renders (cookie banners, footers) no longer skews this the way a length ratio did.
+        difference_percentage = (1 - containment(js_shingles, no_js_shingles)) * 100
+        length_difference_percentage = (1 - (len_no_js / len_js)) * 100
 
         is_required = difference_percentage > 25
         is_single_page_app = difference_percentage > 75
 
-        return {'status': 'success', 'js_required': is_required, 'is_spa': is_single_page_app, 'content_difference_%': round(difference_percentage, 2)}
-    
+        return {
+            'status': 'success',
+            'js_required': is_required,
+            'is_spa': is_single_page_app,
+            'content_difference_%': round(difference_percentage, 2),
+            'content_overlap_%': round(jaccard(js_shingles, no_js_shingles) * 100, 2),
+            'length_difference_%': round(length_difference_percentage, 2),
+            'js_only_regions': _find_js_only_regions(js_regions, no_js_shingles),
+            'signatures': {'no_js': build_signature(no_js_shingles), 'js': build_signature(js_shingles)},
+            'readiness_wait_ms': readiness_wait_ms
+        }
+
     except Exception as e:
         return {'status': 'error', 'message': str(e)}
\ No newline at end of file
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+from ..utils.response_log import ObservedResponse
+
+# A vendor is reported once its combined evidence reaches this confidence.
+CONFIDENT = 0.8
+# Weak single hints (e.g. one generic cookie) are still reported when wafw00f is unavailable.
+MIN_REPORTED = 0.5
+
+BLOCK_STATUS_CODES = {401, 403, 405, 406, 429, 501, 503}
+
+# Each signature: (name, manufacturer) as wafw00f reports it, and a list of matchers.
+# Matchers are (kind, key, value_pattern, weight):
+# - header: response header `key` is present (and its value matches `value_pattern`, if given)
+# - cookie: a cookie whose name matches `key` was set
+# - body:   a response body matches `key`
+# Weights are combined as independent evidence: confidence = 1 - prod(1 - weight).
+WAF_SIGNATURES: list[tuple[tuple[str, str | None], list[tuple[str, str, str | None, float]]]] = [
+    (('Cloudflare', 'Cloudflare Inc.'), [
+        ('header', 'cf-ray', None, 0.9),
+        ('header', 'server', r'cloudflare', 0.9),
+        ('header', 'cf-cache-status', None, 0.6),
+        ('header', 'cf-mitigated', None, 0.9),
+        ('cookie', r'^(__cf_bm|cf_clearance|__cfduid|__cflb|__cfruid)$', None, 0.8),
+        ('body', r'cdn-cgi/challenge-platform|attention required! \| cloudflare|cf-error-details|window\._cf_chl_opt', None, 0.9),
+    ]),
+    (('Cloudfront', 'Amazon'), [
+        ('header', 'x-amz-cf-id', None, 0.9),
+        ('header', 'x-amz-cf-pop', None, 0.8),
+        ('header', 'via', r'\(cloudfront\)', 0.9),
+        ('header', 'server', r'^cloudfront$', 0.8),
+        ('header', 'x-cache', r'cloudfront', 0.7),
+        ('body', r'generated by cloudfront \(cloudfront\)', None, 0.9),
+    ]),
+    (('AWS Elastic Load Balancer', 'Amazon'), [
+        ('header', 'x-amzn-waf-action', None, 0.9),
+        ('cookie', r'^AWSALB(CORS)?$', None, 0.6),
+        ('cookie', r'^aws-waf-token$', None, 0.9),
+        ('header', 'server', r'^awselb', 0.7),
+    ]),
+    (('Kona SiteDefender', 'Akamai'), [
+        ('header', 'server', r'akamaighost|akamainetstorage', 0.9),
+        ('header', 'x-akamai-transformed', None, 0.8),
+        ('header', 'akamai-grn', None, 0.9),
+        ('header', 'x-akamai-session-info', None, 0.8),
+        ('cookie', r'^(ak_bmsc|bm_sz|_abck|bm_sv|bm_mi)$', None, 0.8),
+        ('body', r'reference(&#32;|\s)(&#35;|#)\d+(&#46;|\.)[0-9a-f]+(&#46;|\.)\d+(&#46;|\.)[0-9a-f]+', None, 0.9),
+        ('body', r'errors\.edgesuite\.net', None, 0.9),
+    ]),
+    (('Incapsula', 'Imperva Inc.'), [
+        ('header', 'x-iinfo', None, 0.9),
+        ('header', 'x-cdn', r'imperva|incapsula', 0.9),
+        ('cookie', r'^(visid_incap_\d+|incap_ses_[\d_]+|nlbi_\d+)$', None, 0.9),
+        ('body', r'incapsula incident id|_incapsula_resource', None, 0.9),
+    ]),
+    (('DataDome', 'DataDome SAS'), [
+        ('header', 'x-datadome', None, 0.9),
+        ('header', 'x-datadome-cid', None, 0.9),
+        ('header', 'x-dd-b', None, 0.6),
+        ('cookie', r'^datadome$', None, 0.9),
+        ('body', r'captcha-delivery\.com|geo\.captcha-delivery', None, 0.9),
+    ]),
+    (('PerimeterX', 'PerimeterX'), [
+        ('cookie', r'^(_px\d?|_pxhd|_pxvid|_pxff_\w+|pxcts)$', None, 0.8),
+        ('body', r'px-captcha|perimeterx|client\.perimeterx\.net|/_px\d?/', None, 0.8),
+    ]),
+    (('Sucuri CloudProxy', 'Sucuri Inc.'), [
+        ('header', 'server', r'sucuri', 0.9),
+        ('header', 'x-sucuri-id', None, 0.9),
+        ('header', 'x-sucuri-cache', None, 0.8),
+        ('body', r'sucuri website firewall|cloudproxy@sucuri\.net', None, 0.9),
+    ]),
+    (('Fastly', 'Fastly CDN'), [
+        ('header', 'x-fastly-request-id', None, 0.9),
+        ('header', 'fastly-debug-digest', None, 0.8),
+        ('header', 'x-served-by', r'cache-\w+-\w+', 0.6),
+    ]),
+    (('Azure Front Door', 'Microsoft'), [
+        ('header', 'x-azure-ref', None, 0.9),
+        ('header', 'x-fd-healthprobe', None, 0.7),
+    ]),
+    (('Vercel WAF', 'Vercel'), [
+        ('header', 'x-vercel-id', None, 0.6),
+        ('header', 'x-vercel-mitigated', None, 0.9),
+        ('header', 'server', r'^vercel$', 0.5),
+    ]),
+    (('DDoS-GUARD', 'DDOS-GUARD CORP.'), [
+        ('header', 'server', r'ddos-guard', 0.9),
+        ('cookie', r'^__ddg\d+_?$', None, 0.8),
+    ]),
+    (('BIG-IP AppSec Manager', 'F5 Networks'), [
+        ('cookie', r'^TS[0-9a-f]{6,8}$', None, 0.7),
+        ('body', r'the requested url was rejected\. please consult with your administrator', None, 0.9),
+    ]),
+    (('Kasada', 'Kasada'), [
+        ('header', 'x-kpsdk-ct', None, 0.9),
+        ('header', 'x-kpsdk-cd', None, 0.9),
+    ]),
+]
+
+_COMPILED_SIGNATURES = [
+    (waf, [(kind, re.compile(key, re.IGNORECASE) if kind != 'header' else key,
+            re.compile(value, re.IGNORECASE) if value else None, weight)
+           for kind, key, value, weight in matchers])
+    for waf, matchers in WAF_SIGNATURES
+]
+
+def _match_signature(matchers, responses: list[ObservedResponse], cookie_names: set[str]) -> tuple[float, list[str]]:
+    """
+    Returns the combined confidence for one vendor and a description of each piece of evidence.
+    """
+    remaining = 1.0
+    evidence = []
+
+    for kind, key, value_re, weight in matchers:
+        hit = None
+        if kind == 'header':
+            for response in responses:
+                for name, value in response.headers:
+                    if name == key and (value_re is None or value_re.search(value)):
+                        hit = f'header {name}: {value[:60]}'
+                        break
+                if hit:
+                    break
+        elif kind == 'cookie':
+            matched = sorted(name for name in cookie_names if key.search(name))
+            if matched:
+                hit = f'cookie {", ".join(matched)}'
+        elif kind == 'body':
+            for response in responses:
+                if response.text and key.search(response.text):
+                    hit = f'body marker in {response.status_code} response'
+                    break
+
+        if hit:
+            remaining *= (1 - weight)
+            evidence.append(hit)
+
+    return 1 - remaining, evidence
+
+def detect_waf_passive(responses: Iterable[ObservedResponse], cookie_names: Iterable[str] = ()) -> dict[str, any]:
+    """
+    Identifies WAF/CDN vendors from the headers, cookies, status codes and body markers
+    of responses the scan already received. Makes no requests.
+
+    `confidence` is the confidence in the top reported vendor, or 0 when none was found.
+    """
+    responses = list(responses)
+    cookie_names = set(cookie_names)
+
+    detected = []
+    for waf, matchers in _COMPILED_SIGNATURES:
+        score, evidence = _match_signature(matchers, responses, cookie_names)
+        if score >= MIN_REPORTED:
+            detected.append((waf, round(score, 3), evidence))
+
+    detected.sort(key=lambda d: d[1], reverse=True)
+    blocked = [r for r in responses if r.status_code in BLOCK_STATUS_CODES]
+
+    # Only a vendor match is conclusive. Clean responses to ordinary requests are what a protected
+    # site returns too; wafw00f's attack probes are needed to tell that no WAF is present.
+    confidence = detected[0][1] if detected else 0.0
+
+    return {
+        'status': 'success',
+        'wafs': [waf for waf, _, _ in detected],
+        'confidence': round(confidence, 3),
+        'evidence': {waf[0]: evidence for waf, _, evidence in detected},
+        'responses_checked': len(responses),
+        'blocked_responses': len(blocked),
+    }
@@ -13,6 +13,8 @@ from curl_cffi.requests import AsyncSession
 
 from ..utils.browser_identities import MODERN_BROWSER_IDENTITIES
 from ..utils.impersonate_target import get_impersonate_target
+from ..utils.scan_capture import get_active_capture
+from ..utils.response_log import observe_response
 
 GENTLE_PROBE_COUNT = 4
 BURST_COUNT = 8
@@ -29,9 +31,13 @@ async def _make_request(session: aiohttp.ClientSession, url: str, proxies: tuple
     proxy = random.choice(proxies) if proxies else None
     try:
         async with session.get(url, headers=BROWSER_IDENTITY, timeout=15, allow_redirects=True, proxy=proxy) as response:
+            # Block pages are kept for passive WAF detection; other bodies are discarded unread.
+            text = await response.text(errors='replace') if response.status in BLOCKING_STATUS_CODES else None
             response.release()
+            observe_response('rate_limit', url, response.status, response.headers, text)
             return response.status
     except (aiohttp.ClientError, asyncio.TimeoutError):
+        observe_response('rate_limit', url, 999)
         return 999
 
 async def _make_impersonated_request(url: str, impersonate_target: str, proxies: tuple[str, ...] = ()) -> int:
@@ -40,7 +46,19 @@ async def _make_impersonated_request(url: str, impersonate_target: str, proxies:
     try:
         async with AsyncSession(impersonate=impersonate_target, proxies=proxies_dict) as session:
             response = await session.get(url, headers=BROWSER_IDENTITY, timeout=15, allow_redirects=True)
+            text = response.text if response.status_code in BLOCKING_STATUS_CODES else None
+            observe_response('rate_limit', url, response.status_code, response.headers, text)
             return response.status_code
+    except Exception:
+        observe_response('rate_limit', url, 999)
+        return 999
+
+async def _replay_request(url: str) -> int:
+    """
+    Returns the next recorded status code for this URL instead of making a request.
+    """
+    try:
+        return get_active_capture().replay_response('rate_limit', url).status
     except Exception:
         return 999
     
@@ -51,7 +69,12 @@ async def _run_rate_limit_profiler(url: str, baseline_delay: float, impersonate:
     results = {'requests_sent': 0, 'blocking_code': None, 'details': ''}
 
     session_manager = None
-    if impersonate:
+    capture = get_active_capture()
+    replaying = bool(capture and capture.replaying)
+
+    if replaying:
+        request_func = lambda: _replay_request(url)
+    elif impersonate:
         user_agent = BROWSER_IDENTITY.get('User-Agent', '')
         impersonate_target = get_impersonate_target(user_agent)
         request_func = lambda: _make_impersonated_request(url, impersonate_target, proxies)
@@ -68,7 +91,7 @@ async def _run_rate_limit_profiler(url: str, baseline_delay: float, impersonate:
                 results['blocking_code'] = status
                 results['details'] = f'Blocked after {results["requests_sent"]} requests with a {baseline_delay:.1f}s delay.'
                 return results
-            if i < GENTLE_PROBE_COUNT - 1:
+            if i < GENTLE_PROBE_COUNT - 1 and not replaying:
                 await asyncio.sleep(baseline_delay)
 
         burst_tasks = [request_func() for _ in range(BURST_COUNT)]
@@ -7,6 +7,8 @@ from curl_cffi.requests import Session as CurlCffiSession
 
 from ..utils.browser_identities import MODERN_BROWSER_IDENTITIES
 from ..utils.impersonate_target import get_impersonate_target
+from ..utils.scan_capture import get_active_capture, CaptureMissError
+from ..utils.response_log import observe_response
 
 def check_robots_txt(url: str, proxies: tuple[str, ...] = ()) -> dict[str, any]:
     """
@@ -16,8 +18,12 @@ def check_robots_txt(url: str, proxies: tuple[str, ...] = ()) -> dict[str, any]:
     try:
         parsed_url = urlparse(url)
         robots_url = urlunparse((parsed_url.scheme, parsed_url.netloc, 'robots.txt', '', '', ''))
+        capture = get_active_capture()
 
-        if proxies:
+        if capture and capture.replaying:
+            response = capture.replay_response('robots', robots_url)
+
+        elif proxies:
             proxy = random.choice(proxies)
 
             chosen_identity = random.choice(MODERN_BROWSER_IDENTITIES)
@@ -35,6 +41,8 @@ def check_robots_txt(url: str, proxies: tuple[str, ...] = ()) -> dict[str, any]:
             with CurlCffiSession(impersonate=impersonate_target) as session:
                 response = session.get(robots_url, headers=chosen_identity, timeout=15, allow_redirects=True)
 
+        observe_response('robots', robots_url, response.status_code, response.headers, response.text)
+
         if response.status_code == 200:
             if 'text/html' in response.headers.get('Content-Type', '').lower():
                 return {'status': 'not_found'}
@@ -75,5 +83,5 @@ def check_robots_txt(url: str, proxies: tuple[str, ...] = ()) -> dict[str, any]:
             print("Entering else block")
             return {'status': 'error', 'message': response.status_code}
         
-    except requests.RequestException as e:
+    except (requests.RequestException, CaptureMissError) as e:
         return {'status': 'error', 'message': str(e)}
\ No newline at end of file
@@ -13,6 +13,8 @@ import random
 
 from ..utils.browser_identities import MODERN_BROWSER_IDENTITIES
 from ..utils.impersonate_target import get_impersonate_target
+from ..utils.scan_capture import get_active_capture, CaptureMissError
+from ..utils.response_log import observe_response
 
 async def _run_tls_test(url: str, proxies: tuple[str, ...] = ()) -> dict[str, any]:
     """
@@ -25,19 +27,29 @@ async def _run_tls_test(url: str, proxies: tuple[str, ...] = ()) -> dict[str, an
 
     proxy = random.choice(proxies) if proxies else None
     proxies_dict = {"http": proxy, "https": proxy} if proxy else None
+    capture = get_active_capture()
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=chosen_identity, timeout=20, allow_redirects=True, proxy=proxy) as response:
-                results['python_request_blocked'] = response.status >= 400
-    except (aiohttp.ClientError, asyncio.TimeoutError):
+        if capture and capture.replaying:
+            response = capture.replay_response('tls.python', url)
+            results['python_request_blocked'] = response.status >= 400
+        else:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url, headers=chosen_identity, timeout=20, allow_redirects=True, proxy=proxy) as response:
+                    results['python_request_blocked'] = response.status >= 400
+                    observe_response('tls.python', url, response.status, response.headers)
+    except (aiohttp.ClientError, asyncio.TimeoutError, CaptureMissError):
         results['python_request_blocked'] = True
     
     try:
-        impersonate_target = get_impersonate_target(user_agent)
-        async with AsyncSession(impersonate=impersonate_target, proxies=proxies_dict) as session:
-            response = await session.get(url, headers=chosen_identity, timeout=20, allow_redirects=True)
-            results['browser_request_blocked'] = response.status_code >= 400
+        if capture and capture.replaying:
+            response = capture.replay_response('tls.browser', url)
+        else:
+            impersonate_target = get_impersonate_target(user_agent)
+            async with AsyncSession(impersonate=impersonate_target, proxies=proxies_dict) as session:
+                response = await session.get(url, headers=chosen_identity, timeout=20, allow_redirects=True)
+                observe_response('tls.browser', url, response.status_code, response.headers)
+        results['browser_request_blocked'] = response.status_code >= 400
     except Exception as e:
         results['browser_request_blocked'] = True
 
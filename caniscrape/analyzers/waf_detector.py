@@ -2,13 +2,92 @@ from __future__ import annotations
 
 import subprocess
 from ..utils.waf_result_parser import parse_wafw00f_output
+from ..utils.scan_capture import get_active_capture
+from ..utils.response_log import get_response_log
+from ..utils.wafw00f_engine import run_wafw00f_library, is_wafw00f_available, WafDetectionCancelled
+from .passive_waf import detect_waf_passive, CONFIDENT
 import random
 
-def detect_waf(url: str, find_all: bool = False, proxies: tuple[str, ...] = ()) -> dict[str, any]:
+WAFW00F_ENGINES = ('auto', 'library', 'subprocess')
+WAFW00F_TIMEOUT = 60
+
+def detect_waf(url: str, find_all: bool = False, proxies: tuple[str, ...] = (), engine: str = 'auto', timeout: float = WAFW00F_TIMEOUT) -> dict[str, any]:
+    """
+    Detects WAFs from the responses the other analyzers already received, and only
+    runs wafw00f when that passive check is not confident.
+    -find-all tag always runs wafw00f, to find all the WAFs the website is using.
+
+    engine selects how wafw00f runs: 'library' (in this process), 'subprocess' (the wafw00f
+    command) or 'auto' (library if the package is importable, otherwise the command).
+    """
+    capture = get_active_capture()
+
+    if capture and capture.replaying:
+        recorded = capture.replay_result('waf')
+        if recorded is None:
+            return {'status': 'error', 'message': 'WAF result was not recorded in this capture.'}
+        return {**recorded, 'wafs': [tuple(waf) for waf in recorded.get('wafs', [])]}
+
+    log = get_response_log()
+    passive_result = detect_waf_passive(log.responses, log.cookie_names)
+
+    if not find_all and passive_result['confidence'] >= CONFIDENT:
+        result = {**passive_result, 'source': 'passive'}
+    else:
+        result = _merge_results(passive_result, _run_wafw00f_engine(url, find_all, proxies, engine, timeout))
+
+    if capture:
+        capture.record_result('waf', result)
+    return result
+
+def _merge_results(passive_result: dict[str, any], wafw00f_result: dict[str, any]) -> dict[str, any]:
+    """
+    Combines wafw00f's answer with passive detections. Passive detections are kept
+    when wafw00f misses them or is unavailable.
+    """
+    passive_wafs = passive_result['wafs']
+
+    if wafw00f_result['status'] != 'success':
+        if passive_wafs:
+            return {**passive_result, 'source': 'passive', 'wafw00f_error': wafw00f_result.get('message')}
+        return wafw00f_result
+
+    wafs = list(wafw00f_result['wafs'])
+    known = {name.lower() for name, _ in wafs}
+    for name, manuf in passive_wafs:
+        if name.lower() not in known:
+            wafs.append((name, manuf))
+
+    if len(wafs) > 1:
+        wafs = [waf for waf in wafs if waf[0] != 'Generic WAF']
+
+    return {
+        **wafw00f_result,
+        'wafs': wafs,
+        'source': 'passive+wafw00f' if passive_wafs else 'wafw00f',
+        'evidence': passive_result['evidence'],
+    }
+
+def _run_wafw00f_engine(url: str, find_all: bool, proxies: tuple[str, ...], engine: str, timeout: float) -> dict[str, any]:
+    if engine not in WAFW00F_ENGINES:
+        raise ValueError(f'Unknown wafw00f engine "{engine}". Supported engines are: {list(WAFW00F_ENGINES)}')
+
+    if engine == 'subprocess' or (engine == 'auto' and not is_wafw00f_available()):
+        return _run_wafw00f(url, find_all, proxies, timeout)
+
+    proxy = random.choice(proxies) if proxies else None
+    try:
+        return run_wafw00f_library(url, find_all, proxy, timeout=timeout)
+    except WafDetectionCancelled:
+        return {'status': 'error', 'message': 'timeout'}
+    except ImportError as e:
+        return {'status': 'error', 'message': str(e)}
+    except Exception as e:
+        return {'status': 'error', 'message': f'wafw00f failed: {e}'}
+
+def _run_wafw00f(url: str, find_all: bool = False, proxies: tuple[str, ...] = (), timeout: float = WAFW00F_TIMEOUT) -> dict[str, any]:
     """
-    Runs wafw00f to detect a WAF and parses its output.
-    Returns the WAF name if found, otherwise None.
-    -find-all tag can be used to ask wafw00f to find all the WAFs the website is using.
+    Runs the wafw00f command and parses its output.
     """
     try:
         command = ['wafw00f', url]
@@ -24,7 +103,7 @@ def detect_waf(url: str, find_all: bool = False, proxies: tuple[str, ...] = ())
             command,
             capture_output=True,
             text=True,
-            timeout=60,
+            timeout=timeout,
             check=False
         )
 
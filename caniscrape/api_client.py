@@ -1,7 +1,91 @@
+import gzip
 import requests
-from typing import Any
+from typing import Any, Iterator
 from requests.exceptions import RequestException, HTTPError, Timeout
 
+from .utils.retry import parse_retry_after
+from .utils.serialization import dumps
+
+MAX_BATCH_BYTES = 8 * 1024 * 1024
+MAX_BATCH_ITEMS = 200
+USER_AGENT = 'caniscrape-cli/1.0.0'
+# Status codes meaning the server has no batch endpoint (rather than rejecting this batch).
+BATCH_UNSUPPORTED_STATUS = (404, 405, 501)
+# The server does not accept the Content-Encoding of the body; zstd bodies are then resent with gzip.
+UNSUPPORTED_ENCODING_STATUS = 415
+
+def compress_body(body: bytes, compression: str = 'auto') -> tuple[bytes, str | None]:
+    """
+    Compress a request body. 'auto' picks zstd when the zstandard package is installed and gzip otherwise;
+    'none' sends it as is. Returns the payload and its Content-Encoding.
+    """
+    if compression == 'none':
+        return body, None
+    if compression in ('auto', 'zstd'):
+        try:
+            import zstandard
+            return zstandard.ZstdCompressor(level=3).compress(body), 'zstd'
+        except ImportError:
+            if compression == 'zstd':
+                raise ImportError('zstd compression requires the "zstandard" package. Please install it using "pip install caniscrape[fast]"')
+    return gzip.compress(body, compresslevel=6), 'gzip'
+
+def _chunk_scans(scans: list[dict], max_bytes: int, max_items: int) -> Iterator[list[tuple[int, bytes]]]:
+    """
+    Serializes each scan once and groups them into chunks that stay under both limits.
+    A single scan bigger than max_bytes is sent as a chunk of its own.
+    """
+    chunk: list[tuple[int, bytes]] = []
+    chunk_bytes = 0
+    for index, scan in enumerate(scans):
+        encoded = dumps({'url': scan['url'], 'scan_data': scan['scan_data'], 'cli_version': scan.get('cli_version')})
+        if chunk and (len(chunk) >= max_items or chunk_bytes + len(encoded) > max_bytes):
+            yield chunk
+            chunk, chunk_bytes = [], 0
+        chunk.append((index, encoded))
+        chunk_bytes += len(encoded) + 1
+    if chunk:
+        yield chunk
+
+def error_for_status(status_code: int, error_detail: str, retry_after: float | None = None) -> 'ApiError':
+    """
+    The ApiError for an HTTP error response, shared by the sync and async clients.
+    """
+    if status_code == 401:
+        return ApiError('Authentication failed. Your token may have expired. Run `caniscrape init` to re-authenticate.', status_code)
+    elif status_code == 403:
+        return ApiError(f'Permission denied: {error_detail}', status_code)
+    elif status_code == 404:
+        return ApiError(f'Not found: {error_detail}', status_code)
+    elif status_code == 429:
+        return ApiError('Rate limit exceeded. Please try again later.', status_code, retry_after)
+    elif 500 <= status_code < 600:
+        return ApiError(f'Server error: {error_detail}. Please try again later.', status_code, retry_after)
+    else:
+        return ApiError(f'API error: {error_detail}', status_code)
+
+def _chunk_body(chunk: list[tuple[int, bytes]]) -> bytes:
+    return b'{"scans":[' + b','.join(encoded for _, encoded in chunk) + b']}'
+
+def _chunk_results(chunk: list[tuple[int, bytes]], response: dict) -> list[dict]:
+    """
+    Maps the batch endpoint's per-position results back to the scans' indexes.
+    """
+    by_position = {item.get('index'): item for item in response.get('results', []) if isinstance(item, dict)}
+    results = []
+    for position, (index, _) in enumerate(chunk):
+        item = by_position.get(position)
+        if item is None:
+            results.append({'index': index, 'status': 'error', 'detail': 'No result returned for this scan.', 'status_code': None, 'retryable': True, 'retry_after': None})
+        elif item.get('status') == 'created':
+            results.append({'index': index, 'status': 'created', 'id': item.get('id')})
+        else:
+            results.append({'index': index, 'status': 'error', 'detail': item.get('detail', 'Unknown error'), 'status_code': None, 'retryable': False, 'retry_after': None})
+    return results
+
+def _error_result(index: int, error: 'ApiError') -> dict:
+    return {'index': index, 'status': 'error', 'detail': str(error), 'status_code': error.status_code, 'retryable': error.retryable, 'retry_after': error.retry_after}
+
 class ApiClient:
     def __init__(self, api_endpoint: str, api_token: str | None = None):
         self.api_endpoint = api_endpoint.rstrip('/')
@@ -10,13 +94,17 @@ class ApiClient:
 
         self.session.headers.update({
             'Content-Type': 'application/json',
-            'User-Agent': 'caniscrape-cli/1.0.0'
+            'User-Agent': USER_AGENT
         })
 
         if api_token:
             self.session.headers.update({
                 'Authorization': f'Bearer {api_token}'
             })
+
+        self.batch_supported = True
+        # Set to 'gzip' once the server has rejected a zstd batch.
+        self.batch_compression: str | None = None
         
     def _request(
         self,
@@ -24,7 +112,9 @@ class ApiClient:
         endpoint: str,
         json: dict | None = None,
         params: dict | None = None,
-        timeout: int = 30
+        timeout: int = 30,
+        data: bytes | None = None,
+        headers: dict[str, str] | None = None
     ) -> dict[str, Any]:
         url = f'{self.api_endpoint}{endpoint}'
 
@@ -34,6 +124,8 @@ class ApiClient:
                 url=url,
                 json=json,
                 params=params,
+                data=data,
+                headers=headers,
                 timeout=timeout
             )
 
@@ -51,19 +143,8 @@ class ApiClient:
                 error_detail = e.response.json().get('detail', 'Unknown error')
             except:
                 error_detail = e.response.text or 'Unknown error'
-            
-            if e.response.status_code == 401:
-                raise ApiError('Authentication failed. Your token may have expired. Run `caniscrape init` to re-authenticate.')
-            elif e.response.status_code == 403:
-                raise ApiError(f'Permission denied: {error_detail}')
-            elif e.response.status_code == 404:
-                raise ApiError(f'Not found: {error_detail}')
-            elif e.response.status_code == 429:
-                raise ApiError('Rate limit exceeded. Please try again later.')
-            elif 500 <= e.response.status_code < 600:
-                raise ApiError(f'Server error: {error_detail}. Please try again later.')
-            else:
-                raise ApiError(f'API error: {error_detail}')
+
+            raise error_for_status(e.response.status_code, error_detail, parse_retry_after(e.response.headers.get('Retry-After')))
             
         except RequestException as e:
             raise ApiError(f'Network error: {str(e)}. Check your internet connection.')
@@ -87,6 +168,58 @@ class ApiClient:
     def upload_scan(self, project_id: str, url: str, scan_data: dict, cli_version: str | None = None) -> dict:
         return self._request('POST', f'/api/projects/{project_id}/scans', json={'url': url, 'scan_data': scan_data, 'cli_version': cli_version})
     
+    def upload_scans_batch(
+        self,
+        project_id: str,
+        scans: list[dict],
+        compression: str = 'auto',
+        max_chunk_bytes: int = MAX_BATCH_BYTES,
+        max_chunk_items: int = MAX_BATCH_ITEMS
+    ) -> list[dict]:
+        """
+        Upload many scans with as few requests as possible. Each scan is a dict with url, scan_data and
+        cli_version. Scans are packed into chunks of at most `max_chunk_items` scans and `max_chunk_bytes`
+        of JSON, and every chunk is sent as one compressed POST to the batch endpoint. If the server rejects
+        zstd, the chunk is resent with gzip and the rest of the batches use gzip too.
+
+        Returns one result per scan, in order: {'index', 'status': 'created', 'id'} or
+        {'index', 'status': 'error', 'detail', 'status_code', 'retryable', 'retry_after'}. A failed request
+        fails every scan in its chunk. If the server has no batch endpoint, scans are uploaded one by one.
+        """
+        results: list[dict] = []
+        for chunk in _chunk_scans(scans, max_chunk_bytes, max_chunk_items):
+            if self.batch_supported:
+                try:
+                    results.extend(self._upload_chunk(project_id, chunk, compression))
+                    continue
+                except ApiError as e:
+                    if e.status_code not in BATCH_UNSUPPORTED_STATUS:
+                        results.extend(_error_result(index, e) for index, _ in chunk)
+                        continue
+                    self.batch_supported = False
+
+            for index, _ in chunk:
+                scan = scans[index]
+                try:
+                    created = self.upload_scan(project_id, scan['url'], scan['scan_data'], scan.get('cli_version'))
+                    results.append({'index': index, 'status': 'created', 'id': created.get('id')})
+                except ApiError as e:
+                    results.append(_error_result(index, e))
+        return results
+
+    def _upload_chunk(self, project_id: str, chunk: list[tuple[int, bytes]], compression: str) -> list[dict]:
+        payload, encoding = compress_body(_chunk_body(chunk), self.batch_compression or compression)
+        headers = {'Content-Encoding': encoding} if encoding else None
+
+        try:
+            response = self._request('POST', f'/api/projects/{project_id}/scans/batch', data=payload, headers=headers, timeout=120)
+        except ApiError as e:
+            if e.status_code != UNSUPPORTED_ENCODING_STATUS or encoding != 'zstd':
+                raise
+            self.batch_compression = 'gzip'
+            return self._upload_chunk(project_id, chunk, compression)
+        return _chunk_results(chunk, response)
+
     def list_scans(self, project_id: str, page: int = 1, per_page: int = 50, url_filter: str | None = None) -> dict:
         params = {'page': page, 'per_page': per_page}
         if url_filter:
@@ -115,4 +248,18 @@ class ApiClient:
         return self._request('GET', '/api/telemetry/stats')
 
 class ApiError(Exception):
-    pass
\ No newline at end of file
+    """
+    A failed API call. `status_code` is None when no response was received (timeout, network error);
+    `retry_after` is the server's Retry-After wait in seconds, if it sent one.
+    """
+    def __init__(self, message: str, status_code: int | None = None, retry_after: float | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        """
+        Worth retrying: no response at all, rate limited, or a server error (except 501, which won't change).
+        """
+        return self.status_code is None or self.status_code == 429 or (self.status_code >= 500 and self.status_code != 501)
\ No newline at end of file
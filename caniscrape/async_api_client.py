@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, TypeVar
+
+from .api_client import (
+    ApiError, BATCH_UNSUPPORTED_STATUS, MAX_BATCH_BYTES, MAX_BATCH_ITEMS, UNSUPPORTED_ENCODING_STATUS, USER_AGENT,
+    _chunk_body, _chunk_results, _chunk_scans, _error_result, compress_body, error_for_status
+)
+from .utils.retry import parse_retry_after
+from .utils.serialization import dumps
+
+T = TypeVar('T')
+
+DEFAULT_MAX_CONNECTIONS = 20
+KEEPALIVE_SECONDS = 30
+SHUTDOWN_TIMEOUT = 5
+
+class _HttpxTransport:
+    """
+    httpx connection pool, speaking HTTP/2 when the h2 package is installed.
+    """
+    def __init__(self, headers: dict[str, str], max_connections: int):
+        import httpx
+        try:
+            import h2
+            http2 = True
+        except ImportError:
+            http2 = False
+
+        self._httpx = httpx
+        self.name = 'httpx (HTTP/2 enabled)' if http2 else 'httpx'
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            headers=headers,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections, keepalive_expiry=KEEPALIVE_SECONDS)
+        )
+
+    async def send(self, method: str, url: str, params: dict | None, body: bytes | None, headers: dict[str, str] | None, timeout: float) -> tuple[int, Any, bytes]:
+        try:
+            response = await self.client.request(method, url, params=params, content=body, headers=headers, timeout=timeout)
+        except self._httpx.TimeoutException:
+            raise ApiError(f'Request timed out after {timeout} seconds. Check your internet connection.')
+        except self._httpx.HTTPError as e:
+            raise ApiError(f'Network error: {str(e)}. Check your internet connection.')
+        return response.status_code, response.headers, response.content
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+class _AiohttpTransport:
+    """
+    aiohttp keep-alive connection pool (HTTP/1.1), used when httpx is not installed.
+    """
+    def __init__(self, headers: dict[str, str], max_connections: int):
+        import aiohttp
+
+        self._aiohttp = aiohttp
+        self.name = 'aiohttp'
+        self.client = aiohttp.ClientSession(
+            headers=headers,
+            connector=aiohttp.TCPConnector(limit=max_connections, keepalive_timeout=KEEPALIVE_SECONDS)
+        )
+
+    async def send(self, method: str, url: str, params: dict | None, body: bytes | None, headers: dict[str, str] | None, timeout: float) -> tuple[int, Any, bytes]:
+        try:
+            async with self.client.request(method, url, params=params, data=body, headers=headers, timeout=self._aiohttp.ClientTimeout(total=timeout)) as response:
+                return response.status, response.headers, await response.read()
+        except asyncio.TimeoutError:
+            raise ApiError(f'Request timed out after {timeout} seconds. Check your internet connection.')
+        except self._aiohttp.ClientError as e:
+            raise ApiError(f'Network error: {str(e)}. Check your internet connection.')
+
+    async def close(self) -> None:
+        await self.client.close()
+
+def _open_transport(headers: dict[str, str], max_connections: int) -> _HttpxTransport | _AiohttpTransport:
+    try:
+        return _HttpxTransport(headers, max_connections)
+    except ImportError:
+        return _AiohttpTransport(headers, max_connections)
+
+class AsyncApiClient:
+    """
+    asyncio version of ApiClient. All requests share one keep-alive connection pool (HTTP/2 via httpx when
+    httpx and h2 are installed, otherwise aiohttp), so repeated calls skip the TCP and TLS handshakes.
+    Errors are raised as the same ApiError as the sync client. Use it as an async context manager, or call
+    `aclose()` when done.
+    """
+    def __init__(self, api_endpoint: str, api_token: str | None = None, max_connections: int = DEFAULT_MAX_CONNECTIONS):
+        self.api_endpoint = api_endpoint.rstrip('/')
+        self.api_token = api_token
+        self.max_connections = max_connections
+        self.headers = {
+            'Content-Type': 'application/json',
+            'User-Agent': USER_AGENT
+        }
+
+        if api_token:
+            self.headers['Authorization'] = f'Bearer {api_token}'
+
+        self.batch_supported = True
+        # Set to 'gzip' once the server has rejected a zstd batch.
+        self.batch_compression: str | None = None
+        # Opened on first use, so it is created on the event loop that runs the requests.
+        self._transport = None
+
+    async def __aenter__(self) -> 'AsyncApiClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._transport is not None:
+            transport, self._transport = self._transport, None
+            await transport.close()
+
+    @property
+    def transport_name(self) -> str | None:
+        return self._transport.name if self._transport is not None else None
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        json: dict | None = None,
+        params: dict | None = None,
+        timeout: int = 30,
+        data: bytes | None = None,
+        headers: dict[str, str] | None = None
+    ) -> dict[str, Any]:
+        if self._transport is None:
+            self._transport = _open_transport(self.headers, self.max_connections)
+
+        body = data if data is not None else (dumps(json) if json is not None else None)
+        status_code, response_headers, content = await self._transport.send(method, f'{self.api_endpoint}{endpoint}', params, body, headers, timeout)
+
+        if status_code >= 400:
+            try:
+                error_detail = _parse_json(content).get('detail', 'Unknown error')
+            except Exception:
+                error_detail = content.decode('utf-8', 'replace') or 'Unknown error'
+            raise error_for_status(status_code, error_detail, parse_retry_after(response_headers.get('Retry-After')))
+
+        if status_code == 204 or not content:
+            return {}
+        try:
+            return _parse_json(content)
+        except ValueError:
+            raise ApiError('API error: response was not valid JSON', status_code)
+
+    async def create_project(self, name: str, description: str | None = None) -> dict:
+        return await self._request('POST', '/api/projects', json={'name': name, 'description': description})
+
+    async def list_projects(self) -> list[dict]:
+        return await self._request('GET', '/api/projects')
+
+    async def get_project(self, project_id: str) -> dict:
+        return await self._request('GET', f'/api/projects/{project_id}')
+
+    async def upload_scan(self, project_id: str, url: str, scan_data: dict, cli_version: str | None = None) -> dict:
+        return await self._request('POST', f'/api/projects/{project_id}/scans', json={'url': url, 'scan_data': scan_data, 'cli_version': cli_version})
+
+    async def upload_scans_batch(
+        self,
+        project_id: str,
+        scans: list[dict],
+        compression: str = 'auto',
+        max_chunk_bytes: int = MAX_BATCH_BYTES,
+        max_chunk_items: int = MAX_BATCH_ITEMS
+    ) -> list[dict]:
+        """
+        Same contract as ApiClient.upload_scans_batch. The first chunk is sent alone to find out whether the
+        server has a batch endpoint; the remaining chunks (or single uploads) are then sent concurrently.
+        """
+        chunks = list(_chunk_scans(scans, max_chunk_bytes, max_chunk_items))
+        if not chunks:
+            return []
+
+        results = await self._upload_chunk_or_singles(project_id, scans, chunks[0], compression)
+        for chunk_results in await asyncio.gather(*(self._upload_chunk_or_singles(project_id, scans, chunk, compression) for chunk in chunks[1:])):
+            results.extend(chunk_results)
+        return results
+
+    async def _upload_chunk_or_singles(self, project_id: str, scans: list[dict], chunk: list[tuple[int, bytes]], compression: str) -> list[dict]:
+        if self.batch_supported:
+            try:
+                return await self._upload_chunk(project_id, chunk, compression)
+            except ApiError as e:
+                if e.status_code not in BATCH_UNSUPPORTED_STATUS:
+                    return [_error_result(index, e) for index, _ in chunk]
+                self.batch_supported = False
+
+        async def upload_one(index: int) -> dict:
+            scan = scans[index]
+            try:
+                created = await self.upload_scan(project_id, scan['url'], scan['scan_data'], scan.get('cli_version'))
+                return {'index': index, 'status': 'created', 'id': created.get('id')}
+            except ApiError as e:
+                return _error_result(index, e)
+
+        return list(await asyncio.gather(*(upload_one(index) for index, _ in chunk)))
+
+    async def _upload_chunk(self, project_id: str, chunk: list[tuple[int, bytes]], compression: str) -> list[dict]:
+        payload, encoding = compress_body(_chunk_body(chunk), self.batch_compression or compression)
+        headers = {'Content-Encoding': encoding} if encoding else None
+
+        try:
+            response = await self._request('POST', f'/api/projects/{project_id}/scans/batch', data=payload, headers=headers, timeout=120)
+        except ApiError as e:
+            if e.status_code != UNSUPPORTED_ENCODING_STATUS or encoding != 'zstd':
+                raise
+            self.batch_compression = 'gzip'
+            return await self._upload_chunk(project_id, chunk, compression)
+        return _chunk_results(chunk, response)
+
+    async def list_scans(self, project_id: str, page: int = 1, per_page: int = 50, url_filter: str | None = None) -> dict:
+        params = {'page': page, 'per_page': per_page}
+        if url_filter:
+            params['url'] = url_filter
+
+        return await self._request('GET', f'/api/projects/{project_id}/scans', params=params)
+
+    async def get_latest_scan(self, project_id: str, url: str) -> dict | None:
+        try:
+            return await self._request('GET', f'/api/projects/{project_id}/scans/latest', params={'url': url})
+        except ApiError as e:
+            if 'not found' in str(e).lower():
+                return None
+            raise
+
+    async def contribute_scan_to_telemetry(self, scan_id: str) -> dict:
+        """
+        Contribute a scan to public telemetry.
+        """
+        return await self._request('POST', f'/api/telemetry/contribute/{scan_id}')
+
+    async def get_telemetry_stats(self) -> dict:
+        """
+        Get public telemetry statistics.
+        """
+        return await self._request('GET', '/api/telemetry/stats')
+
+def _parse_json(content: bytes) -> Any:
+    return json.loads(content)
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_thread: threading.Thread | None = None
+_loop_lock = threading.Lock()
+_clients: dict[tuple[str, str | None], 'SyncApiClient'] = {}
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """
+    The event loop that runs the requests of every SyncApiClient, on a daemon thread started on first use.
+    """
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=loop.run_forever, name='caniscrape-api', daemon=True)
+            _loop_thread.start()
+            _loop = loop
+            atexit.register(_shutdown)
+        return _loop
+
+def run_async(coro: Coroutine[Any, Any, T]) -> Future[T]:
+    """
+    Starts a coroutine on the background loop and returns a future for its result, without waiting.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop())
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Runs a coroutine on the background loop and blocks until it finishes. Safe to call from any thread
+    (but not from a coroutine running on the background loop itself).
+    """
+    return run_async(coro).result()
+
+def _shutdown() -> None:
+    global _loop
+    loop = _loop
+    if loop is None:
+        return
+
+    async def close_all() -> None:
+        await asyncio.gather(*(client.async_client.aclose() for client in _clients.values()), return_exceptions=True)
+
+    try:
+        asyncio.run_coroutine_threadsafe(close_all(), loop).result(timeout=SHUTDOWN_TIMEOUT)
+    except Exception:
+        pass
+    loop.call_soon_threadsafe(loop.stop)
+    _loop_thread.join(SHUTDOWN_TIMEOUT)
+    if not loop.is_running():
+        loop.close()
+    _loop = None
+
+class SyncApiClient:
+    """
+    Blocking facade over AsyncApiClient with the same methods as ApiClient. Calls run on a shared background
+    event loop, so every thread using this client shares one connection pool, and calls made from several
+    threads are in flight at the same time.
+    """
+    def __init__(self, api_endpoint: str, api_token: str | None = None, max_connections: int = DEFAULT_MAX_CONNECTIONS):
+        self.async_client = AsyncApiClient(api_endpoint, api_token, max_connections)
+
+    @property
+    def api_endpoint(self) -> str:
+        return self.async_client.api_endpoint
+
+    @property
+    def batch_supported(self) -> bool:
+        return self.async_client.batch_supported
+
+    @property
+    def batch_compression(self) -> str | None:
+        return self.async_client.batch_compression
+
+    def _request(self, method: str, endpoint: str, **kwargs) -> dict[str, Any]:
+        return run_sync(self.async_client._request(method, endpoint, **kwargs))
+
+    def create_project(self, name: str, description: str | None = None) -> dict:
+        return run_sync(self.async_client.create_project(name, description))
+
+    def list_projects(self) -> list[dict]:
+        return run_sync(self.async_client.list_projects())
+
+    def get_project(self, project_id: str) -> dict:
+        return run_sync(self.async_client.get_project(project_id))
+
+    def upload_scan(self, project_id: str, url: str, scan_data: dict, cli_version: str | None = None) -> dict:
+        return run_sync(self.async_client.upload_scan(project_id, url, scan_data, cli_version))
+
+    def upload_scans_batch(self, project_id: str, scans: list[dict], **kwargs) -> list[dict]:
+        return run_sync(self.async_client.upload_scans_batch(project_id, scans, **kwargs))
+
+    def list_scans(self, project_id: str, page: int = 1, per_page: int = 50, url_filter: str | None = None) -> dict:
+        return run_sync(self.async_client.list_scans(project_id, page, per_page, url_filter))
+
+    def get_latest_scan(self, project_id: str, url: str) -> dict | None:
+        return run_sync(self.async_client.get_latest_scan(project_id, url))
+
+    def contribute_scan_to_telemetry(self, scan_id: str) -> dict:
+        return run_sync(self.async_client.contribute_scan_to_telemetry(scan_id))
+
+    def get_telemetry_stats(self) -> dict:
+        return run_sync(self.async_client.get_telemetry_stats())
+
+def get_api_client(api_endpoint: str, api_token: str | None = None) -> SyncApiClient:
+    """
+    Get or create the shared client for an endpoint and token, so every call in the process reuses its connections.
+    """
+    key = (api_endpoint.rstrip('/'), api_token)
+    with _loop_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = SyncApiClient(api_endpoint, api_token)
+            _clients[key] = client
+    return client
@@ -4,8 +4,10 @@ import click
 from rich import print
 from rich.markup import escape
 from rich.rule import Rule
-from time import sleep
-import asyncio
+from time import sleep, monotonic
+import sys
+from concurrent.futures import Future
+from contextlib import redirect_stdout
 from datetime import datetime
 
 import warnings
@@ -14,35 +16,38 @@ import logging
 warnings.filterwarnings("ignore", message="Event loop is closed", category=RuntimeWarning)
 logging.getLogger("asyncio").setLevel(logging.CRITICAL)
 
-from .analyzers.waf_detector import detect_waf
-from .analyzers.robots_checker import check_robots_txt
-from .analyzers.rate_limit_profiler import profile_rate_limits
-from .analyzers.tls_analyzer import analyze_tls_fingerprint
-from .analyzers.js_detector import analyze_js_rendering
-from .analyzers.behavioral_detector import detect_honeypots
-from .analyzers.captcha_detector import detect_captcha
-from .analyzers.fingerprint_analyzer import analyze_fingerprinting
-from .analyzers.integrity_analyzer import analyze_function_integrity
-from .scoring.scoring_engine import calculate_difficulty_score
-from .recommendations.recommender import generate_recommendations
-
-from .upload_handler import try_upload_scan, check_for_diff
+from .scanner import run_scan, is_fully_reused, ANALYZER_NAMES
+from .upload_handler import prefetch_diff_baseline, wait_for_diff_baseline
 from .diff import compare_scans, display_diff, should_show_diff
 from .commands.init import init_command
-from .commands.push import push_command
-from .commands.telemetry_push import telemetry_push_command
+from .commands.push import push_command, DEFAULT_PUSH_CONCURRENCY
+from .commands.telemetry_push import telemetry_push_command, DEFAULT_CONTRIBUTE_CONCURRENCY
 from .commands.telemetry import telemetry_command
 from .commands.config_cmd import set_config_command, show_config_command
 from .commands.link import link_command
+from .commands.devserver import devserver_command
+from .commands.batch import batch_command
+from .commands.export import export_command
+from .commands.history import history_command
 from .telemetry import get_telemetry_manager
-from .config import find_config_in_parents
+from .config import Config, find_config_in_parents
 from .upload_handler import save_to_cache
+from .outbox import queue_scan_deliveries, resume_outbox, finish_outbox, EXIT_GRACE_SECONDS
+from .utils.scan_capture import ScanCapture, set_active_capture
+from .utils.serialization import dumps
+from .utils.duration import parse_duration
+from .result_sink import open_result_sink
+from .export import DEFAULT_SOURCE, DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, infer_format
 
 __version__ = '1.0.0'
 
 @click.group(invoke_without_command=True, context_settings=dict(ignore_unknown_options=True, allow_extra_args=True))
 @click.pass_context
 def cli(ctx):
+    resume_outbox()
+    get_telemetry_manager().flush_usage_spool_if_due()
+    ctx.call_on_close(_finish_background_work)
+
     if ctx.invoked_subcommand is None:
         if ctx.args and ctx.args[0].startswith(('http://', 'https://')):
             url = ctx.args[0]
@@ -50,6 +55,17 @@ def cli(ctx):
         else:
             click.echo(ctx.get_help())
 
+def _finish_background_work() -> None:
+    """
+    Uploads and telemetry are sent in the background; give them a moment to finish before exiting.
+    """
+    deadline = monotonic() + EXIT_GRACE_SECONDS
+    remaining = finish_outbox(EXIT_GRACE_SECONDS)
+    get_telemetry_manager().wait_for_usage_flush(max(0, deadline - monotonic()))
+    if remaining:
+        with redirect_stdout(sys.stderr):
+            print(f'[dim]📤 {remaining} queued upload(s)/event(s) will be sent on the next run.[/dim]')
+
 @cli.command(name='init')
 def init():
     """
@@ -72,14 +88,29 @@ def link():
     link_command()
 
 @cli.command(name='push')
-def push():
+@click.option('--concurrency', type=click.IntRange(min=1, max=64), default=DEFAULT_PUSH_CONCURRENCY, show_default=True, help='Number of uploads to run in parallel.')
+def push(concurrency):
     """
     Push local scan results to your cloud project.
     
     This uploads any scans that were saved locally (e.g., when
     offline or rate-limited). Works like 'git push'.
     """
-    push_command()
+    push_command(concurrency=concurrency)
+
+@cli.command(name='devserver')
+@click.option('--host', default='127.0.0.1', show_default=True, help='Interface to bind to.')
+@click.option('--port', default=8765, show_default=True, type=int, help='Port to listen on.')
+@click.option('--verbose', is_flag=True, default=False, help='Log every request.')
+def devserver(host, port, verbose):
+    """
+    Run a local server that emulates protected sites.
+
+    Each scenario page reproduces one protection (rate limits, TLS/UA
+    blocking, honeypots, CAPTCHAs, fingerprinting, SPAs, WAF headers)
+    so scans can be tested and benchmarked offline.
+    """
+    devserver_command(host, port, verbose)
 
 @cli.group(name='telemetry')
 def telemetry_group():
@@ -142,6 +173,14 @@ def delete():
     manager = get_telemetry_manager()
     manager.request_data_deletion()
 
+@telemetry_group.command(name='push')
+@click.option('--concurrency', type=click.IntRange(min=1, max=64), default=DEFAULT_CONTRIBUTE_CONCURRENCY, show_default=True, help='Number of pages and contributions to request in parallel.')
+def telemetry_push(concurrency):
+    """
+    Contribute your project's scans to the public database.
+    """
+    telemetry_push_command(concurrency=concurrency)
+
 @telemetry_group.command(name='status')
 def telemetry_status():
     """
@@ -157,8 +196,8 @@ def config_group():
     """
 
 @config_group.command(name='set')
-@click.argument('key', type=click.Choice(['auto-upload']))
-@click.argument('value', type=click.Choice(['on', 'off']))
+@click.argument('key', type=click.Choice(['auto-upload', 'browser-endpoint']))
+@click.argument('value')
 def set_config(key, value):
     """
     Update configuration settings.
@@ -172,13 +211,33 @@ def show_config():
     """
     show_config_command()
 
+def _parse_max_age(ctx, param, value):
+    if value is None:
+        return None
+    try:
+        return parse_duration(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+def _parse_ttls(ctx, param, values):
+    ttls = {}
+    for value in values:
+        name, _, duration = value.partition('=')
+        if name not in ANALYZER_NAMES or not duration:
+            raise click.BadParameter(f"Expected ANALYZER=DURATION (e.g. rate_limit=1h), with ANALYZER one of: {', '.join(ANALYZER_NAMES)}")
+        try:
+            ttls[name] = parse_duration(duration)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+    return ttls
+
 @cli.command(name='scan', context_settings=dict(ignore_unknown_options=True))
 @click.argument('url')
 @click.option(
     '--find-all',
     is_flag=True,
     default=False,
-    help='Uses --find-all tag for wafw00f. Default is false. Using the flag is aggressive but is more likely to detect multi-WAF setups.'
+    help='Always runs wafw00f with its --find-all tag, even when the WAF was already identified from scan responses. Default is false. Using the flag is aggressive but is more likely to detect multi-WAF setups.'
 )
 @click.option(
     '--impersonate',
@@ -217,16 +276,125 @@ def show_config():
     default=None,
     help='API key for the selected CAPTCHA solving service.'
 )
-def scan_command(url: str, find_all: bool, impersonate: bool, scan_depth: str | None, proxies: tuple[str, ...], captcha_service: str | None, captcha_api_key: str | None, ):
+@click.option(
+    '--browser-endpoint',
+    type=str,
+    default=None,
+    help='Attach to an existing Chromium instead of launching one. Accepts a CDP endpoint (http://host:9222) or a Playwright browser server (ws://host:port/path). Defaults to the browser-endpoint config value.'
+)
+@click.option(
+    '--record',
+    'record_dir',
+    type=click.Path(file_okay=False),
+    default=None,
+    help='Save everything the analyzers fetch (HAR files for browser traffic, raw responses for HTTP probes) to this directory.'
+)
+@click.option(
+    '--replay',
+    'replay_dir',
+    type=click.Path(file_okay=False),
+    default=None,
+    help='Run the analyzers against a directory created with --record instead of the network. Replayed scans are not saved or uploaded.'
+)
+@click.option(
+    '--waf-engine',
+    type=click.Choice(['auto', 'library', 'subprocess'], case_sensitive=False),
+    default='auto',
+    help='How to run wafw00f when it is needed: in-process as a library (faster, uses a shared connection pool), as the wafw00f command, or auto (library if installed in this environment). Default is auto.'
+)
+@click.option(
+    '--format',
+    'output_format',
+    type=click.Choice(['text', 'json', 'ndjson'], case_sensitive=False),
+    default='text',
+    help='Output format. json/ndjson write the complete scan result to stdout (pretty JSON or a single line), send progress messages to stderr and never prompt. Default is text.'
+)
+@click.option(
+    '--max-age',
+    type=str,
+    default=None,
+    callback=_parse_max_age,
+    help='Reuse stored results of this URL that are younger than this (e.g. 30m, 6h, 2d) and only re-run the analyzers whose results are older. Each analyzer also has its own TTL (robots/TLS/WAF 24h, browser checks 12h, rate limits 6h). Off by default.'
+)
+@click.option(
+    '--ttl',
+    'ttls',
+    multiple=True,
+    callback=_parse_ttls,
+    help='Override an analyzer TTL used with --max-age, as ANALYZER=DURATION (e.g. rate_limit=1h). Can be used multiple times.'
+)
+def scan_command(url: str, find_all: bool, impersonate: bool, scan_depth: str | None, proxies: tuple[str, ...], captcha_service: str | None, captcha_api_key: str | None, browser_endpoint: str | None = None, record_dir: str | None = None, replay_dir: str | None = None, waf_engine: str = 'auto', output_format: str = 'text', max_age: int | None = None, ttls: dict[str, int] | None = None):
     """
     Analyze a website's anti-bot protections.
     
     This is the main command that performs the full analysis of a website.
     """
+    if record_dir and replay_dir:
+        raise click.UsageError('--record and --replay cannot be used together.')
+
+    scan_options = dict(
+        find_all=find_all,
+        impersonate=impersonate,
+        scan_depth=scan_depth,
+        proxies=proxies,
+        captcha_service=captcha_service,
+        captcha_api_key=captcha_api_key,
+        browser_endpoint=browser_endpoint,
+        waf_engine=waf_engine.lower(),
+        max_age=max_age,
+        ttls=ttls
+    )
+    output_format = output_format.lower()
+
+    if output_format != 'text':
+        with redirect_stdout(sys.stderr):
+            complete_scan_result, _ = _execute_scan(url, record_dir, replay_dir, interactive=False, **scan_options)
+
+        sys.stdout.buffer.write(dumps(complete_scan_result, pretty=output_format == 'json') + b'\n')
+        sys.stdout.flush()
+        return
+
+    complete_scan_result, baseline = _execute_scan(url, record_dir, replay_dir, interactive=True, **scan_options)
+    previous_scan = wait_for_diff_baseline(baseline)
+
+    if should_show_diff(previous_scan):
+        diff = compare_scans(complete_scan_result, previous_scan)
+        try:
+            prev_date = datetime.fromisoformat(previous_scan.get('created_at') or previous_scan['scanned_at']).strftime('%Y-%m-%d %H:%M')
+        except:
+            prev_date = 'previous scan'
+        display_diff(diff, prev_date)
+
+    _print_scan_report(complete_scan_result)
+
+def _execute_scan(url: str, record_dir: str | None, replay_dir: str | None, interactive: bool = True, **scan_options) -> tuple[dict, Future | None]:
+    """
+    Runs a scan plus everything around it: record/replay, telemetry, and saving or uploading the result.
+    Returns the complete scan result and, in interactive mode, the prefetched previous scan to diff against
+    (join it with wait_for_diff_baseline).
+    """
+    find_all = scan_options['find_all']
+    scan_depth = scan_options['scan_depth']
+
     if not url.startswith(('http://', 'https://')):
         url = f'http://{url}'
         print(f"[yellow]⚠️  URL scheme missing. Assuming 'http://'. Analyzing: [bold blue]{url}[/bold blue]...[/yellow]")
 
+    capture = None
+    if record_dir:
+        capture = ScanCapture(record_dir, 'record')
+        print(f'[dim]📼 Recording scan traffic to {record_dir}[/dim]')
+    elif replay_dir:
+        try:
+            capture = ScanCapture(replay_dir, 'replay')
+        except FileNotFoundError as e:
+            raise click.UsageError(str(e))
+        print(f'[dim]📼 Replaying scan traffic from {replay_dir} (no network)[/dim]')
+    set_active_capture(capture)
+    replaying = bool(capture and capture.replaying)
+    if replaying:
+        scan_options['max_age'] = None
+
     print(f'🔍 Analyzing: [bold blue]{url}[/bold blue]...')
 
     if find_all:
@@ -235,115 +403,82 @@ def scan_command(url: str, find_all: bool, impersonate: bool, scan_depth: str |
         print(f'    [yellow]⚠️  --thorough scan selected. Behavioral analysis may take several minutes on large sites.[/yellow]')
     if scan_depth == 'deep':
         print(f'    [yellow]⚠️  --deep scan selected. Behavioral analysis may take 10+ minutes on large sites.[/yellow]')
-    if find_all or scan_depth:
+    if interactive and (find_all or scan_depth):
         print('    [yellow]You have 5 seconds after the above message(s) to cancel. (Ctrl + C to cancel)[/yellow]')
         sleep(5)
 
-    previous_scan = check_for_diff(url)
+    if scan_options['browser_endpoint'] is None:
+        project_config = find_config_in_parents() or Config()
+        scan_options['browser_endpoint'] = project_config.get('browser_endpoint')
+
+    baseline = prefetch_diff_baseline(url) if interactive and not replaying else None
     telemetry = get_telemetry_manager()
 
     try:
-        print('Checking robots.txt...')
-        robots_result = check_robots_txt(url, proxies=proxies)
-        crawl_delay = robots_result.get('crawl_delay')
-
-        print('Analyzing TLS fingerprint...')
-        tls_result = asyncio.run(analyze_tls_fingerprint(url, proxies=proxies))
-
-        print('Analyzing for advanced fingerprinting...')
-        fingerprint_result = analyze_fingerprinting(url, proxies=proxies)
-
-        print('Performing function integrity analysis...')
-        integrity_result = analyze_function_integrity(url, proxies=proxies)
-
-        print('Analyzing JavaScript rendering...')
-        js_result = analyze_js_rendering(url, proxies=proxies)
-
-        if scan_depth is None:
-            print('Analyzing for behavioral traps (default scan)...')
-        else:
-            print(f'Analyzing for behavioral traps ({scan_depth} scan)...')
-        behavioral_result = detect_honeypots(url, scan_depth=scan_depth, proxies=proxies)
+        complete_scan_result = run_scan(url, **scan_options)
+        score_card = complete_scan_result['score_card']
 
-        print('Detecting CAPTCHA...')
-        captcha_result = detect_captcha(url, service_name=captcha_service, api_key=captcha_api_key, proxies=proxies)
+        if capture:
+            capture.save()
+            set_active_capture(None)
 
-        if impersonate:
-            print('Profiling rate limits with browser-like client...')
-        else:
-            print('Profiling rate limits with Python client...')
-        rate_limit_result = asyncio.run(profile_rate_limits(url, crawl_delay, impersonate, proxies=proxies))
-
-        print('Running WAF detection...')
-        waf_result = detect_waf(url, find_all, proxies=proxies)
-
-        all_results = {
-            'robots': robots_result,
-            'tls': tls_result,
-            'js': js_result,
-            'behavioral': behavioral_result,
-            'captcha': captcha_result,
-            'rate_limit': rate_limit_result,
-            'waf': waf_result,
-            'fingerprint': fingerprint_result,
-            'integrity': integrity_result
-        }
-
-        score_card = calculate_difficulty_score(all_results)
-        recommendations = generate_recommendations(all_results)
-
-        complete_scan_result = {
-            'url': url,
-            'score_card': score_card,
-            'protections': all_results,
-            'recommendations': recommendations
-        }
-
-        telemetry.prompt_usage_telemetry()
-        telemetry.prompt_scan_telemetry()
+        if interactive:
+            telemetry.prompt_usage_telemetry()
+            telemetry.prompt_scan_telemetry()
 
         telemetry.track_usage_event('scan_complete', __version__, metadata = {
             'score': score_card['score'],
             'difficulty_label': score_card['label']
-        }, silent=True)
+        }, silent=True, flush=not replaying)
 
-        telemetry.contribute_scan(url, complete_scan_result, __version__, silent=False)
+        reused = is_fully_reused(complete_scan_result)
 
         config = find_config_in_parents()
-        auto_upload_enabled = config.get('auto_upload', False) if config else False
-
-        if auto_upload_enabled:
-            upload_success = try_upload_scan(url, complete_scan_result, cli_version=__version__)
-            
-            if not upload_success:
-                save_to_cache(url, complete_scan_result, cli_version=__version__)
-                print('[yellow]⚠️  Upload failed. Results cached locally.[/yellow]')
-                print('[dim]    Run [cyan]caniscrape push[/cyan] to retry.[/dim]')
+        auto_upload_enabled = bool(config and config.is_linked() and config.get('auto_upload', False))
+
+        if replaying:
+            print('[dim]📼 Replayed scan. Results were not saved or uploaded.[/dim]')
+        elif reused:
+            print('[dim]♻️  All results were fresh enough to reuse (--max-age). Nothing new to save or upload.[/dim]')
         else:
-            save_to_cache(url, complete_scan_result, cli_version=__version__)
-            print('[dim]💾 Results saved locally. Run [cyan]caniscrape push[/cyan] to upload.[/dim]')
+            scan_id = save_to_cache(url, complete_scan_result, cli_version=__version__)
+            contribute = telemetry.is_scan_telemetry_enabled()
+            queue_scan_deliveries(scan_id, upload=auto_upload_enabled, contribute=contribute)
+
+            if auto_upload_enabled:
+                print(f'[dim]📤 Uploading to \'{config.get("project_name", "your project")}\' in the background. Failed uploads stay queued for [cyan]caniscrape push[/cyan].[/dim]')
+            else:
+                print('[dim]💾 Results saved locally. Run [cyan]caniscrape push[/cyan] to upload.[/dim]')
+            if contribute:
+                print('[dim]🌍 Contributing scan to the public database in the background.[/dim]')
     
     except Exception as e:
+        set_active_capture(None)
         telemetry.track_usage_event('scan_error', __version__, metadata = {
             'error_type': type(e).__name__,
             'error_message': str(e)[:100]
-        }, silent=True)
+        }, silent=True, flush=not replaying)
         raise
 
-    if should_show_diff(previous_scan):
-        current_scan = {
-            'url': url,
-            'score_card': score_card,
-            'protections': all_results,
-            'recommendations': recommendations
-        }
-
-        diff = compare_scans(current_scan, previous_scan)
-        try:
-            prev_date = datetime.fromisoformat(previous_scan['created_at']).strftime('%Y-%m-%d %H:%M')
-        except:
-            prev_date = 'previous scan'
-        display_diff(diff, prev_date)
+    return complete_scan_result, baseline
+
+def _print_scan_report(complete_scan_result: dict) -> None:
+    """
+    Renders a complete scan result to the terminal.
+    """
+    score_card = complete_scan_result['score_card']
+    recommendations = complete_scan_result['recommendations']
+    all_results = complete_scan_result['protections']
+
+    robots_result = all_results['robots']
+    tls_result = all_results['tls']
+    js_result = all_results['js']
+    behavioral_result = all_results['behavioral']
+    captcha_result = all_results['captcha']
+    rate_limit_result = all_results['rate_limit']
+    waf_result = all_results['waf']
+    fingerprint_result = all_results['fingerprint']
+    integrity_result = all_results['integrity']
 
     print('\n')
     print(Rule(f"[bold white on blue] DIFFICULTY SCORE: {score_card['score']}/10 ({score_card['label']}) [/]", style="blue"))
@@ -433,6 +568,10 @@ def scan_command(url: str, find_all: bool, impersonate: bool, scan_depth: str |
             print(f'    [yellow]⚠️  JavaScript: Required for some content. {js_result["content_difference_%"]}% of content is missing without JS.[/yellow]')
         else:
             print(f'    [green]✅ JavaScript: Not required for main content.[/green]')
+        js_only_regions = js_result.get('js_only_regions', [])
+        if js_only_regions and js_result.get('js_required'):
+            regions = ', '.join(r['region'] for r in js_only_regions[:5])
+            print(f'      [dim]JS-only regions: {regions}[/dim]')
     else:
         print(f'    [yellow]⚠️  JavaScript: Analysis failed. Reason: {js_result["message"]}[/yellow]')
 
@@ -520,6 +659,10 @@ def scan_command(url: str, find_all: bool, impersonate: bool, scan_depth: str |
                 for line in display_lines:
                     print(f'        [red]- {line}[/red]')
 
+            if waf_result.get('source') == 'passive':
+                evidence = [item for items in waf_result.get('evidence', {}).values() for item in items]
+                print(f'      [dim]Identified from scan responses: {escape("; ".join(evidence[:3]))}[/dim]')
+
     print()
     print(Rule("[bold]💡 RECOMMENDATIONS[/bold]", style="cyan"))
 
@@ -538,6 +681,84 @@ def scan_command(url: str, find_all: bool, impersonate: bool, scan_depth: str |
     print(Rule("[bold]Analysis Complete[/bold]", style="green"))
     print()
 
+@cli.command(name='batch')
+@click.argument('url_file', type=click.File('r'))
+@click.option('--output', '-o', default='-', show_default=True, help='Where to write results: "-" for stdout, a file path (appended to), or a directory when rotating.')
+@click.option('--gzip', 'compress', is_flag=True, default=False, help='Gzip-compress the output files (also implied by a .gz file name).')
+@click.option('--rotate-size', type=float, default=None, help='Start a new output file after this many megabytes (requires a directory for --output).')
+@click.option('--rotate-records', type=int, default=None, help='Start a new output file after this many results (requires a directory for --output).')
+@click.option('--flush-interval', type=float, default=1.0, show_default=True, help='Flush output at least this often, in seconds.')
+@click.option('--flush-every', type=int, default=None, help='Also flush after this many results.')
+@click.option('--find-all', is_flag=True, default=False, help='Always run wafw00f with its --find-all tag.')
+@click.option('--impersonate', is_flag=True, default=False, help='Profile rate limits with a browser-like client.')
+@click.option('--thorough', 'scan_depth', flag_value='thorough', help='Thorough behavioral scan (slower).')
+@click.option('--deep', 'scan_depth', flag_value='deep', help='Deep behavioral scan (much slower).')
+@click.option('--proxy', 'proxies', multiple=True, type=str, help='Proxy to use for requests. Can be used multiple times to create a rotation pool.')
+@click.option('--captcha-service', type=click.Choice(['capsolver', '2captcha'], case_sensitive=False), default=None, help='The CAPTCHA solving service to use (optional).')
+@click.option('--captcha-api-key', type=str, default=None, help='API key for the selected CAPTCHA solving service.')
+@click.option('--browser-endpoint', type=str, default=None, help='Attach to an existing Chromium instead of launching one. Defaults to the browser-endpoint config value.')
+@click.option('--waf-engine', type=click.Choice(['auto', 'library', 'subprocess'], case_sensitive=False), default='auto', help='How to run wafw00f when it is needed. Default is auto.')
+@click.option('--max-age', type=str, default=None, callback=_parse_max_age, help='Reuse stored results younger than this (e.g. 6h) and only re-run stale analyzers.')
+@click.option('--ttl', 'ttls', multiple=True, callback=_parse_ttls, help='Override an analyzer TTL used with --max-age and host sharing, as ANALYZER=DURATION.')
+@click.option('--no-host-sharing', 'share_host_results', is_flag=True, flag_value=False, default=True, help='Run robots, TLS, rate-limit and WAF checks for every URL instead of once per site.')
+def batch(url_file, output, compress, rotate_size, rotate_records, flush_interval, flush_every, browser_endpoint, waf_engine, share_host_results, **scan_options):
+    """
+    Scan many URLs and stream the results as NDJSON.
+
+    URLs are read one per line from URL_FILE ("-" for stdin) and each
+    result is written as one JSON line as soon as its scan finishes, so
+    memory stays flat and the output can be tailed while the batch runs.
+    """
+    if browser_endpoint is None:
+        project_config = find_config_in_parents() or Config()
+        browser_endpoint = project_config.get('browser_endpoint')
+
+    try:
+        sink = open_result_sink(
+            output,
+            compress=compress,
+            rotate_bytes=int(rotate_size * 1024 * 1024) if rotate_size else None,
+            rotate_records=rotate_records,
+            flush_interval=flush_interval,
+            flush_every=flush_every
+        )
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    batch_command(url_file, sink, cli_version=__version__, share_host_results=share_host_results, browser_endpoint=browser_endpoint, waf_engine=waf_engine.lower(), **scan_options)
+
+@cli.command(name='export')
+@click.argument('output', type=click.Path(dir_okay=False))
+@click.option('--format', 'file_format', type=click.Choice(EXPORT_FORMATS, case_sensitive=False), default=None, help='Output format. Inferred from the OUTPUT extension when omitted (csv otherwise).')
+@click.option('--from', 'sources', multiple=True, type=click.Path(), help=f'Scan results to export: a history database, a batch NDJSON file (.ndjson or .ndjson.gz) or a directory of them. Can be used multiple times. Default: {DEFAULT_SOURCE}')
+@click.option('--chunk-size', type=click.IntRange(min=1), default=DEFAULT_CHUNK_SIZE, show_default=True, help='Rows flattened and written at a time.')
+def export(output, file_format, sources, chunk_size):
+    """
+    Export scan results as a flat table for analytics.
+
+    Each scan becomes one row with typed columns: score and label, the
+    status and key fields of every analyzer, WAF names, detected services
+    and timings. Parquet and Arrow output require pyarrow.
+    """
+    file_format = (file_format or infer_format(output) or 'csv').lower()
+    export_command(output, file_format, sources or (DEFAULT_SOURCE,), chunk_size=chunk_size)
+
+@cli.command(name='history')
+@click.argument('target', required=False)
+@click.option('--since', type=str, default=None, callback=_parse_max_age, help='Only use scans from this recent period, e.g. 30d or 12h. Default: all of them.')
+@click.option('--format', 'output_format', type=click.Choice(['table', 'json'], case_sensitive=False), default='table', help='Output format.')
+@click.option('--limit', type=click.IntRange(min=1), default=50, show_default=True, help='Rows shown in tables (hosts, or the most recent changes).')
+def history(target, since, output_format, limit):
+    """
+    Show score trends from the local scan history.
+
+    Without TARGET, summarizes every host: first and latest score, how
+    fast the score is moving and how often the protections changed.
+    With a URL or host name, shows its score series and every change:
+    score moves, analyzer status changes and shifts in the score level.
+    """
+    history_command(target, since=since, output_format=output_format.lower(), limit=limit)
+
 @cli.command(name='analyze', hidden=True)
 @click.argument('url')
 @click.option('--find-all', is_flag=True, default=False)
@@ -547,6 +768,13 @@ def scan_command(url: str, find_all: bool, impersonate: bool, scan_depth: str |
 @click.option('--proxy', 'proxies', multiple=True, type=str)
 @click.option('--captcha-service', type=click.Choice(['capsolver', '2captcha'], case_sensitive=False), default=None)
 @click.option('--captcha-api-key', type=str, default=None)
+@click.option('--browser-endpoint', type=str, default=None)
+@click.option('--record', 'record_dir', type=click.Path(file_okay=False), default=None)
+@click.option('--replay', 'replay_dir', type=click.Path(file_okay=False), default=None)
+@click.option('--waf-engine', type=click.Choice(['auto', 'library', 'subprocess'], case_sensitive=False), default='auto')
+@click.option('--format', 'output_format', type=click.Choice(['text', 'json', 'ndjson'], case_sensitive=False), default='text')
+@click.option('--max-age', type=str, default=None, callback=_parse_max_age)
+@click.option('--ttl', 'ttls', multiple=True, callback=_parse_ttls)
 @click.pass_context
 def analyze_alias(ctx, url, **kwargs):
     """
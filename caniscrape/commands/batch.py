@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import sys
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from typing import Iterator, TextIO
+from rich import print
+
+from ..scanner import run_scan, is_fully_reused, HostResultCache
+from ..diff import Change, describe_change, diff_protections
+from ..result_sink import ResultSink
+from ..history_store import get_scan_store
+
+def iter_urls(source: TextIO) -> Iterator[str]:
+    """
+    Lazily yields URLs from a file, one per line. Blank lines and # comments are skipped,
+    and a missing scheme defaults to http:// like the scan command.
+    """
+    for line in source:
+        url = line.strip()
+        if not url or url.startswith('#'):
+            continue
+        if not url.startswith(('http://', 'https://')):
+            url = f'http://{url}'
+        yield url
+
+def _format_changes(changes: list[Change]) -> str:
+    signs = {'added': '+', 'removed': '-'}
+    return ', '.join(f'{signs.get(change.kind, "~")}{describe_change(change)}' for change in changes)
+
+def batch_command(source: TextIO, sink: ResultSink, cli_version: str | None = None, share_host_results: bool = True, **scan_options) -> None:
+    """
+    Scan every URL from `source` and write each result to `sink` as soon as it finishes.
+    Only host-scoped analyzer results are kept between URLs, so pages of the same site run
+    the robots, TLS, rate-limit and WAF checks once. Progress is printed to stderr.
+    New results are also kept in the local history store (not queued for upload), so a
+    later batch with --max-age can reuse them. Each result is diffed against the URL's previous
+    stored scan; the differences are printed and written to the record as `changes`.
+    """
+    scanned = 0
+    failed = 0
+    changed = 0
+    host_cache = HostResultCache(scan_options.get('ttls')) if share_host_results else None
+
+    with redirect_stdout(sys.stderr), sink:
+        print(f'[bold blue]📦 Batch scan, writing results to {sink.describe()}[/bold blue]')
+
+        for url in iter_urls(source):
+            print(f'\n🔍 [{scanned + 1}] Analyzing: [bold blue]{url}[/bold blue]...')
+            started_at = datetime.now(timezone.utc).isoformat()
+
+            try:
+                result = run_scan(url, host_cache=host_cache, **scan_options)
+                store = get_scan_store()
+                baseline = store.latest_scan(url=url)
+                if not is_fully_reused(result):
+                    store.add_scan(url, result, cli_version=cli_version, upload_status=None)
+                record = {**result, 'status': 'success'}
+                print(f"[green]✅ {url}: {result['score_card']['score']}/10 ({result['score_card']['label']})[/green]")
+
+                if baseline is not None:
+                    changes = diff_protections(baseline.get('protections', {}), result.get('protections', {}))
+                    record['changes'] = [change._asdict() for change in changes]
+                    if changes:
+                        changed += 1
+                        print(f'[yellow]⚠️  {url}: changed since {baseline["scanned_at"][:16].replace("T", " ")}: {_format_changes(changes)}[/yellow]')
+            except KeyboardInterrupt:
+                raise
+            except Exception as e:
+                failed += 1
+                record = {'url': url, 'status': 'error', 'error': {'type': type(e).__name__, 'message': str(e)}}
+                print(f'[red]❌ {url}: {type(e).__name__}: {str(e)}[/red]')
+
+            record['scanned_at'] = started_at
+            sink.write(record)
+            scanned += 1
+
+        print(f'\n[bold]Scanned {scanned} URL(s), {failed} failed.[/bold] Results: {sink.describe()}')
+        if changed:
+            print(f'[yellow]⚠️  {changed} URL(s) changed since their previous scan.[/yellow]')
+        if host_cache is not None and host_cache.hits:
+            print(f'[dim]Host-level checks were shared {host_cache.hits} time(s) between pages of the same site.[/dim]')
@@ -1,20 +1,39 @@
-from ..config import find_config_in_parents
+from ..config import Config, find_config_in_parents
 from rich import print
 
 def set_config_command(key, value):
     """
     Update configuration settings.
     """
+    if key == 'browser-endpoint':
+        config = find_config_in_parents() or Config()
+
+        if value.lower() in ('off', 'none', ''):
+            config.delete('browser_endpoint')
+            config.save()
+            print('[blue]ℹ️  Browser endpoint cleared[/blue]')
+            print('[dim]Scans will launch their own headless Chromium.[/dim]')
+        else:
+            config.set('browser_endpoint', value)
+            config.save()
+            print(f'[green]✅ Browser endpoint set to [cyan]{value}[/cyan][/green]')
+            print('[dim]Browser-based analyzers will attach to this browser instead of launching one.[/dim]')
+        return
+
     config = find_config_in_parents()
 
     if not config or not config.is_linked():
         print('[red]❌ Not linked to a project. Run [cyan]caniscrape init[/cyan] first.[/red]')
         return
-    
+
     if key == 'auto-upload':
+        if value not in ('on', 'off'):
+            print('[red]❌ auto-upload must be "on" or "off".[/red]')
+            return
+
         config.set('auto_upload', value == 'on')
         config.save()
-        
+
         if value == 'on':
             print('[green]✅ Auto-upload enabled[/green]')
             print('[dim]Scans will now automatically sync to your cloud project.[/dim]')
@@ -27,14 +46,19 @@ def show_config_command():
     Show current configuration.
     """
     config = find_config_in_parents()
-    
+
     if not config or not config.is_linked():
         print('[red]❌ Not linked to a project[/red]')
         print('[dim]Run [cyan]caniscrape init[/cyan] or [cyan]caniscrape link[/cyan] to get started.[/dim]')
+
+        browser_endpoint = Config().get('browser_endpoint')
+        if browser_endpoint:
+            print(f'\nBrowser endpoint: [cyan]{browser_endpoint}[/cyan]')
         return
-    
+
     print('\n[bold cyan]📋 Project Configuration[/bold cyan]\n')
     print(f'Project: [bold]{config.get("project_name", "Unknown")}[/bold]')
     print(f'Project ID: [dim]{config.get_project_id()}[/dim]')
     print(f'Auto-upload: {"[green]✅ Enabled[/green]" if config.get("auto_upload") else "[yellow]❌ Disabled[/yellow]"}')
-    print()
\ No newline at end of file
+    print(f'Browser endpoint: {config.get("browser_endpoint") or "[dim]local (launched per scan)[/dim]"}')
+    print()
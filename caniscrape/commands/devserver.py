@@ -0,0 +1,32 @@
+from rich import print
+from rich.table import Table
+
+from ..devserver import DevServer, SCENARIOS
+
+def devserver_command(host: str, port: int, verbose: bool):
+    """
+    Run the local fixture server until interrupted.
+    """
+    try:
+        server = DevServer(host, port, verbose=verbose)
+    except OSError as e:
+        print(f'[red]❌ Could not start dev server on {host}:{port}: {str(e)}[/red]')
+        return
+
+    table = Table(title='Scenarios', show_header=True, header_style='bold cyan')
+    table.add_column('URL')
+    table.add_column('Emulates')
+    for path, (description, _) in SCENARIOS.items():
+        table.add_row(f'{server.base_url}{path}', description)
+
+    print(f'[bold blue]🧪 caniscrape dev server running at {server.base_url}[/bold blue]\n')
+    print(table)
+    print(f'\n[dim]Cloud API stub at {server.base_url}/api/ (set "api_endpoint" in .caniscrape/config to use it).[/dim]')
+    print(f'[dim]Try: [cyan]caniscrape scan {server.base_url}/waf/cloudflare[/cyan]. Press Ctrl+C to stop.[/dim]')
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print('\n[dim]Dev server stopped.[/dim]')
+    finally:
+        server.server_close()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from pathlib import Path
+from rich import print
+
+from ..export import DEFAULT_CHUNK_SIZE, check_format_dependencies, iter_source_records, export_records
+
+def export_command(output: str, file_format: str, sources: tuple[str, ...], chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+    """
+    Export stored scan results as one flat table (CSV, Parquet or Arrow) for analytics tools.
+    """
+    missing = [source for source in sources if not Path(source).exists()]
+    if missing:
+        print(f'[yellow]⚠️  No scan results found at: {", ".join(missing)}[/yellow]')
+        print('[dim]Run some scans first, or pass --from with a batch NDJSON file or directory.[/dim]')
+        return
+
+    def records():
+        for source in sources:
+            yield from iter_source_records(source)
+
+    def report(rows_written: int) -> None:
+        print(f'[dim]  {rows_written} row(s) written...[/dim]')
+
+    try:
+        check_format_dependencies(file_format)
+    except ImportError as e:
+        print(f'[red]❌ {e}[/red]')
+        return
+
+    print(f'[bold blue]📊 Exporting scan results to {output} ({file_format})...[/bold blue]')
+
+    rows = export_records(records(), output, file_format, chunk_size=chunk_size, on_chunk=report)
+
+    if rows == 0:
+        print('[yellow]⚠️  No scan results to export. Wrote the header only.[/yellow]')
+        return
+    print(f'[green]✅ Exported {rows} scan(s) to {output}[/green]')
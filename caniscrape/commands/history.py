@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime, timedelta, timezone
+from rich import print
+from rich.markup import escape
+from rich.table import Table
+
+from ..history import HistoryEvent, HostTrend, TargetHistory, host_trends, target_history
+from ..history_store import HISTORY_DB_PATH, ScorePoint, get_scan_store
+from ..utils.serialization import dumps
+
+SPARK_CHARS = '▁▂▃▄▅▆▇█'
+SPARK_WIDTH = 40
+MAX_SCORE = 10
+# Trends smaller than this (points per TREND_PERIOD_DAYS) are shown as flat.
+FLAT_TREND = 0.1
+
+def _sparkline(scores: list[int]) -> str:
+    scores = scores[-SPARK_WIDTH:]
+    top = len(SPARK_CHARS) - 1
+    return ''.join(SPARK_CHARS[round(min(max(score, 0), MAX_SCORE) / MAX_SCORE * top)] for score in scores)
+
+def _day(timestamp: str) -> str:
+    return timestamp[:10]
+
+def _moment(timestamp: str) -> str:
+    return timestamp[:16].replace('T', ' ')
+
+def _colored_move(before: float, after: float, text: str) -> str:
+    if after > before:
+        return f'[red]{text}[/red]'
+    if after < before:
+        return f'[green]{text}[/green]'
+    return text
+
+def _describe(event: HistoryEvent) -> str:
+    if event.kind == 'score':
+        return _colored_move(event.before, event.after, f'Difficulty score {event.before} → {event.after}')
+    if event.kind == 'shift':
+        return _colored_move(event.before, event.after, f'[bold]Score level shifted {event.before} → {event.after}[/bold]')
+    if event.kind == 'status':
+        return f'[yellow]{escape(event.subject)}: {event.before} → {event.after}[/yellow]'
+    return '[yellow]Protections changed[/yellow]'
+
+def _format_trend(trend: HostTrend) -> str:
+    if trend.slope is None:
+        return '[dim]-[/dim]'
+    if abs(trend.slope) < FLAT_TREND:
+        return '[dim]flat[/dim]'
+    return _colored_move(0, trend.slope, f'{trend.slope:+.1f}')
+
+def _print_json(payload) -> None:
+    sys.stdout.buffer.write(dumps(payload, pretty=True) + b'\n')
+
+def _show_hosts(trends: list[HostTrend], output_format: str, limit: int) -> None:
+    if output_format == 'json':
+        _print_json([trend._asdict() for trend in trends])
+        return
+
+    if not trends:
+        print('[yellow]⚠️  No scored scans in the history.[/yellow]')
+        return
+
+    harder = sum(1 for trend in trends if trend.slope is not None and trend.slope >= FLAT_TREND)
+    easier = sum(1 for trend in trends if trend.slope is not None and trend.slope <= -FLAT_TREND)
+    print(f'[bold blue]📈 Score trends of {len(trends)} host(s)[/bold blue]')
+    print(f'[dim]{harder} getting harder to scrape, {easier} getting easier. Trend is score points per 30 days.[/dim]\n')
+
+    table = Table(show_header=True, header_style='bold cyan')
+    table.add_column('Host', style='bold')
+    table.add_column('Scans', justify='right')
+    table.add_column('URLs', justify='right')
+    table.add_column('Score', justify='center')
+    table.add_column('Trend', justify='right')
+    table.add_column('Changes', justify='right')
+    table.add_column('Last Scan', style='dim')
+
+    for trend in trends[:limit]:
+        table.add_row(
+            escape(trend.host),
+            str(trend.scans),
+            str(trend.urls),
+            _colored_move(trend.first_score, trend.last_score, f'{trend.first_score} → {trend.last_score}'),
+            _format_trend(trend),
+            str(trend.changes),
+            _day(trend.last_at)
+        )
+    print(table)
+    if len(trends) > limit:
+        print(f'[dim]... and {len(trends) - limit} more host(s). Use --limit to show more.[/dim]')
+
+def _show_target(history: TargetHistory, output_format: str, limit: int) -> None:
+    if output_format == 'json':
+        _print_json({
+            'target': history.target,
+            'series': [point._asdict() for point in history.series],
+            'events': [event._asdict() for event in history.events],
+        })
+        return
+
+    if not history.series:
+        print(f'[yellow]⚠️  No stored scans of {escape(history.target)}.[/yellow]')
+        print('[dim]Pass a full URL (with http:// or https://) or a host name as it appears in your scans.[/dim]')
+        return
+
+    by_url: dict[str, list[ScorePoint]] = {}
+    for point in history.series:
+        by_url.setdefault(point.url, []).append(point)
+    first = min(point.scanned_at for point in history.series)
+    last = max(point.scanned_at for point in history.series)
+
+    print(f'[bold blue]📈 History of {escape(history.target)}[/bold blue]')
+    print(f'[dim]{len(history.series)} scan(s) of {len(by_url)} URL(s), {_day(first)} → {_day(last)}[/dim]\n')
+
+    shifts: dict[str, int] = {}
+    for event in history.events:
+        if event.kind == 'shift':
+            shifts[event.url] = shifts.get(event.url, 0) + 1
+
+    table = Table(show_header=True, header_style='bold cyan')
+    table.add_column('URL', style='bold', overflow='fold')
+    table.add_column('Scans', justify='right')
+    table.add_column('Score', justify='center')
+    table.add_column(f'Last {SPARK_WIDTH} Scores', no_wrap=True)
+    table.add_column('Shifts', justify='right')
+    for url, points in by_url.items():
+        scores = [point.score for point in points if point.score is not None]
+        score = _colored_move(scores[0], scores[-1], f'{scores[0]} → {scores[-1]}') if scores else '-'
+        table.add_row(escape(url), str(len(points)), score, _sparkline(scores), str(shifts.get(url, 0)))
+    print(table)
+
+    if not history.events:
+        print('\n[dim]ℹ️  No changes in this period.[/dim]')
+        return
+
+    events = history.events[-limit:]
+    print(f'\n[bold]Changes[/bold] [dim]({len(history.events)} total, newest last)[/dim]')
+    events_table = Table(show_header=True, header_style='bold cyan')
+    events_table.add_column('When', style='dim')
+    if len(by_url) > 1:
+        events_table.add_column('URL', overflow='fold')
+    events_table.add_column('Change')
+    for event in events:
+        row = [_moment(event.scanned_at)]
+        if len(by_url) > 1:
+            row.append(escape(event.url))
+        row.append(_describe(event))
+        events_table.add_row(*row)
+    print(events_table)
+    if len(history.events) > limit:
+        print(f'[dim]Showing the last {limit}. Use --limit to show more, or --format json for all of them.[/dim]')
+
+def history_command(target: str | None, since: int | None = None, output_format: str = 'table', limit: int = 50) -> None:
+    """
+    Score trends from the local scan history: a summary of every host, or the series and change events
+    of one URL or host. `since` limits the history to the last that many seconds.
+    """
+    if not HISTORY_DB_PATH.exists():
+        if output_format == 'json':
+            _print_json([] if target is None else {'target': target, 'series': [], 'events': []})
+            return
+        print(f'[yellow]⚠️  No scan history found at {HISTORY_DB_PATH}.[/yellow]')
+        print('[dim]Run some scans first; each one is stored in the history of the current directory.[/dim]')
+        return
+
+    store = get_scan_store()
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=since) if since is not None else None
+
+    if target is None:
+        _show_hosts(host_trends(store, cutoff), output_format, limit)
+    else:
+        _show_target(target_history(store, target, cutoff), output_format, limit)
@@ -1,14 +1,50 @@
 import click
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from rich import print
-from pathlib import Path
-import json
+from rich.progress import Progress, BarColumn, MofNCompleteColumn, TextColumn, TimeRemainingColumn
 
 from ..config import Config, find_config_in_parents
-from ..api_client import ApiClient, ApiError
+from ..async_api_client import get_api_client
+from ..history_store import get_scan_store
+from ..utils.retry import backoff_delay, DEFAULT_MAX_DELAY
 
-def push_command():
+DEFAULT_PUSH_CONCURRENCY = 8
+PUSH_BATCH_SIZE = 50
+UPLOAD_ATTEMPTS = 5
+
+def _upload_batch_with_retry(client, project_id: str, batch: list[tuple[int, dict]]) -> dict[int, dict]:
+    """
+    Uploads a batch of (scan_id, scan) pairs and retries only the scans that failed with a retryable
+    error (rate limit, server or network error), with backoff. Returns the final result per scan id.
+    """
+    outcomes = {}
+    remaining = batch
+    for attempt in range(UPLOAD_ATTEMPTS):
+        results = client.upload_scans_batch(project_id, [scan for _, scan in remaining])
+
+        retry = []
+        wait_for = None
+        for (scan_id, scan), result in zip(remaining, results):
+            if result['status'] == 'error' and result.get('retryable') and attempt < UPLOAD_ATTEMPTS - 1:
+                retry.append((scan_id, scan))
+                if result.get('retry_after') is not None:
+                    wait_for = max(wait_for or 0, result['retry_after'])
+            else:
+                outcomes[scan_id] = result
+
+        if not retry:
+            break
+        time.sleep(min(wait_for if wait_for is not None else backoff_delay(attempt), DEFAULT_MAX_DELAY))
+        remaining = retry
+    return outcomes
+
+def push_command(concurrency: int = DEFAULT_PUSH_CONCURRENCY):
     """
     Push local scan results to your cloud project.
+    Scans are sent PUSH_BATCH_SIZE at a time as compressed batch uploads, up to `concurrency` batches
+    in parallel, and are retried with backoff on rate limits, server errors and network failures. Each scan is marked uploaded as soon as it succeeds, so an
+    interrupted push resumes where it stopped.
     """
     print('[bold blue]📤 Pushing scan results to cloud...[/bold blue]\n')
 
@@ -18,59 +54,100 @@ def push_command():
         print('[red]❌ Not linked to a cloud project.[/red]')
         print('[yellow]Run [cyan]caniscrape init[/cyan] to link this directory to a project.[/yellow]')
         return
-    
+
     project_id = config.get_project_id()
     project_name = config.get('project_name', 'Unknown')
     api_token = config.get_api_token()
     api_endpoint = config.get_api_endpoint()
 
-    cache_dir = Path('.caniscrape/cache')
+    store = get_scan_store()
+    pending = store.pending_uploads()
 
-    if not cache_dir.exists():
-        print('[yellow]⚠️  No local scan results found.[/yellow]')
-        print('[dim]Run some scans first, then push them to the cloud.[/dim]')
+    if not pending:
+        if store.count() == 0:
+            print('[yellow]⚠️  No local scan results found.[/yellow]')
+            print('[dim]Run some scans first, then push them to the cloud.[/dim]')
+        else:
+            print('[yellow]⚠️  No scan results to push.[/yellow]')
         return
-    
-    scan_files = list(cache_dir.glob('*.json'))
 
-    if not scan_files:
-        print('[yellow]⚠️  No scan results to push.[/yellow]')
-        return
-    
-    print(f'[dim]Found {len(scan_files)} scan result(s) to push...[/dim]\n')
+    print(f'[dim]Found {len(pending)} scan result(s) to push...[/dim]\n')
 
-    client = ApiClient(api_endpoint=api_endpoint, api_token=api_token)
+    client = get_api_client(api_endpoint, api_token)
 
     success_count = 0
     failed_count = 0
+    auth_failed = False
+    remaining = iter(pending)
+    in_flight = {}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor, Progress(
+        TextColumn('[bold blue]Pushing'), BarColumn(), MofNCompleteColumn(), TimeRemainingColumn()
+    ) as progress:
+        task = progress.add_task('push', total=len(pending))
+
+        def submit_next() -> bool:
+            """
+            Scans are loaded from the store only when a worker is about to need them,
+            so a large backlog never sits in memory all at once.
+            """
+            nonlocal failed_count
+            batch = []
+            for scan_id in remaining:
+                try:
+                    scan_data = store.get_scan(scan_id)
+                    url = scan_data.get('url', 'Unknown')
+                    cli_version = scan_data.pop('cli_version', None) or '1.0.0'
+                    scan_data.pop('scanned_at', None)
+                except Exception as e:
+                    progress.console.print(f'[yellow]⚠️  Error reading scan #{scan_id}: {str(e)}[/yellow]')
+                    progress.advance(task)
+                    failed_count += 1
+                    continue
+
+                batch.append((scan_id, {'url': url, 'scan_data': scan_data, 'cli_version': cli_version}))
+                if len(batch) >= PUSH_BATCH_SIZE:
+                    break
+
+            if not batch:
+                return False
+            future = executor.submit(_upload_batch_with_retry, client, project_id, batch)
+            in_flight[future] = {scan_id: scan['url'] for scan_id, scan in batch}
+            return True
+
+        for _ in range(concurrency * 2):
+            if not submit_next():
+                break
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                urls = in_flight.pop(future)
+                try:
+                    outcomes = future.result()
+                except Exception as e:
+                    outcomes = {scan_id: {'status': 'error', 'detail': str(e)} for scan_id in urls}
+
+                for scan_id, url in urls.items():
+                    result = outcomes.get(scan_id, {'status': 'error', 'detail': 'No result'})
+                    if result['status'] == 'created':
+                        store.mark_uploaded(scan_id, project_id)
+                        success_count += 1
+                    else:
+                        progress.console.print(f'[red]❌ Failed to push {url}: {result.get("detail")}[/red]')
+                        store.mark_upload_failed(scan_id, str(result.get('detail')))
+                        failed_count += 1
+                        if result.get('status_code') == 401:
+                            auth_failed = True
+                    progress.advance(task)
+
+                if not auth_failed:
+                    submit_next()
 
-    for file in scan_files:
-        try:
-            with open(file, 'r') as f:
-                scan_data = json.load(f)
-            
-            url = scan_data.get('url', 'Unknown')
-            cli_version = scan_data.get('cli_version', '1.0.0')
-
-            client.upload_scan(
-                project_id=project_id,
-                url=url,
-                scan_data=scan_data['scan_data'],
-                cli_version=cli_version
-            )
-
-            print(f'[green]✅ Pushed: {url}[/green]')
-            file.unlink()
-            success_count += 1
-        except ApiError as e:
-            print(f'[red]❌ Failed to push {file.name}: {str(e)}[/red]')
-            failed_count += 1
-        except Exception as e:
-            print(f'[yellow]⚠️  Error reading {file.name}: {str(e)}[/yellow]')
-            failed_count += 1
-    
     print()
     if success_count > 0:
         print(f'[green]🚀 Successfully pushed {success_count} scan(s) to \'{project_name}\'[/green]')
     if failed_count > 0:
-        print(f'[yellow]⚠️  Failed to push {failed_count} scan(s)[/yellow]')
\ No newline at end of file
+        print(f'[yellow]⚠️  Failed to push {failed_count} scan(s)[/yellow]')
+    if auth_failed:
+        print('[yellow]Stopped early because authentication failed. Run [cyan]caniscrape init[/cyan] to re-authenticate, then push again.[/yellow]')
@@ -1,13 +1,73 @@
 import click
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from rich import print
+from rich.progress import Progress, BarColumn, MofNCompleteColumn, TextColumn, TimeRemainingColumn
 from rich.prompt import Confirm
 
 from ..config import Config, find_config_in_parents
-from ..api_client import ApiClient, ApiError
+from ..api_client import ApiError
+from ..async_api_client import get_api_client
+from ..utils.retry import retry_call
 
-def telemetry_push_command():
+DEFAULT_CONTRIBUTE_CONCURRENCY = 8
+LIST_PAGE_SIZE = 100
+
+def _with_retries(func):
+    """
+    Retries rate limits, server errors and network failures with backoff, honouring Retry-After.
+    """
+    return retry_call(
+        func,
+        should_retry=lambda e: isinstance(e, ApiError) and e.retryable,
+        retry_after=lambda e: getattr(e, 'retry_after', None)
+    )
+
+def _page_count(response: dict, per_page: int) -> int | None:
+    """
+    Number of pages, if the list response says how many scans (or pages) there are.
+    """
+    for key in ('total_pages', 'pages'):
+        if isinstance(response.get(key), int):
+            return response[key]
+    total = response.get('total')
+    if isinstance(total, int):
+        return max(1, -(-total // per_page))
+    return None
+
+def _list_all_scans(client, project_id: str, concurrency: int) -> list[dict]:
+    """
+    Every scan in the project. When the first page tells how many there are, the other pages are fetched
+    concurrently; otherwise pages are read in order until a short one. Scans are deduplicated by id, in case
+    new uploads shift them between pages while listing.
+    """
+    def list_page(page: int) -> dict:
+        return _with_retries(lambda: client.list_scans(project_id=project_id, page=page, per_page=LIST_PAGE_SIZE))
+
+    first = list_page(1)
+    per_page = first.get('per_page') or LIST_PAGE_SIZE
+    pages = [first]
+
+    page_count = _page_count(first, per_page)
+    if page_count is not None:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pages.extend(executor.map(list_page, range(2, page_count + 1)))
+    else:
+        page = 1
+        while len(pages[-1].get('scans', [])) >= per_page:
+            page += 1
+            pages.append(list_page(page))
+
+    scans = {}
+    for response in pages:
+        for scan in response.get('scans', []):
+            scans.setdefault(scan.get('id'), scan)
+    return list(scans.values())
+
+def telemetry_push_command(concurrency: int = DEFAULT_CONTRIBUTE_CONCURRENCY):
     """
     Contribute your scan data to public telemetry (opt-in).
+    Lists every scan in the project (all pages) and contributes the ones not contributed yet,
+    `concurrency` at a time, retrying rate limits and server errors.
     """
     print('[bold cyan]📊 Contribute to Public Telemetry[/bold cyan]\n')
 
@@ -57,39 +117,48 @@ def telemetry_push_command():
     print('[dim]Checking for scans to contribute...[/dim]')
 
     try:
-        client = ApiClient(api_endpoint=api_endpoint, api_token=api_token)
+        client = get_api_client(api_endpoint=api_endpoint, api_token=api_token)
         
-        scans = client.list_scans(project_id=project_id, per_page=100)
-        scans_list = scans.get('scans', [])
+        scans_list = _list_all_scans(client, project_id, concurrency)
 
         if not scans_list:
             print('[yellow]⚠️  No scans found in your project.[/yellow]')
             print('[dim]Run some scans first, then contribute them to telemetry.[/dim]')
             return
         
-        contributed = 0
-        for scan in scans_list:
-            scan_id = scan.get('id')
-            url = scan.get('url', 'unknown')
-
-            already_contributed = scan.get('telemetry_contributed', False)
+        pending = [scan for scan in scans_list if not scan.get('telemetry_contributed', False)]
+        if not pending:
+            print('\n[dim]All scans have already been contributed to telemetry.[/dim]')
+            return
 
-            if already_contributed:
-                continue
+        print(f'[dim]Contributing {len(pending)} of {len(scans_list)} scan(s)...[/dim]\n')
 
-            try:
-                client._request('POST', f'/api/telemetry/contribute/{scan_id}')
-                print(f'[green]✅ Contributed: {url}[/green]')
-                contributed += 1
-            except ApiError as e:
-                print(f'[yellow]⚠️  Failed to contribute {url}: {str(e)}[/yellow]')
+        contributed = 0
+        failed = 0
+        with ThreadPoolExecutor(max_workers=concurrency) as executor, Progress(
+            TextColumn('[bold cyan]Contributing'), BarColumn(), MofNCompleteColumn(), TimeRemainingColumn()
+        ) as progress:
+            task = progress.add_task('contribute', total=len(pending))
+            futures = {
+                executor.submit(_with_retries, lambda scan_id=scan.get('id'): client.contribute_scan_to_telemetry(scan_id)): scan
+                for scan in pending
+            }
+            for future in as_completed(futures):
+                url = futures[future].get('url', 'unknown')
+                try:
+                    future.result()
+                    contributed += 1
+                except ApiError as e:
+                    progress.console.print(f'[yellow]⚠️  Failed to contribute {url}: {str(e)}[/yellow]')
+                    failed += 1
+                progress.advance(task)
         
         if contributed > 0:
             print(f'\n[green]✨ Successfully contributed {contributed} scan(s) to public telemetry![/green]')
             print('[dim]Thank you for helping build the database![/dim]')
-        else:
-            print('\n[dim]All scans have already been contributed to telemetry.[/dim]')
+        if failed > 0:
+            print(f'[yellow]⚠️  Failed to contribute {failed} scan(s). Run this command again to retry them.[/yellow]')
     except ApiError as e:
         print(f'[red]❌ Failed to contribute to telemetry: {str(e)}[/red]')
     except Exception as e:
-        print(f'[red]❌ Unexpected error: {str(e)}[/red]')
\ No newline at end of file
+        print(f'[red]❌ Unexpected error: {str(e)}[/red]')
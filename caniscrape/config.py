@@ -1,7 +1,11 @@
+import copy
 import json
+import threading
 from pathlib import Path
 from typing import Any
 
+from .settings import invalidate, read_settings, resolve_in_parents
+
 class Config:
     CONFIG_DIR = '.caniscrape'
     CONFIG_FILE = 'config'
@@ -12,17 +16,14 @@ class Config:
         self.config_dir = self.base_path / self.CONFIG_DIR
         self.config_file = self.config_dir / self.CONFIG_FILE
         self._data: dict = {}
-
-        if self.config_file.exists():
-            self._load()
+        self._load()
     
     def _load(self) -> None:
         """
-        Load config from disk.
+        Load config from disk (through the settings cache, so unchanged files are not parsed again).
         """
         try:
-            with open(self.config_file, 'r') as f:
-                self._data = json.load(f)
+            self._data = read_settings(self.config_file) or {}
         except (json.JSONDecodeError, IOError) as e:
             print(f"[yellow]Warning: Config file corrupted, resetting: {str(e)}[/yellow]")
             self._data = {}
@@ -39,12 +40,14 @@ class Config:
             if temp_file.exists():
                 temp_file.unlink()
             raise Exception(f'Failed to save config.')
+        finally:
+            invalidate(self.config_file)
     
     def is_linked(self) -> bool:
         """
         Check if this directory is linked to a cloud project.
         """
-        return 'project_id' in self._data and 'api_token' in self._data
+        return _is_linked(self._data)
     
     def get(self, key: str, default: Any | None = None) -> Any:
         """
@@ -71,6 +74,7 @@ class Config:
         self._data = {}
         if self.config_file.exists():
             self.config_file.unlink()
+        invalidate(self.config_file)
     
     def get_project_id(self) -> str | None:
         """
@@ -90,12 +94,28 @@ class Config:
         """
         return self.get('api_endpoint', self.DEFAULT_API_ENDPOINT)
     
+def _is_linked(data: dict) -> bool:
+    return 'project_id' in data and 'api_token' in data
+
+_CONFIG_RELATIVE_PATH = Path(Config.CONFIG_DIR) / Config.CONFIG_FILE
+_linked_configs: dict[Path, Config] = {}
+_linked_configs_lock = threading.Lock()
+
 def find_config_in_parents() -> Config | None:
-    current = Path.cwd()
+    """
+    The config of the nearest directory (the current one or a parent) that is linked to a cloud project.
+    The lookup and the file contents are memoized by the settings layer, so calling this often is cheap.
+    Each call returns its own Config, which the caller may change and save.
+    """
+    config_file = resolve_in_parents(_CONFIG_RELATIVE_PATH, _is_linked)
+    if config_file is None:
+        return None
 
-    for parent in [current] + list(current.parents):
-        config = Config(parent)
-        if config.is_linked():
-            return config
-    
-    return None
\ No newline at end of file
+    with _linked_configs_lock:
+        config = _linked_configs.get(config_file)
+        if config is None:
+            config = _linked_configs[config_file] = Config(config_file.parent.parent)
+
+    config = copy.copy(config)
+    config._load()
+    return config
\ No newline at end of file
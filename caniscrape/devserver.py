@@ -0,0 +1,520 @@
+"""
+Local fixture server that emulates protected sites.
+
+Every scenario reproduces one protection the analyzers look for, so scans can be
+tested and benchmarked offline without hitting live third-party sites.
+TLS fingerprints aren't visible over plain HTTP, so TLS blocking is emulated from
+the request headers that non-browser clients send.
+
+It also stubs the cloud API's scan endpoints under /api/ (single and batch uploads,
+latest scan per URL, /api/stats for request and byte counts), so pointing a project's
+api_endpoint at the dev server lets uploads and pushes run offline.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import re
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from html import escape
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+DEFAULT_RATE_LIMIT_AFTER = 5
+DEFAULT_CAPTCHA_AFTER = 3
+
+Response = tuple[int, list[tuple[str, str]], str]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{head}
+</head>
+<body>
+<h1>{title}</h1>
+{body}
+</body>
+</html>"""
+
+FILLER_PARAGRAPH = (
+    'Our products ship worldwide within two business days. Every order includes free returns, '
+    'a twelve month warranty and access to customer support by phone, chat or email.'
+)
+
+def _html(title: str, body: str, head: str = '', status: int = 200, headers: list[tuple[str, str]] | None = None) -> Response:
+    page = PAGE_TEMPLATE.format(title=escape(title), head=head, body=body)
+    return status, [('Content-Type', 'text/html; charset=utf-8')] + (headers or []), page
+
+def _filler(paragraphs: int) -> str:
+    return '\n'.join(f'<p>{i + 1}. {FILLER_PARAGRAPH}</p>' for i in range(paragraphs))
+
+def _int_param(query: dict[str, list[str]], name: str, default: int) -> int:
+    try:
+        return int(query.get(name, [default])[0])
+    except ValueError:
+        return default
+
+def _looks_like_browser(headers) -> bool:
+    """
+    Stand-in for TLS fingerprinting: impersonating clients and real browsers send
+    browser Accept headers, plain Python clients send */* (and no client hints).
+    """
+    accept = headers.get('Accept', '')
+    user_agent = headers.get('User-Agent', '').lower()
+    if any(tool in user_agent for tool in ('python', 'aiohttp', 'curl/', 'wget', 'go-http-client')):
+        return False
+    return 'text/html' in accept
+
+def _scenario_index(server: DevServer, handler: DevServerRequestHandler, query: dict) -> Response:
+    items = '\n'.join(
+        f'<li><a href="{path}">{escape(path)}</a> - {escape(description)}</li>'
+        for path, (description, _) in SCENARIOS.items() if path != '/'
+    )
+    return _html('caniscrape dev server', f'<ul>\n{items}\n</ul>')
+
+def _scenario_static(server: DevServer, handler: DevServerRequestHandler, query: dict) -> Response:
+    return _html('Static page', _filler(40))
+
+def _scenario_robots(server: DevServer, handler: DevServerRequestHandler, query: dict) -> Response:
+    body = 'User-agent: *\nCrawl-delay: 1\nDisallow: /private\n'
+    return 200, [('Content-Type', 'text/plain')], body
+
+def _scenario_rate_limit(server: DevServer, handler: DevServerRequestHandler, query: dict) -> Response:
+    limit = _int_param(query, 'after', DEFAULT_RATE_LIMIT_AFTER)
+    count = server.hit(f'rate-limit:{handler.client_address[0]}:{limit}')
+
+    if count > limit:
+        return _html('Too Many Requests', '<p>Slow down.</p>', status=429, headers=[('Retry-After', '30')])
+    return _html('Rate limited page', f'<p>Request {count} of {limit} allowed.</p>' + _filler(10))
+
+def _scenario_tls_block(server: DevServer, handler: DevServerRequestHandler, query: dict) -> Response:
+    if not _looks_like_browser(handler.headers):
+        return _html('Access denied', '<p>Your client is not allowed.</p>', status=403)
+    return _html('Browser-only page', _filler(10))
+
+def _scenario_honeypots(server: DevServer, handler: DevServerRequestHandler, query: dict) -> Response:
+    visible = '\n'.join(f'<li><a href="/static?item={i}">Product {i}</a></li>' for i in range(10))
+    hidden = '\n'.join([
+        '<a href="/trap/display-none" style="display:none">trap</a>',
+        '<a href="/trap/visibility" style="visibility:hidden">trap</a>',
+        '<a href="/trap/opacity" style="opacity:0">trap</a>',
+        '<a href="/trap/offscreen" style="position:absolute;left:-9999px;top:-9999px">trap</a>',
+        '<a href="/trap/zero-size" style="display:block;width:0;height:0;overflow:hidden"></a>',
+        '<a href="/trap/hidden-attr" hidden>trap</a>',
+        '<div style="display:none"><a href="/trap/hidden-parent">trap</a></div>',
+        '<a href="/trap/aria" aria-hidden="true" tabindex="-1" style="font-size:0">trap</a>',
+    ])
+    return _html('Honeypot links', f'<ul>\n{visible}\n</ul>\n{hidden}')
+
+CAPTCHA_MARKUP = {
+    'recaptcha': (
+        '<script src="/recaptcha/api.js" async defer></script>',
+        '<div class="g-recaptcha" data-sitekey="6LeIxAcTAAAAAJcZVRqyHh71UMIEGNQ_MXjiZKhI"></div>'
+    ),
+    'hcaptcha': (
+        '<script src="/hcaptcha.com/1/api.js" async defer></script>',
+        '<div class="h-captcha" data-sitekey="10000000-ffff-ffff-ffff-000000000001"></div>'
+    ),
+    'turnstile': (
+        '<script src="/challenges.cloudflare.com/turnstile/v0/api.js" async defer></script>',
+        '<div class="cf-turnstile" data-sitekey="1x00000000000000000000AA"></div>'
+    ),
+}
+
+def _captcha_response(kind: str) -> Response:
+    head, widget = CAPTCHA_MARKUP[kind]
+    return _html(f'{kind} challenge', f'<form>{widget}<button>Continue</button></form>', head=head)
+
+def _scenario_captcha(kind: str):
+    def scenario(server: DevServer, handler: DevServerRequestHandler, query: dict) -> Response:
+        return _captcha_response(kind)
+    return scenario
+
+def _scenario_captcha_after_burst(server: DevServer, handler: DevServerRequestHandler, query: dict) -> Response:
+    limit = _int_param(query, 'after', DEFAULT_CAPTCHA_AFTER)
+    count = server.hit(f'captcha-burst:{handler.client_address[0]}:{limit}')
+
+    if count > limit:
+        return _captcha_response('recaptcha')
+    return _html('Normal page', _filler(10))
+
+def _scenario_captcha_script(server: DevServer, handler: DevServerRequestHandler, query: dict) -> Response:
+    return 200, [('Content-Type', 'application/javascript')], '/* fake CAPTCHA loader */'
+
+def _scenario_fingerprint(server: DevServer, handler: DevServerRequestHandler, query: dict) -> Response:
+    head = """<script src="/akam-bm.net/sensor.js"></script>
+<script>
+const nativeToDataURL = HTMLCanvasElement.prototype.toDataURL;
+HTMLCanvasElement.prototype.toDataURL = function() { return nativeToDataURL.apply(this, arguments); };
+window.bmak = { sensor_data: '' };
+document.addEventListener('mousemove', () => {});
+document.addEventListener('keydown', () => {});
+</script>"""
+    return _html('Fingerprinting page', _filler(10), head=head)
+
+def _scenario_fingerprint_script(server: DevServer, handler: DevServerRequestHandler, query: dict) -> Response:
+    return 200, [('Content-Type', 'application/javascript')], 'window.__sensor_loaded = true;'
+
+def _scenario_spa(server: DevServer, handler: DevServerRequestHandler, query: dict) -> Response:
+    paragraphs = _int_param(query, 'paragraphs', 200)
+    script = f"""<script>
+document.addEventListener('DOMContentLoaded', () => {{
+    const root = document.getElementById('root');
+    const text = {json.dumps(FILLER_PARAGRAPH)};
+    for (let i = 0; i < {paragraphs}; i++) {{
+        const p = document.createElement('p');
+        p.textContent = (i + 1) + '. ' + text;
+        root.appendChild(p);
+    }}
+}});
+</script>"""
+    body = '<noscript>You need to enable JavaScript to run this app.</noscript>\n<div id="root"></div>'
+    return _html('Single page app', body, head=script)
+
+def _scenario_late_content(server: DevServer, handler: DevServerRequestHandler, query: dict) -> Response:
+    delay = _int_param(query, 'delay', 1500)
+    script = f"""<script>
+setTimeout(() => {{
+    document.getElementById('late').innerHTML = {json.dumps(_filler(20))};
+}}, {delay});
+</script>"""
+    return _html('Late content', '<div id="late"></div>', head=script)
+
+WAF_PROFILES = {
+    'cloudflare': [
+        ('Server', 'cloudflare'),
+        ('CF-RAY', '8f1d2c3b4a5e6f70-AMS'),
+        ('CF-Cache-Status', 'DYNAMIC'),
+        ('Set-Cookie', '__cf_bm=devserver; path=/; HttpOnly'),
+    ],
+    'cloudfront': [
+        ('Server', 'CloudFront'),
+        ('Via', '1.1 3f1c0a1b2c3d.cloudfront.net (CloudFront)'),
+        ('X-Amz-Cf-Id', 'Dev0Server0Cf0Id0000000000000000000000000000000000000=='),
+        ('X-Amz-Cf-Pop', 'AMS50-C1'),
+    ],
+    'akamai': [
+        ('Server', 'AkamaiGHost'),
+        ('Set-Cookie', 'ak_bmsc=devserver; path=/'),
+        ('Set-Cookie', '_abck=devserver; path=/'),
+    ],
+    'imperva': [
+        ('X-Iinfo', '12-34567890-0 0NNN RT(1700000000000 0) q(0 -1 -1 0) r(0 -1)'),
+        ('X-CDN', 'Imperva'),
+        ('Set-Cookie', 'visid_incap_123=devserver; path=/'),
+        ('Set-Cookie', 'incap_ses_123_456=devserver; path=/'),
+    ],
+    'datadome': [
+        ('X-DataDome', 'protected'),
+        ('X-DataDome-CID', 'devserver'),
+        ('Set-Cookie', 'datadome=devserver; path=/'),
+    ],
+    'sucuri': [
+        ('Server', 'Sucuri/Cloudproxy'),
+        ('X-Sucuri-ID', '11005'),
+        ('X-Sucuri-Cache', 'MISS'),
+    ],
+}
+
+WAF_BLOCK_PAGES = {
+    'cloudflare': '<p>Attention Required! | Cloudflare</p><p>Sorry, you have been blocked.</p>',
+    'cloudfront': '<p>The request could not be satisfied.</p><p>Generated by cloudfront (CloudFront)</p>',
+    'akamai': '<p>Access Denied</p><p>Reference&#32;&#35;18&#46;2f1d2c3b&#46;1700000000&#46;4a5e6f70</p>',
+    'imperva': '<p>Request unsuccessful. Incapsula incident ID: 123000450012345678-90123456789012345</p>',
+    'datadome': '<p>Please enable JS and disable any ad blocker</p><script src="https://ct.captcha-delivery.com/c.js"></script>',
+    'sucuri': '<p>Access Denied - Sucuri Website Firewall</p>',
+}
+
+def _scenario_waf(vendor: str):
+    def scenario(server: DevServer, handler: DevServerRequestHandler, query: dict) -> Response:
+        headers = WAF_PROFILES[vendor]
+        if query.get('block', ['0'])[0] == '1':
+            return _html('Blocked', WAF_BLOCK_PAGES[vendor], status=403, headers=headers)
+        return _html(f'Behind {vendor}', _filler(10), headers=headers)
+    return scenario
+
+def _scenario_reset(server: DevServer, handler: DevServerRequestHandler, query: dict) -> Response:
+    server.reset()
+    return 200, [('Content-Type', 'text/plain')], 'Counters reset.\n'
+
+SCENARIOS = {
+    '/': ('Index of scenarios', _scenario_index),
+    '/static': ('Plain static page without protections', _scenario_static),
+    '/robots.txt': ('robots.txt with a crawl delay', _scenario_robots),
+    '/rate-limit': ('429 + Retry-After after N requests per client (?after=N)', _scenario_rate_limit),
+    '/tls-block': ('403 for non-browser clients (Python UA or */* Accept)', _scenario_tls_block),
+    '/honeypots': ('Visible links plus honeypot links hidden in different ways', _scenario_honeypots),
+    '/captcha/recaptcha': ('reCAPTCHA markup and script URL', _scenario_captcha('recaptcha')),
+    '/captcha/hcaptcha': ('hCaptcha markup and script URL', _scenario_captcha('hcaptcha')),
+    '/captcha/turnstile': ('Cloudflare Turnstile markup and script URL', _scenario_captcha('turnstile')),
+    '/captcha/after-burst': ('reCAPTCHA only after N page loads per client (?after=N)', _scenario_captcha_after_burst),
+    '/fingerprint': ('Patched toDataURL, bot globals, sensor script and behavioral listeners', _scenario_fingerprint),
+    '/spa': ('Empty shell, content rendered by JavaScript (?paragraphs=N)', _scenario_spa),
+    '/late-content': ('Content inserted by JavaScript after a delay (?delay=ms)', _scenario_late_content),
+    **{
+        f'/waf/{vendor}': (f'{vendor} style headers and cookies (?block=1 for a block page)', _scenario_waf(vendor))
+        for vendor in WAF_PROFILES
+    },
+    '/reset': ('Reset rate-limit and CAPTCHA counters', _scenario_reset),
+}
+
+API_SCANS_PATH = re.compile(r'^/api/projects/(?P<project_id>[^/]+)/scans(?P<action>/batch|/latest)?$')
+API_CONTRIBUTE_PATH = re.compile(r'^/api/telemetry/contribute/(?P<scan_id>[^/]+)$')
+API_MAX_PER_PAGE = 100
+
+def _json(payload: dict | list, status: int = 200) -> Response:
+    return status, [('Content-Type', 'application/json')], json.dumps(payload)
+
+def _read_body(handler: DevServerRequestHandler) -> bytes:
+    """
+    Reads the request body and undoes its Content-Encoding (gzip, or zstd when zstandard is installed).
+    """
+    length = int(handler.headers.get('Content-Length') or 0)
+    body = handler.rfile.read(length)
+    handler.server.record_api_bytes(length)
+
+    encoding = (handler.headers.get('Content-Encoding') or '').lower()
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    if encoding == 'zstd':
+        import zstandard
+        return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    if encoding:
+        raise ValueError(f'Unsupported Content-Encoding: {encoding}')
+    return body
+
+def _validate_scan(scan: dict) -> str | None:
+    if not isinstance(scan, dict) or not scan.get('url'):
+        return 'url is required'
+    if not isinstance(scan.get('scan_data'), dict):
+        return 'scan_data must be an object'
+    return None
+
+def _api_upload(server: DevServer, project_id: str, scan: dict) -> Response:
+    error = _validate_scan(scan)
+    if error:
+        return _json({'detail': error}, 422)
+    return _json(server.store_api_scan(project_id, scan), 201)
+
+def _api_upload_batch(server: DevServer, project_id: str, payload: dict) -> Response:
+    results = []
+    for index, scan in enumerate(payload.get('scans') or []):
+        error = _validate_scan(scan)
+        if error:
+            results.append({'index': index, 'status': 'error', 'detail': error})
+        else:
+            results.append({'index': index, 'status': 'created', 'id': server.store_api_scan(project_id, scan)['id']})
+    return _json({'results': results})
+
+def _api_post(server: DevServer, handler: DevServerRequestHandler, path: str) -> Response:
+    contribute = API_CONTRIBUTE_PATH.match(path)
+    if contribute:
+        _read_body(handler)
+        if not server.contribute_api_scan(contribute['scan_id']):
+            return _json({'detail': 'Scan not found'}, 404)
+        return _json({'scan_id': contribute['scan_id'], 'contributed': True})
+
+    match = API_SCANS_PATH.match(path)
+    if not match or match['action'] == '/latest':
+        return _json({'detail': 'Not found'}, 404)
+
+    try:
+        payload = json.loads(_read_body(handler) or b'{}')
+    except ImportError:
+        return _json({'detail': 'zstd is not supported by this server'}, 415)
+    except ValueError as e:
+        return _json({'detail': f'Invalid body: {str(e)}'}, 400)
+
+    if match['action'] == '/batch':
+        return _api_upload_batch(server, match['project_id'], payload)
+    return _api_upload(server, match['project_id'], payload)
+
+def _api_get(server: DevServer, handler: DevServerRequestHandler, path: str, query: dict) -> Response:
+    if path == '/api/stats':
+        return _json(server.api_stats())
+
+    match = API_SCANS_PATH.match(path)
+    if match and match['action'] == '/latest':
+        url = (query.get('url') or [''])[0]
+        scan = server.latest_api_scan(match['project_id'], url)
+        return _json(scan) if scan else _json({'detail': 'No scan for this URL'}, 404)
+    if match and not match['action']:
+        try:
+            page = max(1, int((query.get('page') or ['1'])[0]))
+            per_page = min(API_MAX_PER_PAGE, max(1, int((query.get('per_page') or ['50'])[0])))
+        except ValueError:
+            return _json({'detail': 'page and per_page must be integers'}, 400)
+        scans = server.list_api_scans(match['project_id'])
+        return _json({
+            'scans': scans[(page - 1) * per_page:page * per_page],
+            'page': page,
+            'per_page': per_page,
+            'total': len(scans)
+        })
+    return _json({'detail': 'Not found'}, 404)
+
+STATIC_SCRIPTS = {
+    '/recaptcha/api.js': _scenario_captcha_script,
+    '/hcaptcha.com/1/api.js': _scenario_captcha_script,
+    '/challenges.cloudflare.com/turnstile/v0/api.js': _scenario_captcha_script,
+    '/akam-bm.net/sensor.js': _scenario_fingerprint_script,
+}
+
+class DevServerRequestHandler(BaseHTTPRequestHandler):
+    server: DevServer
+    server_version = 'caniscrape-devserver'
+
+    def _send(self, response: Response, include_body: bool = True) -> None:
+        status, headers, body = response
+        payload = body.encode('utf-8')
+
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+
+        if include_body:
+            self.wfile.write(payload)
+
+    def _route(self) -> Response:
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+
+        route = SCENARIOS.get(parsed.path)
+        if route:
+            return route[1](self.server, self, query)
+
+        scenario = STATIC_SCRIPTS.get(parsed.path)
+        if scenario:
+            return scenario(self.server, self, query)
+
+        if parsed.path.startswith('/api/'):
+            return _api_get(self.server, self, parsed.path, query)
+
+        return _html('Not Found', '<p>No such scenario.</p>', status=404)
+
+    def do_GET(self) -> None:
+        self._send(self._route())
+
+    def do_POST(self) -> None:
+        """
+        Stub of the cloud API's scan upload and contribution endpoints, so uploads and pushes can be tested offline.
+        """
+        path = urlparse(self.path).path
+        if not path.startswith('/api/'):
+            self._send(_html('Method Not Allowed', '<p>Scenarios only answer GET.</p>', status=405))
+            return
+        self._send(_api_post(self.server, self, path))
+
+    def do_HEAD(self) -> None:
+        self._send(self._route(), include_body=False)
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class DevServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server holding the per-client counters used by the scenarios.
+    """
+    daemon_threads = True
+    # Room for a pooled client opening many connections at once.
+    request_queue_size = 128
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, verbose: bool = False):
+        super().__init__((host, port), DevServerRequestHandler)
+        self.verbose = verbose
+        self._counters: dict[str, int] = {}
+        self._api_scans: dict[str, list[dict]] = {}
+        self._api_requests = 0
+        self._api_bytes = 0
+        self._api_contributions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def hit(self, key: str) -> int:
+        """
+        Increment and return a request counter.
+        """
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._api_scans.clear()
+            self._api_requests = 0
+            self._api_bytes = 0
+            self._api_contributions = 0
+
+    def record_api_bytes(self, count: int) -> None:
+        with self._lock:
+            self._api_requests += 1
+            self._api_bytes += count
+
+    def store_api_scan(self, project_id: str, scan: dict) -> dict:
+        with self._lock:
+            scans = self._api_scans.setdefault(project_id, [])
+            stored = {
+                'id': f'scan-{sum(len(s) for s in self._api_scans.values()) + 1}',
+                'url': scan['url'],
+                'scan_data': scan['scan_data'],
+                'cli_version': scan.get('cli_version'),
+                'created_at': datetime.now(timezone.utc).isoformat()
+            }
+            scans.append(stored)
+            return {key: stored[key] for key in ('id', 'url', 'created_at')}
+
+    def latest_api_scan(self, project_id: str, url: str) -> dict | None:
+        with self._lock:
+            matches = [scan for scan in self._api_scans.get(project_id, []) if scan['url'] == url]
+            return matches[-1] if matches else None
+
+    def list_api_scans(self, project_id: str) -> list[dict]:
+        with self._lock:
+            return [
+                {key: scan.get(key, False) for key in ('id', 'url', 'created_at', 'telemetry_contributed')}
+                for scan in self._api_scans.get(project_id, [])
+            ]
+
+    def contribute_api_scan(self, scan_id: str) -> bool:
+        with self._lock:
+            for scans in self._api_scans.values():
+                for scan in scans:
+                    if scan['id'] == scan_id:
+                        scan['telemetry_contributed'] = True
+                        self._api_contributions += 1
+                        return True
+            return False
+
+    def api_stats(self) -> dict:
+        with self._lock:
+            return {
+                'requests': self._api_requests,
+                'bytes_received': self._api_bytes,
+                'scans': sum(len(scans) for scans in self._api_scans.values()),
+                'contributions': self._api_contributions
+            }
+
+def start_devserver(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, verbose: bool = False) -> DevServer:
+    """
+    Start the dev server on a background thread and return it.
+    Use port 0 to pick a free port (see server.base_url). Call server.shutdown() to stop it.
+    """
+    server = DevServer(host, port, verbose=verbose)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
@@ -1,15 +1,179 @@
+from __future__ import annotations
+
+from typing import Any, Callable, NamedTuple
+
 from rich import print
 from rich.panel import Panel
 
-def compare_scans(current_scan: dict, previous_scan: dict) -> dict:
-    diff ={
-        'score_changed': False,
-        'score_delta': 0,
-        'protections_added': [],
-        'protections_removed': [],
-        'status_changes': {}
-    }
+from .analyzers.rate_limit_profiler import GENTLE_PROBE_COUNT
+from .utils.similarity import compare_signatures
+
+CONTENT_CHANGE_THRESHOLD = 50
+
+class FieldRule(NamedTuple):
+    """
+    How one field of an analyzer result is compared. `path` leads to the value inside the result and
+    `normalize` turns it into something comparable (None means "nothing to report").
+
+    kind 'flag': a protection that is present when the value is truthy; reported as added or removed.
+        `detail` is a path to a value that names it (e.g. the CAPTCHA type).
+    kind 'set': a collection of names; each name is reported as added or removed.
+    kind 'value': a setting of a protection; reported as changed, only when it has a value on both sides
+        (its appearance and disappearance is what the flag rules report).
+    """
+    name: str
+    path: tuple[str, ...]
+    label: str
+    kind: str
+    normalize: Callable[[Any], Any] = lambda value: value
+    detail: tuple[str, ...] | None = None
+
+class Change(NamedTuple):
+    """
+    One difference between two scans. `kind` is 'added', 'removed', 'changed' or 'status' (the analyzer's
+    own status changed, e.g. robots.txt appeared). `before` and `after` are normalized values.
+    """
+    analyzer: str
+    field: str
+    kind: str
+    before: Any
+    after: Any
+
+def _names(values: Any) -> frozenset[str]:
+    """
+    Names from a list of names, of (name, manufacturer) pairs or of {'name': ...} dicts, or the keys of a dict.
+    """
+    names = set()
+    for value in values or ():
+        if isinstance(value, dict):
+            value = value.get('name')
+        elif isinstance(value, (list, tuple)):
+            value = value[0] if value else None
+        if value:
+            names.add(str(value))
+    return frozenset(names)
+
+def _number(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _block_phase(results: Any) -> str | None:
+    if not isinstance(results, dict) or not results.get('blocking_code'):
+        return None
+    sent = results.get('requests_sent') or 0
+    if sent <= 1:
+        return 'first request'
+    if sent <= GENTLE_PROBE_COUNT:
+        return 'gentle probing'
+    return 'request burst'
+
+# What is compared for each analyzer. Fields not listed here (timings, evidence, content percentages,
+# messages) vary between runs of an unchanged site and are ignored. An analyzer whose result has no
+# rule for 'status' also reports status changes, except to or from 'error'.
+DIFF_SCHEMA: dict[str, tuple[FieldRule, ...]] = {
+    'robots': (
+        FieldRule('scraping_disallowed', ('scraping_disallowed',), 'robots.txt disallows scraping', 'flag', bool),
+        FieldRule('has_crawl_delay', ('crawl_delay',), 'Crawl delay (s)', 'flag', lambda delay: delay is not None, detail=('crawl_delay',)),
+        FieldRule('crawl_delay', ('crawl_delay',), 'Crawl delay (s)', 'value', _number),
+    ),
+    'tls': (
+        FieldRule('active', ('status',), 'TLS Fingerprinting', 'flag', lambda status: status == 'active'),
+    ),
+    'fingerprint': (
+        FieldRule('detected_services', ('detected_services',), 'Fingerprinting', 'set', _names),
+        FieldRule('canvas', ('canvas_fingerprinting_signal',), 'Canvas fingerprinting', 'flag', bool),
+        FieldRule('listeners', ('behavioral_listeners_detected',), 'Behavioral listener', 'set', _names),
+    ),
+    'integrity': (
+        FieldRule('modified_functions', ('modified_functions',), 'Modified browser function', 'set', _names),
+    ),
+    'js': (
+        FieldRule('js_required', ('js_required',), 'JavaScript rendering required', 'flag', bool),
+        FieldRule('is_spa', ('is_spa',), 'Single-page app', 'flag', bool),
+    ),
+    'behavioral': (
+        FieldRule('honeypot_detected', ('honeypot_detected',), 'Honeypot Traps', 'flag', bool),
+    ),
+    'captcha': (
+        FieldRule('captcha_detected', ('captcha_detected',), 'CAPTCHA', 'flag', bool, detail=('captcha_type',)),
+        FieldRule('captcha_type', ('captcha_type',), 'CAPTCHA type', 'value'),
+        FieldRule('trigger_condition', ('trigger_condition',), 'CAPTCHA trigger', 'value'),
+    ),
+    'rate_limit': (
+        FieldRule('blocking', ('results', 'blocking_code'), 'Rate limiting', 'flag', bool, detail=('results', 'blocking_code')),
+        FieldRule('blocking_code', ('results', 'blocking_code'), 'Rate limit response code', 'value'),
+        FieldRule('block_phase', ('results',), 'Rate limit blocks at', 'value', _block_phase),
+    ),
+    'waf': (
+        FieldRule('wafs', ('wafs',), 'WAF', 'set', _names),
+    ),
+}
+
+_RULES = {(analyzer, rule.name): rule for analyzer, rules in DIFF_SCHEMA.items() for rule in rules}
+_STATUS_COVERED = frozenset(analyzer for analyzer, rules in DIFF_SCHEMA.items() if any(rule.path == ('status',) for rule in rules))
+
+def _lookup(result: dict[str, Any], path: tuple[str, ...]) -> Any:
+    value = result
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+def _diff_result(analyzer: str, before: dict[str, Any], after: dict[str, Any], changes: list[Change]) -> None:
+    for rule in DIFF_SCHEMA.get(analyzer, ()):
+        old = rule.normalize(_lookup(before, rule.path))
+        new = rule.normalize(_lookup(after, rule.path))
+        if old == new:
+            continue
+
+        if rule.kind == 'set':
+            old, new = old or frozenset(), new or frozenset()
+            changes.extend(Change(analyzer, rule.name, 'added', None, name) for name in sorted(new - old))
+            changes.extend(Change(analyzer, rule.name, 'removed', name, None) for name in sorted(old - new))
+        elif rule.kind == 'flag':
+            if bool(old) == bool(new):
+                continue
+            if rule.detail is not None:
+                old = _lookup(before, rule.detail) if old else None
+                new = _lookup(after, rule.detail) if new else None
+            changes.append(Change(analyzer, rule.name, 'added' if new else 'removed', old or None, new or None))
+        elif old is not None and new is not None:
+            changes.append(Change(analyzer, rule.name, 'changed', old, new))
+
+def diff_protections(previous: dict[str, Any], current: dict[str, Any]) -> list[Change]:
+    """
+    Every difference between two `protections` trees, following DIFF_SCHEMA. Analyzers that are missing
+    or failed on either side are skipped, so an error never reads as a protection being removed.
+    """
+    changes = []
+    for analyzer, after in current.items():
+        before = previous.get(analyzer)
+        if before is after or not isinstance(before, dict) or not isinstance(after, dict):
+            continue
+        old_status, new_status = before.get('status'), after.get('status')
+        if old_status == 'error' or new_status == 'error':
+            continue
+        if old_status != new_status and analyzer not in _STATUS_COVERED:
+            changes.append(Change(analyzer, 'status', 'status', old_status, new_status))
+        _diff_result(analyzer, before, after, changes)
+    return changes
 
+def describe_change(change: Change) -> str:
+    """
+    One-line description of a change, e.g. 'WAF: Cloudflare' or 'Crawl delay (s): 1.0 → 5.0'.
+    """
+    rule = _RULES.get((change.analyzer, change.field))
+    if rule is None:
+        return f'{change.analyzer}: {change.before} → {change.after}'
+    if change.kind in ('added', 'removed'):
+        name = change.after if change.kind == 'added' else change.before
+        return f'{rule.label}: {name}' if name not in (None, True) else rule.label
+    return f'{rule.label}: {change.before} → {change.after}'
+
+def compare_scans(current_scan: dict, previous_scan: dict) -> dict:
     if 'scan_data' in previous_scan:
         prev_data = previous_scan['scan_data']
     else:
@@ -20,83 +184,42 @@ def compare_scans(current_scan: dict, previous_scan: dict) -> dict:
     prev_score = prev_data.get('score_card', {}).get('score', 0)
     curr_score = curr_data.get('score_card', {}).get('score', 0)
 
-    if curr_score != prev_score:
-        diff['score_changed'] = True
-        diff['score_delta'] = curr_score - prev_score
-
     prev_protections = prev_data.get('protections', {})
     curr_protections = curr_data.get('protections', {})
+    changes = diff_protections(prev_protections, curr_protections)
 
-    prev_wafs = set()
-    curr_wafs = set()
-
-    if 'waf' in prev_protections and prev_protections['waf'].get('status') == 'success':
-        for waf in prev_protections['waf'].get('wafs', []):
-            if isinstance(waf, dict):
-                prev_wafs.add(waf.get('name', ''))
-            else:
-                prev_wafs.add(waf[0] if waf else '')
-    
-    if 'waf' in curr_protections and curr_protections['waf'].get('status') == 'success':
-        for waf in curr_protections['waf'].get('wafs', []):
-            if isinstance(waf, dict):
-                curr_wafs.add(waf.get('name', ''))
-            else:
-                curr_wafs.add(waf[0] if waf else '')
-    
-    prev_wafs = {w for w in prev_wafs if w}
-    curr_wafs = {w for w in curr_wafs if w}
-
-    wafs_added = curr_wafs - prev_wafs
-    wafs_removed = prev_wafs - curr_wafs
-
-    for waf in wafs_added:
-        diff['protections_added'].append(f'WAF: {waf}')
-    for waf in wafs_removed:
-        diff['protections_removed'].append(f'WAF: {waf}')
-    
-    prev_captcha = prev_protections.get('captcha', {}).get('captcha_detected', 'Unknown')
-    curr_captcha = curr_protections.get('captcha', {}).get('captcha_detected', 'Unknown')
-
-    if curr_captcha and not prev_captcha:
-        captcha_type = curr_protections['captcha'].get('captcha_type', 'Unknown')
-        diff['protections_added'].append(f'CAPTCHA: {captcha_type}')
-    elif not curr_captcha and prev_captcha:
-        captcha_type = prev_protections['captcha'].get('captcha_type', 'Unknown')
-        diff['protections_removed'].append(f'CAPTCHA: {captcha_type}')
-    
-    prev_tls = prev_protections.get('tls', {}).get('status', 'inactive')
-    curr_tls = curr_protections.get('tls', {}).get('status', 'inactive')
-
-    if curr_tls == 'active' and prev_tls != 'active':
-        diff['protections_added'].append('TLS Fingerprinting')
-    elif curr_tls != 'active' and prev_tls == 'active':
-        diff['protections_removed'].append('TLS Fingerprinting')
-
-    prev_honeypot = prev_protections.get('behavioral', {}).get('honeypot_detected', False)
-    curr_honeypot = prev_protections.get('behavioral', {}).get('honeypot_detected', False)
-
-    if curr_honeypot and not prev_honeypot:
-        diff['protections_added'].append('Honeypot Traps')
-    elif not curr_honeypot and prev_honeypot:
-        diff['protections_removed'].append('Honeypot Traps')
+    diff = {
+        'score_changed': curr_score != prev_score,
+        'score_delta': curr_score - prev_score,
+        'protections_added': [describe_change(change) for change in changes if change.kind == 'added'],
+        'protections_removed': [describe_change(change) for change in changes if change.kind == 'removed'],
+        'status_changes': {
+            _RULES[(change.analyzer, change.field)].label if change.kind == 'changed' else change.analyzer: {'old': change.before, 'new': change.after}
+            for change in changes if change.kind in ('changed', 'status')
+        },
+        'content_similarity_%': None,
+        'changes': changes
+    }
 
-    prev_js = prev_protections.get('js', {}).get('js_required', False)
-    curr_js = curr_protections.get('js', {}).get('js_required', False)
+    prev_signature = prev_protections.get('js', {}).get('signatures', {}).get('js')
+    curr_signature = curr_protections.get('js', {}).get('signatures', {}).get('js')
 
-    if curr_js and not prev_js:
-        diff['protections_added'].append('JavaScript rendering required')
-    elif not curr_js and prev_js:
-        diff['protections_removed'].append('JavaScript rendering required')
+    if prev_signature and curr_signature:
+        similarity = compare_signatures(prev_signature, curr_signature)['jaccard']
+        diff['content_similarity_%'] = round(similarity * 100, 2)
 
     return diff
 
 def display_diff(diff: dict, previous_scan_date: str) -> None:
+    content_similarity = diff.get('content_similarity_%')
+    content_changed = content_similarity is not None and content_similarity < CONTENT_CHANGE_THRESHOLD
+
     has_changes = (
         diff['score_changed'] or
         diff['protections_added'] or
         diff['protections_removed'] or
-        diff['status_changes']
+        diff['status_changes'] or
+        content_changed
     )
 
     if not has_changes:
@@ -125,9 +248,12 @@ def display_diff(diff: dict, previous_scan_date: str) -> None:
     
     if diff['status_changes']:
         lines.append('\n[yellow][bold]Changed:[/bold][/yellow]')
-        for name, change in diff['status_changes']:
+        for name, change in diff['status_changes'].items():
             lines.append(f'  [yellow]~ {name}: {change["old"]} → {change["new"]}[/yellow]')
 
+    if content_changed:
+        lines.append(f'\n[yellow]📝 Page content changed significantly ({content_similarity}% similar to last scan)[/yellow]')
+
     print()
     print(Panel(
         '\n'.join(lines),
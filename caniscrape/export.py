@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+from urllib.parse import urlparse
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_SOURCE = '.caniscrape/history.db'
+EXPORT_FORMATS = ('csv', 'parquet', 'arrow')
+ANALYZERS = ('robots', 'tls', 'fingerprint', 'integrity', 'js', 'behavioral', 'captcha', 'rate_limit', 'waf')
+
+class Column(NamedTuple):
+    name: str
+    type: str
+    extract: Callable[[dict[str, Any]], Any]
+
+def _get(path: str) -> Callable[[dict[str, Any]], Any]:
+    """
+    Extractor for a dotted path into a normalized record, e.g. 'protections.js.js_required'.
+    """
+    keys = path.split('.')
+
+    def extract(record: dict[str, Any]) -> Any:
+        value = record
+        for key in keys:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+    return extract
+
+def _waf_names(record: dict[str, Any]) -> list[str]:
+    wafs = _get('protections.waf.wafs')(record) or []
+    names = []
+    for waf in wafs:
+        if isinstance(waf, dict):
+            name = waf.get('name')
+        elif isinstance(waf, (list, tuple)) and waf:
+            name = waf[0]
+        else:
+            name = waf
+        if name:
+            names.append(str(name))
+    return names
+
+def _host(record: dict[str, Any]) -> str | None:
+    url = record.get('url')
+    return urlparse(url).hostname if url else None
+
+def _joined(values: Any) -> str | None:
+    if not values:
+        return None
+    return '; '.join(str(v) for v in values)
+
+def _count(path: str) -> Callable[[dict[str, Any]], int | None]:
+    extract = _get(path)
+    return lambda record: None if extract(record) is None else len(extract(record))
+
+EXPORT_COLUMNS: list[Column] = [
+    Column('url', 'string', _get('url')),
+    Column('host', 'string', _host),
+    Column('scanned_at', 'timestamp', _get('scanned_at')),
+    Column('cli_version', 'string', _get('cli_version')),
+    Column('status', 'string', _get('status')),
+    Column('error', 'string', _get('error.message')),
+    Column('score', 'int', _get('score_card.score')),
+    Column('label', 'string', _get('score_card.label')),
+
+    *[Column(f'{name}_status', 'string', _get(f'protections.{name}.status')) for name in ANALYZERS],
+
+    Column('robots_crawl_delay', 'float', _get('protections.robots.crawl_delay')),
+    Column('robots_scraping_disallowed', 'bool', _get('protections.robots.scraping_disallowed')),
+    Column('tls_details', 'string', _get('protections.tls.details')),
+    Column('fingerprint_services', 'string', lambda r: _joined(_get('protections.fingerprint.detected_services')(r))),
+    Column('fingerprint_canvas_signal', 'bool', _get('protections.fingerprint.canvas_fingerprinting_signal')),
+    Column('fingerprint_behavioral_listeners', 'string', lambda r: _joined(_get('protections.fingerprint.behavioral_listeners_detected')(r))),
+    Column('integrity_modified_functions', 'int', _count('protections.integrity.modified_functions')),
+    Column('js_required', 'bool', _get('protections.js.js_required')),
+    Column('js_is_spa', 'bool', _get('protections.js.is_spa')),
+    Column('js_content_difference_pct', 'float', _get('protections.js.content_difference_%')),
+    Column('js_content_overlap_pct', 'float', _get('protections.js.content_overlap_%')),
+    Column('js_only_regions', 'int', _count('protections.js.js_only_regions')),
+    Column('behavioral_honeypot_detected', 'bool', _get('protections.behavioral.honeypot_detected')),
+    Column('behavioral_total_links', 'int', _get('protections.behavioral.total_links')),
+    Column('behavioral_invisible_links', 'int', _get('protections.behavioral.invisible_links')),
+    Column('captcha_detected', 'bool', _get('protections.captcha.captcha_detected')),
+    Column('captcha_type', 'string', _get('protections.captcha.captcha_type')),
+    Column('captcha_trigger', 'string', _get('protections.captcha.trigger_condition')),
+    Column('rate_limit_requests_sent', 'int', _get('protections.rate_limit.results.requests_sent')),
+    Column('rate_limit_blocking_code', 'int', _get('protections.rate_limit.results.blocking_code')),
+    Column('waf_names', 'string', lambda r: _joined(_waf_names(r))),
+    Column('waf_count', 'int', lambda r: len(_waf_names(r)) if _get('protections.waf')(r) else None),
+    Column('waf_source', 'string', _get('protections.waf.source')),
+    Column('waf_confidence', 'float', _get('protections.waf.confidence')),
+
+    Column('scan_duration_ms', 'int', _get('timing_ms.total')),
+    *[Column(f'{name}_ms', 'int', _get(f'timing_ms.{name}')) for name in ANALYZERS],
+    Column('fingerprint_readiness_ms', 'int', _get('protections.fingerprint.readiness_wait_ms')),
+    Column('captcha_readiness_ms', 'int', _get('protections.captcha.readiness_wait_ms')),
+]
+
+def _coerce(value: Any, column_type: str) -> Any:
+    """
+    Converts a raw result value to the column's type. Values that don't fit become None (null),
+    so one odd result can't break the schema of a whole chunk.
+    """
+    if value is None or value == '':
+        return None
+    try:
+        if column_type == 'string':
+            return str(value)
+        if column_type == 'int':
+            if isinstance(value, bool):
+                return None
+            return int(value)
+        if column_type == 'float':
+            if isinstance(value, bool):
+                return None
+            return float(value)
+        if column_type == 'bool':
+            return value if isinstance(value, bool) else None
+        if column_type == 'timestamp':
+            if isinstance(value, datetime):
+                return value
+            return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
+    raise ValueError(f'Unknown column type: {column_type}')
+
+def normalize_record(record: dict[str, Any]) -> dict[str, Any]:
+    """
+    Brings the stored shapes of a scan to one layout: cache files wrap the result in
+    'scan_data' with 'cached_at', batch NDJSON lines are the result itself plus 'status' and 'scanned_at'.
+    """
+    if 'scan_data' in record:
+        scan = record.get('scan_data') or {}
+        return {
+            **scan,
+            'url': record.get('url') or scan.get('url'),
+            'status': 'success',
+            'scanned_at': record.get('cached_at'),
+            'cli_version': record.get('cli_version')
+        }
+    return {'status': 'success', **record}
+
+def flatten_scan(record: dict[str, Any]) -> dict[str, Any]:
+    """
+    Flattens one stored scan into a typed row keyed by EXPORT_COLUMNS names.
+    """
+    normalized = normalize_record(record)
+    return {column.name: _coerce(column.extract(normalized), column.type) for column in EXPORT_COLUMNS}
+
+def iter_cache_records(cache_dir: str | Path) -> Iterator[dict[str, Any]]:
+    """
+    Yields cached scans one file at a time, oldest first. Unreadable files are skipped.
+    """
+    for path in sorted(Path(cache_dir).glob('*.json')):
+        try:
+            with open(path, 'r') as f:
+                yield json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+
+def iter_ndjson_records(path: str | Path) -> Iterator[dict[str, Any]]:
+    """
+    Yields records from an NDJSON file (gzip-compressed if it ends in .gz) one line at a time.
+    A truncated last line, as left by an interrupted batch, is skipped.
+    """
+    path = Path(path)
+    opener = gzip.open if path.suffix == '.gz' else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+def iter_source_records(source: str | Path) -> Iterator[dict[str, Any]]:
+    """
+    Yields records from a history database, a legacy cache directory, a directory of NDJSON files
+    (e.g. rotated batch output), or a single NDJSON file.
+    """
+    source = Path(source)
+    if source.suffix == '.db':
+        from .history_store import get_scan_store
+        yield from get_scan_store(source).iter_records()
+    elif source.is_dir():
+        ndjson_files = sorted(list(source.glob('*.ndjson')) + list(source.glob('*.ndjson.gz')))
+        if ndjson_files:
+            for path in ndjson_files:
+                yield from iter_ndjson_records(path)
+        else:
+            yield from iter_cache_records(source)
+    else:
+        yield from iter_ndjson_records(source)
+
+def iter_row_chunks(records: Iterable[dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[list[dict[str, Any]]]:
+    chunk = []
+    for record in records:
+        chunk.append(flatten_scan(record))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class ExportWriter(ABC):
+    """
+    Writes row chunks to one output file. Only the current chunk is held in memory.
+    """
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.rows_written = 0
+
+    def write_chunk(self, rows: list[dict[str, Any]]) -> None:
+        self._write_chunk(rows)
+        self.rows_written += len(rows)
+
+    @abstractmethod
+    def _write_chunk(self, rows: list[dict[str, Any]]) -> None:
+        ...
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> ExportWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+class CsvExportWriter(ExportWriter):
+    def __init__(self, path: str | Path):
+        super().__init__(path)
+        self._file = open(self.path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([column.name for column in EXPORT_COLUMNS])
+
+    def _write_chunk(self, rows: list[dict[str, Any]]) -> None:
+        self._writer.writerows([_csv_value(row[column.name]) for column in EXPORT_COLUMNS] for row in rows)
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        raise ImportError('Parquet and Arrow export require the "pyarrow" package. Please install it using "pip install caniscrape[parquet]"')
+
+def arrow_schema():
+    pa = _import_pyarrow()
+    types = {
+        'string': pa.string(),
+        'int': pa.int64(),
+        'float': pa.float64(),
+        'bool': pa.bool_(),
+        'timestamp': pa.timestamp('us', tz='UTC')
+    }
+    return pa.schema([pa.field(column.name, types[column.type]) for column in EXPORT_COLUMNS])
+
+class ArrowExportWriter(ExportWriter):
+    """
+    Writes Parquet (one row group per chunk) or an Arrow IPC file (one record batch per chunk).
+    """
+    def __init__(self, path: str | Path, file_format: str = 'parquet'):
+        super().__init__(path)
+        self._pa = _import_pyarrow()
+        self._schema = arrow_schema()
+
+        if file_format == 'parquet':
+            self._writer = self._pa.parquet.ParquetWriter(str(self.path), self._schema, compression='zstd')
+        else:
+            self._writer = self._pa.ipc.new_file(str(self.path), self._schema)
+
+    def _write_chunk(self, rows: list[dict[str, Any]]) -> None:
+        self._writer.write_table(self._pa.Table.from_pylist(rows, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+def infer_format(path: str | Path) -> str | None:
+    suffix = Path(path).suffix.lower()
+    return {'.csv': 'csv', '.parquet': 'parquet', '.pq': 'parquet', '.arrow': 'arrow', '.feather': 'arrow'}.get(suffix)
+
+def check_format_dependencies(file_format: str) -> None:
+    """
+    Raises ImportError if writing `file_format` needs a package that is not installed.
+    """
+    if file_format in ('parquet', 'arrow'):
+        _import_pyarrow()
+
+def open_export_writer(path: str | Path, file_format: str) -> ExportWriter:
+    if file_format == 'csv':
+        return CsvExportWriter(path)
+    if file_format in ('parquet', 'arrow'):
+        return ArrowExportWriter(path, file_format)
+    raise ValueError(f'Unknown export format: {file_format}')
+
+def export_records(records: Iterable[dict[str, Any]], path: str | Path, file_format: str, chunk_size: int = DEFAULT_CHUNK_SIZE, on_chunk: Callable[[int], None] | None = None) -> int:
+    """
+    Flattens `records` and writes them to `path` chunk by chunk. Returns the number of rows written.
+    """
+    with open_export_writer(path, file_format) as writer:
+        for rows in iter_row_chunks(records, chunk_size):
+            writer.write_chunk(rows)
+            if on_chunk:
+                on_chunk(writer.rows_written)
+        return writer.rows_written
@@ -0,0 +1,143 @@
+"""
+Trend analysis over the local scan history: the score series of a URL or host, the events that changed
+what a target looks like (score moves, analyzer status changes, shifts in its score level), and a per-host
+summary of which targets are getting harder or easier to scrape.
+
+The work is done in SQLite, with window functions over the indexed scans table (see ScanStore). What is
+left in Python is one pass over each URL's scores, so thousands of scans take milliseconds.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, NamedTuple, Sequence
+
+from .history_store import ScanStore, ScorePoint
+
+# A shift in score level is reported once the scores have moved, in total, more than CUSUM_THRESHOLD points
+# away from the current level, not counting up to CUSUM_DRIFT points of noise per scan.
+CUSUM_DRIFT = 0.5
+CUSUM_THRESHOLD = 3.0
+TREND_PERIOD_DAYS = 30
+
+class HistoryEvent(NamedTuple):
+    scanned_at: str
+    url: str
+    kind: str
+    subject: str
+    before: Any
+    after: Any
+
+class TargetHistory(NamedTuple):
+    target: str
+    series: list[ScorePoint]
+    events: list[HistoryEvent]
+
+class HostTrend(NamedTuple):
+    host: str
+    scans: int
+    urls: int
+    first_at: str
+    last_at: str
+    first_score: int
+    last_score: int
+    changes: int
+    slope: float | None
+
+def detect_change_points(scores: Sequence[float], drift: float = CUSUM_DRIFT, threshold: float = CUSUM_THRESHOLD) -> list[int]:
+    """
+    Indexes where the level of a series shifts, found with a two-sided CUSUM against the mean of the current
+    segment. A change point is placed where the run that crossed the threshold began, and the next segment
+    starts there.
+    """
+    points = []
+    total, count = 0.0, 0
+    high = low = 0.0
+    high_from = low_from = 0
+
+    for i, value in enumerate(scores):
+        if count:
+            mean = total / count
+            high = max(0.0, high + value - mean - drift)
+            low = max(0.0, low + mean - value - drift)
+            if high == 0.0:
+                high_from = i + 1
+            if low == 0.0:
+                low_from = i + 1
+
+            if high > threshold or low > threshold:
+                start = high_from if high > threshold else low_from
+                points.append(start)
+                total, count = float(sum(scores[start:i + 1])), i + 1 - start
+                high = low = 0.0
+                high_from = low_from = i + 1
+                continue
+        else:
+            high_from = low_from = i + 1
+
+        total += value
+        count += 1
+
+    return points
+
+def _segment_means(scores: Sequence[float], points: list[int]) -> list[float]:
+    bounds = [0, *points, len(scores)]
+    return [sum(scores[start:end]) / (end - start) for start, end in zip(bounds, bounds[1:])]
+
+def _shift_events(series: list[ScorePoint]) -> list[HistoryEvent]:
+    events = []
+    start = 0
+    while start < len(series):
+        end = start
+        while end < len(series) and series[end].url == series[start].url:
+            end += 1
+
+        scored = [point for point in series[start:end] if point.score is not None]
+        scores = [point.score for point in scored]
+        points = detect_change_points(scores)
+        means = _segment_means(scores, points)
+        for index, point in enumerate(points):
+            events.append(HistoryEvent(scored[point].scanned_at, scored[point].url, 'shift', 'score level', round(means[index], 1), round(means[index + 1], 1)))
+        start = end
+    return events
+
+def _resolve_target(target: str) -> dict[str, str]:
+    if '://' in target:
+        return {'url': target}
+    return {'host': target.strip().lower()}
+
+def target_history(store: ScanStore, target: str, since: datetime | str | None = None) -> TargetHistory:
+    """
+    Score series and change events of a URL (anything with a scheme) or of every page of a host, oldest first.
+    """
+    filters = _resolve_target(target)
+    series = store.score_series(since=since, **filters)
+
+    transitions = store.status_transitions(since=since, **filters)
+    events = [HistoryEvent(scanned_at, url, 'status', analyzer, previous, status) for url, scanned_at, analyzer, previous, status in transitions]
+    explained = {(event.url, event.scanned_at) for event in events}
+
+    for point in series:
+        if point.delta:
+            events.append(HistoryEvent(point.scanned_at, point.url, 'score', 'score', point.score - point.delta, point.score))
+            explained.add((point.url, point.scanned_at))
+    for point in series:
+        if point.changed and (point.url, point.scanned_at) not in explained:
+            events.append(HistoryEvent(point.scanned_at, point.url, 'protections', 'protections', None, None))
+
+    events.extend(_shift_events(series))
+    events.sort(key=lambda event: event.scanned_at)
+    return TargetHistory(target, series, events)
+
+def host_trends(store: ScanStore, since: datetime | str | None = None) -> list[HostTrend]:
+    """
+    Per-host score summary, sorted by trend: the least-squares slope of score over time, in points per
+    TREND_PERIOD_DAYS (None when a host's scans do not span any time). Hosts getting harder come first.
+    """
+    trends = []
+    for host, scans, urls, first_at, last_at, first_score, last_score, changes, sum_t, sum_tt, sum_y, sum_ty in store.host_score_stats(since):
+        spread = scans * sum_tt - sum_t * sum_t
+        slope = (scans * sum_ty - sum_t * sum_y) / spread * TREND_PERIOD_DAYS if spread > 1e-9 else None
+        trends.append(HostTrend(host, scans, urls, first_at, last_at, first_score, last_score, changes, slope))
+
+    trends.sort(key=lambda trend: (trend.slope is None, -(trend.slope or 0.0), trend.host))
+    return trends
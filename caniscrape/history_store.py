@@ -0,0 +1,548 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple
+from urllib.parse import urlparse
+
+from .utils.serialization import dumps
+
+HISTORY_DB_PATH = Path('.caniscrape/history.db')
+LEGACY_CACHE_DIR = Path('.caniscrape/cache')
+SCHEMA_VERSION = 3
+BUSY_TIMEOUT_MS = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    host TEXT NOT NULL,
+    scanned_at TEXT NOT NULL,
+    cli_version TEXT,
+    score INTEGER,
+    label TEXT,
+    digest TEXT NOT NULL,
+    changed INTEGER NOT NULL,
+    summary BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scans_host_time ON scans (host, scanned_at);
+CREATE INDEX IF NOT EXISTS scans_url_time ON scans (url, scanned_at);
+CREATE INDEX IF NOT EXISTS scans_changed_time ON scans (scanned_at) WHERE changed = 1;
+
+CREATE TABLE IF NOT EXISTS analyzer_results (
+    scan_id INTEGER NOT NULL REFERENCES scans (id) ON DELETE CASCADE,
+    analyzer TEXT NOT NULL,
+    status TEXT,
+    duration_ms INTEGER,
+    observed_at TEXT,
+    options TEXT,
+    result BLOB NOT NULL,
+    PRIMARY KEY (scan_id, analyzer)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS uploads (
+    scan_id INTEGER PRIMARY KEY REFERENCES scans (id) ON DELETE CASCADE,
+    status TEXT NOT NULL,
+    project_id TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS uploads_pending ON uploads (status) WHERE status != 'uploaded';
+
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TEXT NOT NULL,
+    last_error TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (next_attempt_at);
+"""
+
+# Statements that bring a database at version N-1 up to version N.
+MIGRATIONS = {
+    2: [
+        'ALTER TABLE analyzer_results ADD COLUMN observed_at TEXT',
+        'ALTER TABLE analyzer_results ADD COLUMN options TEXT',
+    ],
+    3: [
+        'CREATE TABLE IF NOT EXISTS outbox (id INTEGER PRIMARY KEY, kind TEXT NOT NULL, payload BLOB NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, next_attempt_at TEXT NOT NULL, last_error TEXT, created_at TEXT NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS outbox_due ON outbox (next_attempt_at)',
+    ],
+}
+
+class StoredScan(NamedTuple):
+    id: int
+    url: str
+    host: str
+    scanned_at: str
+    cli_version: str | None
+    score: int | None
+    label: str | None
+    changed: bool
+
+class ScorePoint(NamedTuple):
+    id: int
+    url: str
+    scanned_at: str
+    score: int | None
+    label: str | None
+    changed: bool
+    delta: int | None
+
+class OutboxItem(NamedTuple):
+    id: int
+    kind: str
+    payload: Any
+    attempts: int
+
+def _now(delay: float = 0) -> str:
+    return format_timestamp(datetime.now(timezone.utc) + timedelta(seconds=delay))
+
+def format_timestamp(moment: datetime | str) -> str:
+    """
+    Timestamps are stored as fixed-width UTC ISO strings, so they sort and compare correctly as text.
+    """
+    if isinstance(moment, str):
+        moment = datetime.fromisoformat(moment.replace('Z', '+00:00'))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).isoformat(timespec='microseconds')
+
+def _pack(obj: Any) -> bytes:
+    return zlib.compress(dumps(obj), 6)
+
+def _unpack(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob))
+
+def site_of(url: str) -> str:
+    """
+    The scheme://host:port part of a URL, which host-scoped results are shared across.
+    """
+    parts = urlparse(url)
+    return f'{parts.scheme}://{parts.netloc}'.lower()
+
+def _waf_names(protections: dict[str, Any]) -> list[str]:
+    names = set()
+    for waf in protections.get('waf', {}).get('wafs') or []:
+        name = waf.get('name') if isinstance(waf, dict) else (waf[0] if waf else None)
+        if name:
+            names.add(name)
+    return sorted(names)
+
+def scan_digest(scan_results: dict[str, Any]) -> str:
+    """
+    Fingerprint of what a scan found, ignoring values that vary between runs of an unchanged site
+    (timings, content percentages, evidence). Two scans with the same digest report the same protections.
+    """
+    protections = scan_results.get('protections', {})
+    summary = {
+        'score': scan_results.get('score_card', {}).get('score'),
+        'label': scan_results.get('score_card', {}).get('label'),
+        'statuses': {name: result.get('status') for name, result in sorted(protections.items()) if isinstance(result, dict)},
+        'wafs': _waf_names(protections),
+        'captcha': protections.get('captcha', {}).get('captcha_detected'),
+        'tls': protections.get('tls', {}).get('status'),
+        'honeypot': protections.get('behavioral', {}).get('honeypot_detected'),
+        'js_required': protections.get('js', {}).get('js_required'),
+        'services': sorted(protections.get('fingerprint', {}).get('detected_services') or [])
+    }
+    return hashlib.blake2b(dumps(summary), digest_size=12).hexdigest()
+
+class ScanStore:
+    """
+    Local scan history in SQLite (WAL mode). Each scan is one row in `scans` with its score and a digest
+    of what it found; every analyzer's result is a compressed row in `analyzer_results`; `uploads`
+    tracks which scans still need to be pushed to the cloud; `outbox` holds network deliveries that
+    the background worker (outbox.py) has not completed yet.
+
+    Safe to share between threads (one connection per thread) and between processes: WAL lets readers
+    run alongside a writer, and writers wait up to BUSY_TIMEOUT_MS for each other.
+    """
+    def __init__(self, path: str | Path = HISTORY_DB_PATH):
+        self.path = Path(path)
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        # executescript() would commit on its own, so statements run one by one inside the transaction.
+        with self._transaction() as conn:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version == 0:
+                for statement in SCHEMA.split(';'):
+                    if statement.strip():
+                        conn.execute(statement)
+            else:
+                for target in range(version + 1, SCHEMA_VERSION + 1):
+                    for statement in MIGRATIONS.get(target, []):
+                        conn.execute(statement)
+            conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        BEGIN IMMEDIATE takes the write lock up front, so concurrent writers queue on the busy
+        timeout instead of failing when a read transaction tries to upgrade.
+        """
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def add_scan(self, url: str, scan_results: dict[str, Any], cli_version: str | None = None, scanned_at: datetime | str | None = None, upload_status: str | None = 'pending', project_id: str | None = None) -> int:
+        """
+        Store a complete scan result. Returns the new scan id.
+        upload_status 'pending' queues the scan for `caniscrape push`, 'uploaded' records that it was already
+        uploaded, and None keeps it out of the upload queue (batch results that only live locally).
+        """
+        scanned_at = format_timestamp(scanned_at) if scanned_at else _now()
+        digest = scan_digest(scan_results)
+        score_card = scan_results.get('score_card', {})
+        protections = scan_results.get('protections', {})
+        timing = scan_results.get('timing_ms', {})
+        provenance = scan_results.get('provenance', {})
+        summary = {key: value for key, value in scan_results.items() if key != 'protections'}
+
+        with self._transaction() as conn:
+            previous = conn.execute(
+                'SELECT digest FROM scans WHERE url = ? AND scanned_at <= ? ORDER BY scanned_at DESC LIMIT 1',
+                (url, scanned_at)
+            ).fetchone()
+            changed = previous is not None and previous[0] != digest
+
+            cursor = conn.execute(
+                'INSERT INTO scans (url, host, scanned_at, cli_version, score, label, digest, changed, summary) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, urlparse(url).hostname or url, scanned_at, cli_version, score_card.get('score'), score_card.get('label'), digest, int(changed), _pack(summary))
+            )
+            scan_id = cursor.lastrowid
+
+            conn.executemany(
+                'INSERT INTO analyzer_results (scan_id, analyzer, status, duration_ms, observed_at, options, result) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (
+                        scan_id, name, result.get('status') if isinstance(result, dict) else None, timing.get(name),
+                        format_timestamp(provenance[name]['observed_at']) if name in provenance else scanned_at,
+                        provenance.get(name, {}).get('options'), _pack(result)
+                    )
+                    for name, result in protections.items()
+                ]
+            )
+            if upload_status is not None:
+                conn.execute(
+                    'INSERT INTO uploads (scan_id, status, project_id, updated_at) VALUES (?, ?, ?, ?)',
+                    (scan_id, upload_status, project_id, _now())
+                )
+        return scan_id
+
+    def get_scan(self, scan_id: int) -> dict[str, Any] | None:
+        """
+        Rebuild a stored scan as a record: the complete scan result plus 'scanned_at' and 'cli_version'.
+        """
+        conn = self._connection()
+        row = conn.execute('SELECT url, scanned_at, cli_version, summary FROM scans WHERE id = ?', (scan_id,)).fetchone()
+        if row is None:
+            return None
+        return self._build_record(scan_id, *row)
+
+    def _build_record(self, scan_id: int, url: str, scanned_at: str, cli_version: str | None, summary: bytes) -> dict[str, Any]:
+        conn = self._connection()
+        protections = {
+            name: _unpack(result)
+            for name, result in conn.execute('SELECT analyzer, result FROM analyzer_results WHERE scan_id = ?', (scan_id,))
+        }
+        return {**_unpack(summary), 'url': url, 'protections': protections, 'scanned_at': scanned_at, 'cli_version': cli_version}
+
+    def latest_scan(self, url: str | None = None, host: str | None = None) -> dict[str, Any] | None:
+        """
+        Most recent scan of a URL or of any page on a host.
+        """
+        if url is not None:
+            column, value = 'url', url
+        elif host is not None:
+            column, value = 'host', host
+        else:
+            raise ValueError('latest_scan needs a url or a host.')
+
+        row = self._connection().execute(
+            f'SELECT id, url, scanned_at, cli_version, summary FROM scans WHERE {column} = ? ORDER BY scanned_at DESC LIMIT 1',
+            (value,)
+        ).fetchone()
+        return self._build_record(*row) if row else None
+
+    @staticmethod
+    def _filters(url: str | None = None, host: str | None = None, since: datetime | str | None = None, changed_only: bool = False) -> tuple[str, list[Any]]:
+        """
+        WHERE clause (empty when there are no filters) and parameters for the common scan filters.
+        """
+        clauses, params = [], []
+        if url is not None:
+            clauses.append('url = ?')
+            params.append(url)
+        if host is not None:
+            clauses.append('host = ?')
+            params.append(host)
+        if since is not None:
+            clauses.append('scanned_at >= ?')
+            params.append(format_timestamp(since))
+        if changed_only:
+            clauses.append('changed = 1')
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def list_scans(self, url: str | None = None, host: str | None = None, since: datetime | str | None = None, changed_only: bool = False, limit: int | None = None) -> list[StoredScan]:
+        """
+        Scan summaries (no analyzer results), newest first. Each filter uses an index.
+        """
+        where, params = self._filters(url, host, since, changed_only)
+        query = f'SELECT id, url, host, scanned_at, cli_version, score, label, changed FROM scans{where} ORDER BY scanned_at DESC'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+
+        return [StoredScan(*row[:-1], bool(row[-1])) for row in self._connection().execute(query, params)]
+
+    def score_series(self, url: str | None = None, host: str | None = None, since: datetime | str | None = None) -> list[ScorePoint]:
+        """
+        Score of every matching scan, grouped by URL and oldest first, with the change from the previous
+        matching scan of the same URL (None for the first one).
+        """
+        where, params = self._filters(url, host, since)
+        query = (
+            'SELECT id, url, scanned_at, score, label, changed, score - LAG(score) OVER (PARTITION BY url ORDER BY scanned_at) '
+            f'FROM scans{where} ORDER BY url, scanned_at'
+        )
+        return [ScorePoint(row[0], row[1], row[2], row[3], row[4], bool(row[5]), row[6]) for row in self._connection().execute(query, params)]
+
+    def status_transitions(self, url: str | None = None, host: str | None = None, since: datetime | str | None = None) -> list[tuple[str, str, str, str, str]]:
+        """
+        (url, scanned_at, analyzer, previous status, status) for every scan where an analyzer's status differs
+        from its previous result on the same URL, oldest first. Errors are skipped, so a failed run in
+        between does not count as two changes.
+        """
+        where, params = self._filters(url, host, since)
+        where += (' AND ' if where else ' WHERE ') + "a.status IS NOT NULL AND a.status != 'error'"
+        query = (
+            'SELECT url, scanned_at, analyzer, previous, status FROM ('
+            ' SELECT url, scanned_at, analyzer, status, LAG(status) OVER (PARTITION BY url, analyzer ORDER BY scanned_at) AS previous'
+            f' FROM scans JOIN analyzer_results AS a ON a.scan_id = scans.id{where}'
+            ') WHERE previous != status ORDER BY scanned_at'
+        )
+        return self._connection().execute(query, params).fetchall()
+
+    def host_score_stats(self, since: datetime | str | None = None) -> list[tuple]:
+        """
+        One row of aggregates per host, over the scans that have a score: (host, scans, urls, first scanned_at,
+        last scanned_at, first score, latest score, changed scans, sum of t, sum of t², sum of scores,
+        sum of t × score), where t is days since the host's first scan. The sums are what a least-squares
+        fit of score over time needs.
+        """
+        where, params = self._filters(since=since)
+        where += (' AND ' if where else ' WHERE ') + 'score IS NOT NULL'
+        query = (
+            'WITH points AS ('
+            ' SELECT host, url, scanned_at, score, changed,'
+            '  julianday(scanned_at) - julianday(FIRST_VALUE(scanned_at) OVER host_window) AS t,'
+            '  FIRST_VALUE(score) OVER host_window AS first_score, LAST_VALUE(score) OVER host_window AS last_score'
+            f' FROM scans{where}'
+            ' WINDOW host_window AS (PARTITION BY host ORDER BY scanned_at ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)'
+            ') SELECT host, COUNT(*), COUNT(DISTINCT url), MIN(scanned_at), MAX(scanned_at), MAX(first_score), MAX(last_score),'
+            ' SUM(changed), SUM(t), SUM(t * t), SUM(score), SUM(t * score) FROM points GROUP BY host'
+        )
+        return self._connection().execute(query, params).fetchall()
+
+    def iter_records(self) -> Iterator[dict[str, Any]]:
+        """
+        Yields every stored scan as a record, oldest first, reading one scan at a time.
+        """
+        cursor = self._connection().execute('SELECT id, url, scanned_at, cli_version, summary FROM scans ORDER BY scanned_at')
+        while True:
+            rows = cursor.fetchmany(500)
+            if not rows:
+                break
+            for row in rows:
+                yield self._build_record(*row)
+
+    def fresh_results(self, url: str, max_ages: dict[str, int], options: dict[str, str], host_scoped: frozenset[str] | set[str] = frozenset()) -> dict[str, tuple[dict[str, Any], str, str]]:
+        """
+        Latest stored result of each analyzer that was observed within that analyzer's max age (seconds)
+        with the same options key, skipping errors. Analyzers in `host_scoped` accept a result from any
+        page of the same site (scheme, host and port); the rest need one from this exact URL.
+        Returns {analyzer: (result, observed_at, source_url)} for the analyzers that have one.
+        """
+        if not max_ages:
+            return {}
+        now = datetime.now(timezone.utc)
+        cutoffs = {name: format_timestamp(now - timedelta(seconds=age)) for name, age in max_ages.items()}
+        page_names = [name for name in cutoffs if name not in host_scoped]
+        host_names = [name for name in cutoffs if name in host_scoped]
+        site = site_of(url)
+
+        conn = self._connection()
+        query = """
+            SELECT a.analyzer, COALESCE(a.observed_at, s.scanned_at) AS observed, COALESCE(a.options, '{{}}'), s.url, a.scan_id
+            FROM scans s JOIN analyzer_results a ON a.scan_id = s.id
+            WHERE s.{column} = ? AND s.scanned_at >= ? AND a.analyzer IN ({names})
+              AND (a.status IS NULL OR a.status != 'error')
+            ORDER BY observed DESC
+        """
+        searches = [('url', url, page_names), ('host', urlparse(url).hostname or url, host_names)]
+
+        found = {}
+        for column, value, names in searches:
+            if not names:
+                continue
+            rows = conn.execute(
+                query.format(column=column, names=', '.join('?' * len(names))),
+                (value, min(cutoffs[name] for name in names), *names)
+            )
+            for name, observed_at, options_key, source_url, scan_id in rows:
+                if name in found or observed_at < cutoffs[name] or options_key != options.get(name, '{}'):
+                    continue
+                if column == 'host' and site_of(source_url) != site:
+                    continue
+                found[name] = (scan_id, observed_at, source_url)
+                if all(n in found for n in names):
+                    break
+
+        fresh = {}
+        for name, (scan_id, observed_at, source_url) in found.items():
+            blob = conn.execute('SELECT result FROM analyzer_results WHERE scan_id = ? AND analyzer = ?', (scan_id, name)).fetchone()[0]
+            fresh[name] = (_unpack(blob), observed_at, source_url)
+        return fresh
+
+    def pending_uploads(self) -> list[int]:
+        return [row[0] for row in self._connection().execute("SELECT scan_id FROM uploads WHERE status != 'uploaded' ORDER BY scan_id")]
+
+    def mark_uploaded(self, scan_id: int, project_id: str | None = None) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE uploads SET status = 'uploaded', project_id = ?, attempts = attempts + 1, last_error = NULL, updated_at = ? WHERE scan_id = ?",
+                (project_id, _now(), scan_id)
+            )
+
+    def mark_upload_failed(self, scan_id: int, error: str) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE uploads SET status = 'failed', attempts = attempts + 1, last_error = ?, updated_at = ? WHERE scan_id = ?",
+                (error[:500], _now(), scan_id)
+            )
+
+    def upload_status(self, scan_id: int) -> str | None:
+        row = self._connection().execute('SELECT status FROM uploads WHERE scan_id = ?', (scan_id,)).fetchone()
+        return row[0] if row else None
+
+    def count(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM scans').fetchone()[0]
+
+    def enqueue(self, kind: str, payload: Any) -> int:
+        """
+        Add a delivery (upload, public contribution, usage event) to the outbox. Returns its id.
+        """
+        now = _now()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                'INSERT INTO outbox (kind, payload, next_attempt_at, created_at) VALUES (?, ?, ?, ?)',
+                (kind, _pack(payload), now, now)
+            )
+        return cursor.lastrowid
+
+    def claim_outbox(self, limit: int, lease_seconds: float) -> list[OutboxItem]:
+        """
+        Take up to `limit` due deliveries. Claimed items are pushed `lease_seconds` into the future, so another
+        worker or process does not send them too; a worker that dies mid-delivery leaves them to be retried
+        once the lease runs out. Each claim counts as an attempt.
+        """
+        with self._transaction() as conn:
+            rows = conn.execute(
+                'SELECT id, kind, payload, attempts FROM outbox WHERE next_attempt_at <= ? ORDER BY next_attempt_at, id LIMIT ?',
+                (_now(), limit)
+            ).fetchall()
+            conn.executemany(
+                'UPDATE outbox SET attempts = attempts + 1, next_attempt_at = ? WHERE id = ?',
+                [(_now(lease_seconds), row[0]) for row in rows]
+            )
+        return [OutboxItem(item_id, kind, _unpack(payload), attempts + 1) for item_id, kind, payload, attempts in rows]
+
+    def complete_outbox(self, item_id: int) -> None:
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM outbox WHERE id = ?', (item_id,))
+
+    def retry_outbox(self, item_id: int, delay: float, error: str) -> None:
+        with self._transaction() as conn:
+            conn.execute('UPDATE outbox SET next_attempt_at = ?, last_error = ? WHERE id = ?', (_now(delay), error[:500], item_id))
+
+    def outbox_count(self, due_only: bool = False) -> int:
+        if due_only:
+            return self._connection().execute('SELECT COUNT(*) FROM outbox WHERE next_attempt_at <= ?', (_now(),)).fetchone()[0]
+        return self._connection().execute('SELECT COUNT(*) FROM outbox').fetchone()[0]
+
+    def import_legacy_cache(self, cache_dir: str | Path = LEGACY_CACHE_DIR) -> int:
+        """
+        Move scans from the old one-JSON-file-per-scan cache into the store, as pending uploads
+        (the old cache only held scans that had not been pushed). Each file is deleted once its scan
+        is committed; unreadable files are left in place. Returns the number of scans imported.
+        """
+        cache_dir = Path(cache_dir)
+        if not cache_dir.is_dir():
+            return 0
+
+        imported = 0
+        for path in sorted(cache_dir.glob('*.json')):
+            try:
+                with open(path, 'r') as f:
+                    cached = json.load(f)
+                self.add_scan(cached['url'], cached['scan_data'], cli_version=cached.get('cli_version'), scanned_at=cached.get('cached_at'))
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            path.unlink()
+            imported += 1
+
+        try:
+            cache_dir.rmdir()
+        except OSError:
+            pass
+        return imported
+
+_stores: dict[Path, ScanStore] = {}
+_stores_lock = threading.Lock()
+
+def get_scan_store(path: str | Path = HISTORY_DB_PATH) -> ScanStore:
+    """
+    Shared store for a database path. Scans left in the legacy JSON cache next to it are imported on first use.
+    """
+    key = Path(path).resolve()
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = ScanStore(path)
+            store.import_legacy_cache(Path(path).parent / LEGACY_CACHE_DIR.name)
+            _stores[key] = store
+        return store
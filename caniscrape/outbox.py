@@ -0,0 +1,189 @@
+"""
+Background delivery of what a scan sends over the network once it is done: the cloud upload and the
+public scan contribution. (Usage telemetry events have their own spool, see TelemetryManager.)
+
+Deliveries are written to the `outbox` table of the history store first, so printing the results never
+waits on the network. A worker thread sends them while the command finishes; whatever is still queued
+when the process exits (or failed and is waiting to be retried) is sent by the next caniscrape run.
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, NamedTuple
+
+from .api_client import ApiError
+from .async_api_client import get_api_client
+from .config import find_config_in_parents
+from .history_store import HISTORY_DB_PATH, OutboxItem, ScanStore, get_scan_store
+from .telemetry import get_telemetry_manager
+from .utils.retry import backoff_delay
+
+MAX_ATTEMPTS = 8
+CLAIM_SIZE = 16
+CLAIM_LEASE_SECONDS = 120
+RETRY_BASE_DELAY = 5.0
+RETRY_MAX_DELAY = 3600.0
+DELIVERY_THREADS = 4
+EXIT_GRACE_SECONDS = 3.0
+
+class OutboxKind(NamedTuple):
+    """
+    How to deliver one kind of outbox item. `deliver` raises on failure (an ApiError that is not
+    retryable drops the item at once); `give_up` runs when an item is dropped.
+    """
+    name: str
+    deliver: Callable[[ScanStore, dict[str, Any]], None]
+    give_up: Callable[[ScanStore, dict[str, Any], str], None] | None = None
+
+def _deliver_upload(store: ScanStore, payload: dict[str, Any]) -> None:
+    scan_id = payload['scan_id']
+    if store.upload_status(scan_id) == 'uploaded':
+        return
+
+    config = find_config_in_parents()
+    if not config or not config.is_linked():
+        raise ApiError('Not linked to a cloud project.', 401)
+
+    scan_data = store.get_scan(scan_id)
+    if scan_data is None:
+        return
+    cli_version = scan_data.pop('cli_version', None) or '1.0.0'
+    scan_data.pop('scanned_at', None)
+
+    project_id = config.get_project_id()
+    client = get_api_client(config.get_api_endpoint(), config.get_api_token())
+    client.upload_scan(project_id=project_id, url=scan_data['url'], scan_data=scan_data, cli_version=cli_version)
+    store.mark_uploaded(scan_id, project_id)
+
+def _give_up_upload(store: ScanStore, payload: dict[str, Any], error: str) -> None:
+    """
+    The scan stays in the upload queue as failed, so `caniscrape push` retries it.
+    """
+    store.mark_upload_failed(payload['scan_id'], error)
+
+def _deliver_contribution(store: ScanStore, payload: dict[str, Any]) -> None:
+    scan_data = store.get_scan(payload['scan_id'])
+    if scan_data is None:
+        return
+    cli_version = scan_data.pop('cli_version', None) or '1.0.0'
+    scan_data.pop('scanned_at', None)
+
+    telemetry = get_telemetry_manager()
+    telemetry.send_scan_contribution(telemetry.build_scan_contribution(scan_data['url'], scan_data, cli_version))
+
+def _deliver_usage_event(store: ScanStore, payload: dict[str, Any]) -> None:
+    """
+    Usage events are spooled by TelemetryManager now; this drains ones queued here by earlier versions
+    (and drops them if usage telemetry has been turned off since).
+    """
+    telemetry = get_telemetry_manager()
+    if telemetry.is_usage_telemetry_enabled():
+        telemetry.send_usage_event(payload)
+
+OUTBOX_KINDS: dict[str, OutboxKind] = {
+    kind.name: kind for kind in (
+        OutboxKind('upload', _deliver_upload, _give_up_upload),
+        OutboxKind('contribute', _deliver_contribution),
+        OutboxKind('usage_event', _deliver_usage_event),
+    )
+}
+
+class OutboxWorker:
+    """
+    Daemon thread that sends due outbox items, a few at a time in parallel, and stops once nothing is due.
+    Failed items are rescheduled with exponential backoff and dropped after MAX_ATTEMPTS.
+    """
+    def __init__(self, store: ScanStore):
+        self.store = store
+        self.delivered = 0
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='caniscrape-outbox', daemon=True)
+                self._thread.start()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Wait for the worker to run out of due items. Returns False if it was still busy after `timeout` seconds.
+        """
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    def _run(self) -> None:
+        with ThreadPoolExecutor(max_workers=DELIVERY_THREADS) as executor:
+            while True:
+                items = self.store.claim_outbox(CLAIM_SIZE, CLAIM_LEASE_SECONDS)
+                if not items:
+                    return
+                list(executor.map(self._deliver, items))
+
+    def _deliver(self, item: OutboxItem) -> None:
+        kind = OUTBOX_KINDS.get(item.kind)
+        if kind is None:
+            self.store.complete_outbox(item.id)
+            return
+
+        try:
+            kind.deliver(self.store, item.payload)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            if getattr(e, 'retryable', True) and item.attempts < MAX_ATTEMPTS:
+                delay = getattr(e, 'retry_after', None)
+                if delay is None:
+                    delay = backoff_delay(item.attempts, RETRY_BASE_DELAY, RETRY_MAX_DELAY)
+                self.store.retry_outbox(item.id, delay, error)
+                return
+            if kind.give_up is not None:
+                kind.give_up(self.store, item.payload, error)
+
+        self.store.complete_outbox(item.id)
+        self.delivered += 1
+
+_worker: OutboxWorker | None = None
+_worker_lock = threading.Lock()
+
+def get_outbox_worker() -> OutboxWorker:
+    """
+    Get or create the worker for the history store in the current directory.
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = OutboxWorker(get_scan_store())
+        return _worker
+
+def queue_scan_deliveries(scan_id: int, upload: bool, contribute: bool) -> None:
+    """
+    Queue the cloud upload and/or public contribution of a stored scan, and start sending.
+    """
+    store = get_scan_store()
+    if upload:
+        store.enqueue('upload', {'scan_id': scan_id})
+    if contribute:
+        store.enqueue('contribute', {'scan_id': scan_id})
+    if upload or contribute:
+        get_outbox_worker().start()
+
+def resume_outbox() -> None:
+    """
+    Start sending deliveries left over from earlier runs. Does nothing outside a directory with scan history.
+    """
+    if HISTORY_DB_PATH.exists() and get_scan_store().outbox_count(due_only=True):
+        get_outbox_worker().start()
+
+def finish_outbox(timeout: float = EXIT_GRACE_SECONDS) -> int:
+    """
+    Give the worker up to `timeout` seconds to finish before the process exits.
+    Returns the number of items left in the outbox for the next run.
+    """
+    if _worker is None:
+        return 0
+    _worker.wait(timeout)
+    return _worker.store.outbox_count()
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import gzip
+import sys
+import time
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from .utils.serialization import dumps_line
+
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+class ResultSink(ABC):
+    """
+    Destination for scan results that are written one at a time as they finish.
+    Records are serialized immediately and never buffered beyond the current file
+    buffer, so memory use does not grow with the number of results.
+
+    Data is flushed every `flush_every` records and at least every `flush_interval`
+    seconds (checked on each write), so readers can tail the output while a batch runs.
+    """
+    def __init__(self, flush_interval: float | None = DEFAULT_FLUSH_INTERVAL, flush_every: int | None = None):
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+        self.records_written = 0
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, record: dict[str, Any]) -> None:
+        self._write_line(dumps_line(record))
+        self.records_written += 1
+        self._unflushed += 1
+
+        if self.flush_every and self._unflushed >= self.flush_every:
+            self.flush()
+        elif self.flush_interval is not None and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._flush()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
+
+    def describe(self) -> str:
+        return self.__class__.__name__
+
+    @abstractmethod
+    def _write_line(self, line: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def _flush(self) -> None:
+        ...
+
+    def __enter__(self) -> ResultSink:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+def _open_binary(path: Path, compress: bool) -> BinaryIO:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if compress:
+        return gzip.open(path, 'ab')
+    return open(path, 'ab')
+
+def _flush_stream(stream: BinaryIO) -> None:
+    if isinstance(stream, gzip.GzipFile):
+        # A sync flush ends the current deflate block, so `zcat` can read everything written so far.
+        stream.flush(zlib.Z_SYNC_FLUSH)
+    else:
+        stream.flush()
+
+class NdjsonSink(ResultSink):
+    """
+    Writes one JSON object per line to a file (appending), or to stdout when path is '-'.
+    Files ending in .gz, or any file with compress=True, are gzip-compressed.
+    """
+    def __init__(self, path: str | Path = '-', compress: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.path = str(path)
+
+        if self.path == '-':
+            self._stream = sys.stdout.buffer
+            self._owns_stream = False
+        else:
+            compress = compress or self.path.endswith('.gz')
+            self._stream = _open_binary(Path(self.path), compress)
+            self._owns_stream = True
+
+    def _write_line(self, line: bytes) -> None:
+        self._stream.write(line)
+
+    def _flush(self) -> None:
+        _flush_stream(self._stream)
+
+    def close(self) -> None:
+        super().close()
+        if self._owns_stream:
+            self._stream.close()
+
+    def describe(self) -> str:
+        return 'stdout' if self.path == '-' else self.path
+
+class RotatingNdjsonSink(ResultSink):
+    """
+    Writes NDJSON into numbered files in a directory (results-00001.ndjson, results-00002.ndjson, ...),
+    starting a new file once the current one reaches `max_bytes` (uncompressed) or `max_records`.
+    """
+    def __init__(self, directory: str | Path, prefix: str = 'results', max_bytes: int | None = None, max_records: int | None = None, compress: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        if not max_bytes and not max_records:
+            raise ValueError('RotatingNdjsonSink needs max_bytes or max_records.')
+
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.max_records = max_records
+        self.compress = compress
+        self.files: list[Path] = []
+
+        self._stream: BinaryIO | None = None
+        self._file_bytes = 0
+        self._file_records = 0
+        self._index = self._next_index()
+
+    def _next_index(self) -> int:
+        """
+        Continue numbering after files left by earlier runs instead of appending to them.
+        """
+        existing = [p.name[len(self.prefix) + 1:].split('.')[0] for p in self.directory.glob(f'{self.prefix}-*.ndjson*')]
+        numbers = [int(n) for n in existing if n.isdigit()]
+        return max(numbers, default=0) + 1
+
+    def _current_path(self) -> Path:
+        suffix = '.ndjson.gz' if self.compress else '.ndjson'
+        return self.directory / f'{self.prefix}-{self._index:05d}{suffix}'
+
+    def _rotate(self) -> None:
+        if self._stream is not None:
+            _flush_stream(self._stream)
+            self._stream.close()
+            self._index += 1
+
+        path = self._current_path()
+        self._stream = _open_binary(path, self.compress)
+        self.files.append(path)
+        self._file_bytes = 0
+        self._file_records = 0
+
+    def _write_line(self, line: bytes) -> None:
+        full = (
+            (self.max_bytes and self._file_bytes and self._file_bytes + len(line) > self.max_bytes) or
+            (self.max_records and self._file_records >= self.max_records)
+        )
+        if self._stream is None or full:
+            self._rotate()
+
+        self._stream.write(line)
+        self._file_bytes += len(line)
+        self._file_records += 1
+
+    def _flush(self) -> None:
+        if self._stream is not None:
+            _flush_stream(self._stream)
+
+    def close(self) -> None:
+        super().close()
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def describe(self) -> str:
+        return f'{self.directory}/{self.prefix}-*.ndjson' + ('.gz' if self.compress else '')
+
+def open_result_sink(
+    output: str = '-',
+    compress: bool = False,
+    rotate_bytes: int | None = None,
+    rotate_records: int | None = None,
+    flush_interval: float | None = DEFAULT_FLUSH_INTERVAL,
+    flush_every: int | None = None
+) -> ResultSink:
+    """
+    Creates the sink for an output target: '-' for stdout, a file path, or (with a rotation limit) a directory.
+    """
+    if rotate_bytes or rotate_records:
+        if output == '-':
+            raise ValueError('Rotating output needs a directory, not stdout.')
+        return RotatingNdjsonSink(output, max_bytes=rotate_bytes, max_records=rotate_records, compress=compress, flush_interval=flush_interval, flush_every=flush_every)
+
+    if output == '-' and compress:
+        raise ValueError('Compressed output needs a file path, not stdout.')
+    return NdjsonSink(output, compress=compress, flush_interval=flush_interval, flush_every=flush_every)
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime, timezone
+from typing import Callable, NamedTuple
+from rich import print
+
+from .analyzers.waf_detector import detect_waf
+from .analyzers.robots_checker import check_robots_txt
+from .analyzers.rate_limit_profiler import profile_rate_limits
+from .analyzers.tls_analyzer import analyze_tls_fingerprint
+from .analyzers.js_detector import analyze_js_rendering
+from .analyzers.behavioral_detector import detect_honeypots
+from .analyzers.captcha_detector import detect_captcha
+from .analyzers.fingerprint_analyzer import analyze_fingerprinting
+from .analyzers.integrity_analyzer import analyze_function_integrity
+from .scoring.scoring_engine import calculate_difficulty_score
+from .recommendations.recommender import generate_recommendations
+from .utils.response_log import get_response_log
+from .history_store import get_scan_store, site_of
+
+HOUR = 3600
+
+class Analyzer(NamedTuple):
+    """
+    One step of a scan. `run` receives the scan context (url, scan options and the results so far).
+    A stored result can stand in for a fresh run for up to `ttl` seconds, but only if it was produced
+    with the same values of the scan options listed in `options`.
+
+    `scope` is 'page' when the result depends on the URL, or 'host' when it is a property of the site
+    (same scheme, host and port), in which case a result from any page of the site can be reused.
+    """
+    name: str
+    describe: Callable[[dict[str, any]], str]
+    run: Callable[[dict[str, any]], dict[str, any]]
+    ttl: int
+    options: tuple[str, ...] = ()
+    scope: str = 'page'
+
+def _describe_behavioral(ctx: dict[str, any]) -> str:
+    depth = ctx['scan_depth'] or 'default'
+    return f'Analyzing for behavioral traps ({depth} scan)...'
+
+def _describe_rate_limit(ctx: dict[str, any]) -> str:
+    client = 'browser-like' if ctx['impersonate'] else 'Python'
+    return f'Profiling rate limits with {client} client...'
+
+# Every analyzer touches the network, so its result depends on the egress (proxies); the Playwright ones
+# also depend on which browser ran them.
+BROWSER_OPTIONS = ('proxies', 'browser_endpoint')
+
+ANALYZERS: list[Analyzer] = [
+    Analyzer(
+        'robots', lambda ctx: 'Checking robots.txt...',
+        lambda ctx: check_robots_txt(ctx['url'], proxies=ctx['proxies']),
+        ttl=24 * HOUR, options=('proxies',), scope='host'
+    ),
+    Analyzer(
+        'tls', lambda ctx: 'Analyzing TLS fingerprint...',
+        lambda ctx: asyncio.run(analyze_tls_fingerprint(ctx['url'], proxies=ctx['proxies'])),
+        ttl=24 * HOUR, options=('proxies',), scope='host'
+    ),
+    Analyzer(
+        'fingerprint', lambda ctx: 'Analyzing for advanced fingerprinting...',
+        lambda ctx: analyze_fingerprinting(ctx['url'], proxies=ctx['proxies'], browser_endpoint=ctx['browser_endpoint']),
+        ttl=12 * HOUR, options=BROWSER_OPTIONS
+    ),
+    Analyzer(
+        'integrity', lambda ctx: 'Performing function integrity analysis...',
+        lambda ctx: analyze_function_integrity(ctx['url'], proxies=ctx['proxies'], browser_endpoint=ctx['browser_endpoint']),
+        ttl=12 * HOUR, options=BROWSER_OPTIONS
+    ),
+    Analyzer(
+        'js', lambda ctx: 'Analyzing JavaScript rendering...',
+        lambda ctx: analyze_js_rendering(ctx['url'], proxies=ctx['proxies'], browser_endpoint=ctx['browser_endpoint']),
+        ttl=12 * HOUR, options=BROWSER_OPTIONS
+    ),
+    Analyzer(
+        'behavioral', _describe_behavioral,
+        lambda ctx: detect_honeypots(ctx['url'], scan_depth=ctx['scan_depth'], proxies=ctx['proxies'], browser_endpoint=ctx['browser_endpoint']),
+        ttl=12 * HOUR, options=('scan_depth', *BROWSER_OPTIONS)
+    ),
+    Analyzer(
+        'captcha', lambda ctx: 'Detecting CAPTCHA...',
+        lambda ctx: detect_captcha(ctx['url'], service_name=ctx['captcha_service'], api_key=ctx['captcha_api_key'], proxies=ctx['proxies'], browser_endpoint=ctx['browser_endpoint']),
+        ttl=12 * HOUR, options=('captcha_service', *BROWSER_OPTIONS)
+    ),
+    Analyzer(
+        'rate_limit', _describe_rate_limit,
+        lambda ctx: asyncio.run(profile_rate_limits(ctx['url'], ctx['results']['robots'].get('crawl_delay'), ctx['impersonate'], proxies=ctx['proxies'])),
+        ttl=6 * HOUR, options=('impersonate', 'proxies'), scope='host'
+    ),
+    Analyzer(
+        'waf', lambda ctx: 'Running WAF detection...',
+        lambda ctx: detect_waf(ctx['url'], ctx['find_all'], proxies=ctx['proxies'], engine=ctx['waf_engine']),
+        ttl=24 * HOUR, options=('find_all', 'waf_engine', 'proxies'), scope='host'
+    ),
+]
+
+ANALYZER_NAMES = tuple(analyzer.name for analyzer in ANALYZERS)
+
+SECRET_OPTIONS = frozenset(('proxies', 'browser_endpoint'))
+
+def _fingerprint(value: str | tuple[str, ...] | None) -> str | None:
+    if not value:
+        return None
+    text = value if isinstance(value, str) else '\n'.join(sorted(value))
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+def analyzer_options_key(analyzer: Analyzer, scan_options: dict[str, any]) -> str:
+    """
+    Canonical text of the scan options that affect an analyzer's result, stored next to the result.
+    Proxies and the browser endpoint are reduced to a fingerprint, so their credentials are never stored.
+    """
+    values = {key: scan_options.get(key) for key in analyzer.options}
+    for key in SECRET_OPTIONS.intersection(values):
+        values[key] = _fingerprint(values[key])
+    return json.dumps(values, sort_keys=True)
+
+HOST_SCOPED = frozenset(analyzer.name for analyzer in ANALYZERS if analyzer.scope == 'host')
+
+class HostResultCache:
+    """
+    In-memory results of host-scoped analyzers, shared by the scans of one process (e.g. a batch),
+    so pages of the same site run robots, TLS, rate-limit and WAF checks once.
+    Entries expire after the analyzer's TTL.
+    """
+    def __init__(self, ttls: dict[str, int] | None = None):
+        self.ttls = ttls or {}
+        self.hits = 0
+        self._entries: dict[tuple[str, str, str], tuple[dict[str, any], str, str, float]] = {}
+
+    def get(self, url: str, analyzer: Analyzer, options_key: str) -> tuple[dict[str, any], str, str] | None:
+        entry = self._entries.get((site_of(url), analyzer.name, options_key))
+        if entry is None:
+            return None
+        result, observed_at, source_url, stored = entry
+        if time.monotonic() - stored > self.ttls.get(analyzer.name, analyzer.ttl):
+            return None
+        self.hits += 1
+        return result, observed_at, source_url
+
+    def put(self, url: str, analyzer: Analyzer, options_key: str, result: dict[str, any], observed_at: str) -> None:
+        if analyzer.scope != 'host' or result.get('status') == 'error':
+            return
+        self._entries[(site_of(url), analyzer.name, options_key)] = (result, observed_at, url, time.monotonic())
+
+def _load_fresh_results(url: str, max_age: int, ttls: dict[str, int], scan_options: dict[str, any]) -> dict[str, tuple[dict, str, str]]:
+    max_ages = {analyzer.name: min(max_age, ttls.get(analyzer.name, analyzer.ttl)) for analyzer in ANALYZERS}
+    options = {analyzer.name: analyzer_options_key(analyzer, scan_options) for analyzer in ANALYZERS}
+    return get_scan_store().fresh_results(url, max_ages, options, host_scoped=HOST_SCOPED)
+
+def run_scan(
+    url: str,
+    find_all: bool = False,
+    impersonate: bool = False,
+    scan_depth: str | None = None,
+    proxies: tuple[str, ...] = (),
+    captcha_service: str | None = None,
+    captcha_api_key: str | None = None,
+    browser_endpoint: str | None = None,
+    waf_engine: str = 'auto',
+    max_age: int | None = None,
+    ttls: dict[str, int] | None = None,
+    host_cache: HostResultCache | None = None,
+    progress: Callable[[str], None] | None = print
+) -> dict[str, any]:
+    """
+    Runs every analyzer against a URL and scores the results.
+    Returns the complete scan result: url, score_card, protections (per-analyzer results), recommendations,
+    timing_ms (wall time per analyzer, plus the total) and provenance (when and with which options each
+    analyzer's result was observed, and whether it was reused).
+
+    With `max_age` (seconds), stored results that are younger than both max_age and the analyzer's TTL
+    (`ttls` overrides the defaults) are reused, and only the stale analyzers run. Page-scoped results
+    must come from this URL, host-scoped ones from any page of the same site. `host_cache` additionally
+    shares host-scoped results between the scans of this process.
+    Progress messages go to `progress` (rich print by default, None for silence).
+    """
+    report = progress or (lambda message: None)
+    get_response_log().clear()
+    scan_options = {
+        'find_all': find_all, 'impersonate': impersonate, 'scan_depth': scan_depth, 'proxies': proxies,
+        'captcha_service': captcha_service, 'captcha_api_key': captcha_api_key,
+        'browser_endpoint': browser_endpoint, 'waf_engine': waf_engine
+    }
+    ctx = {'url': url, **scan_options, 'results': {}}
+    timing = {}
+    provenance = {}
+    scan_started = time.perf_counter()
+
+    fresh = _load_fresh_results(url, max_age, ttls or {}, scan_options) if max_age is not None else {}
+
+    for analyzer in ANALYZERS:
+        options_key = analyzer_options_key(analyzer, scan_options)
+
+        reusable = fresh.get(analyzer.name)
+        if reusable is None and host_cache is not None and analyzer.scope == 'host':
+            reusable = host_cache.get(url, analyzer, options_key)
+
+        if reusable is not None:
+            result, observed_at, source_url = reusable
+            origin = '' if source_url == url else f' of {source_url}'
+            report(f'[dim]Reusing {analyzer.name} result{origin} from {observed_at}[/dim]')
+            ctx['results'][analyzer.name] = result
+            provenance[analyzer.name] = {'observed_at': observed_at, 'options': options_key, 'reused': True, 'source_url': source_url}
+            continue
+
+        report(analyzer.describe(ctx))
+        observed_at = datetime.now(timezone.utc).isoformat()
+        started = time.perf_counter()
+        try:
+            ctx['results'][analyzer.name] = analyzer.run(ctx)
+        finally:
+            timing[analyzer.name] = round((time.perf_counter() - started) * 1000)
+        provenance[analyzer.name] = {'observed_at': observed_at, 'options': options_key, 'reused': False}
+
+        if host_cache is not None:
+            host_cache.put(url, analyzer, options_key, ctx['results'][analyzer.name], observed_at)
+
+    all_results = ctx['results']
+    score_card = calculate_difficulty_score(all_results)
+    recommendations = generate_recommendations(all_results)
+    timing['total'] = round((time.perf_counter() - scan_started) * 1000)
+
+    return {
+        'url': url,
+        'score_card': score_card,
+        'protections': all_results,
+        'recommendations': recommendations,
+        'timing_ms': timing,
+        'provenance': provenance
+    }
+
+def is_fully_reused(scan_result: dict[str, any]) -> bool:
+    """
+    True when every analyzer result came from storage, i.e. the scan touched nothing on the network.
+    """
+    provenance = scan_result.get('provenance') or {}
+    return bool(provenance) and all(entry.get('reused') for entry in provenance.values())
@@ -0,0 +1,90 @@
+"""
+Memoized access to the JSON settings files: the project config (.caniscrape/config, looked up through the
+parent directories) and the user's telemetry settings (~/.caniscrape/telemetry.json).
+
+A file is parsed once and re-read only when its mtime or size changes, so hot paths (batch scans, the
+background workers) cost a stat instead of an open and a JSON parse. Results of the parent-directory walk
+are kept for RESOLVE_TTL seconds. Writers call `invalidate` after saving. Safe to use from any thread.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+RESOLVE_TTL = 2.0
+
+_files: dict[Path, tuple[tuple[int, int] | None, Any]] = {}
+_resolved: dict[tuple[str, str, Callable], tuple[Path | None, float]] = {}
+_lock = threading.Lock()
+
+def _stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def read_settings(path: str | Path) -> dict[str, Any] | None:
+    """
+    Parsed contents of a JSON settings file, or None if it does not exist. Returns a copy the caller may
+    modify. Raises OSError or ValueError if the file cannot be read or parsed (failures are not cached).
+    """
+    path = Path(path)
+    stamp = _stamp(path)
+    with _lock:
+        cached = _files.get(path)
+
+    if cached is not None and cached[0] == stamp:
+        data = cached[1]
+    else:
+        data = None
+        if stamp is not None:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        with _lock:
+            _files[path] = (stamp, data)
+
+    return dict(data) if isinstance(data, dict) else data
+
+def resolve_in_parents(relative: str | Path, accept: Callable[[dict[str, Any]], bool]) -> Path | None:
+    """
+    The first `relative` settings file, searching the current directory and then its parents, whose
+    contents pass `accept`. Unreadable files are skipped.
+    """
+    key = (os.getcwd(), str(relative), accept)
+    now = time.monotonic()
+    with _lock:
+        hit = _resolved.get(key)
+    if hit is not None and now - hit[1] < RESOLVE_TTL:
+        return hit[0]
+
+    start = Path(key[0])
+    found = None
+    for parent in [start] + list(start.parents):
+        candidate = parent / relative
+        try:
+            data = read_settings(candidate)
+        except (OSError, ValueError):
+            continue
+        if isinstance(data, dict) and accept(data):
+            found = candidate
+            break
+
+    with _lock:
+        _resolved[key] = (found, now)
+    return found
+
+def invalidate(path: str | Path | None = None) -> None:
+    """
+    Forget the cached contents of `path` (or of every file), and every parent-directory lookup.
+    """
+    with _lock:
+        if path is None:
+            _files.clear()
+        else:
+            _files.pop(Path(path), None)
+        _resolved.clear()
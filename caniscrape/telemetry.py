@@ -10,6 +10,8 @@ import os
 import json
 import platform
 import sys
+import threading
+import time
 import uuid
 from pathlib import Path
 from datetime import datetime, timezone
@@ -18,6 +20,19 @@ import requests
 from rich import print
 from rich.prompt import Confirm
 
+from .api_client import ApiError, BATCH_UNSUPPORTED_STATUS
+from .settings import invalidate, read_settings
+from .utils.retry import parse_retry_after
+from .utils.serialization import dumps_line
+
+# Usage events are spooled to disk and sent in batches once enough have piled up or the oldest is old enough.
+SPOOL_FLUSH_EVENTS = 50
+SPOOL_FLUSH_AGE = 15 * 60
+SPOOL_MAX_EVENTS = 5000
+SPOOL_BATCH_SIZE = 500
+# A spool being sent by a process that died is picked up again after this long.
+STALE_SENDING_AGE = 10 * 60
+
 class TelemetryManager:
     """
     Manages both usage telemetry and public scan contributions.
@@ -25,18 +40,20 @@ class TelemetryManager:
     def __init__(self):
         self.config_dir = Path.home() / '.caniscrape'
         self.config_file = self.config_dir / 'telemetry.json'
+        self.spool_file = self.config_dir / 'telemetry-spool.ndjson'
         self.api_base = 'https://caniscrape-web-production.up.railway.app'
+        self._session: requests.Session | None = None
+        self._batch_supported = True
+        self._spool_lock = threading.Lock()
+        self._flush_thread: threading.Thread | None = None
+        self._flush_failed = False
 
     def _load_config(self) -> dict[str, Any]:
         """
-        Load telemetry configuration.
+        Load telemetry configuration (through the settings cache, so the file is parsed again only after it changes).
         """
-        if not self.config_file.exists():
-            return {}
-        
         try:
-            with open(self.config_file, 'r') as f:
-                return json.load(f)
+            return read_settings(self.config_file) or {}
         except:
             return {}
     
@@ -48,6 +65,7 @@ class TelemetryManager:
 
         with open(self.config_file, 'w') as f:
             json.dump(config, f, indent=2)
+        invalidate(self.config_file)
     
     def is_usage_telemetry_enabled(self) -> bool:
         """
@@ -166,37 +184,217 @@ class TelemetryManager:
             'architecture': platform.machine()
         }
     
-    def track_usage_event(self, event_type: str, cli_version: str, metadata: dict[str, Any] | None = None, silent: bool = False) -> None:
+    def build_usage_event(self, event_type: str, cli_version: str, metadata: dict[str, Any] | None = None) -> dict[str, Any]:
+        """
+        Build the payload of a usage telemetry event.
+        """
+        return {
+            'device_id': self.get_or_create_device_id(),
+            'event_type': event_type,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'system_info': self.get_system_info(cli_version),
+            'metadata': metadata or {}
+        }
+
+    def send_usage_event(self, payload: dict[str, Any]) -> None:
+        """
+        Send a usage telemetry event. Raises ApiError if it was not accepted.
+        """
+        self._post('/telemetry/receive', payload, expected_status=200, timeout=2)
+
+    def track_usage_event(self, event_type: str, cli_version: str, metadata: dict[str, Any] | None = None, silent: bool = False, flush: bool = True) -> None:
         """
         Track a usage telemetry event (if user opted in).
+        The event is appended to the spool file and sent later in a batch (see flush_usage_spool).
+        With flush=False the spool is never sent from this call, so it makes no network requests.
         """
         if not self.is_usage_telemetry_enabled():
             return
         
         try:
-            device_id = self.get_or_create_device_id()
-            system_info = self.get_system_info(cli_version)
-
-            payload = {
-                'device_id': device_id,
-                'event_type': event_type,
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-                'system_info': system_info,
-                'metadata': metadata or {}
-            }
-
-            response = requests.post(
-                f'{self.api_base}/telemetry/receive',
-                json=payload,
-                timeout=2
-            )
+            line = dumps_line(self.build_usage_event(event_type, cli_version, metadata))
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+            with self._spool_lock, open(self.spool_file, 'ab') as f:
+                f.write(line)
+        except Exception:
+            return
+
+        if flush:
+            self.flush_usage_spool_if_due()
+
+    def usage_spool_due(self) -> bool:
+        """
+        True when the spool holds SPOOL_FLUSH_EVENTS events, or its oldest event is SPOOL_FLUSH_AGE seconds old.
+        """
+        try:
+            with open(self.spool_file, 'rb') as f:
+                first = f.readline()
+                count = 1 + sum(1 for _ in f) if first else 0
+        except OSError:
+            return False
+        if count >= SPOOL_FLUSH_EVENTS:
+            return True
+        try:
+            oldest = datetime.fromisoformat(json.loads(first)['timestamp'])
+        except (ValueError, KeyError, TypeError):
+            return True
+        return (datetime.now(timezone.utc) - oldest).total_seconds() >= SPOOL_FLUSH_AGE
+
+    def flush_usage_spool_if_due(self) -> None:
+        """
+        Start sending the spool on a background thread when it is due, unless a flush is already running
+        or one failed earlier in this process (the next run tries again).
+        """
+        if self._flush_failed or (self._flush_thread is not None and self._flush_thread.is_alive()):
+            return
+        if not self.is_usage_telemetry_enabled():
+            self.discard_usage_spool()
+            return
+        if not self.usage_spool_due():
+            return
+        self._flush_thread = threading.Thread(target=self.flush_usage_spool, name='caniscrape-telemetry', daemon=True)
+        self._flush_thread.start()
+
+    def wait_for_usage_flush(self, timeout: float | None = None) -> None:
+        if self._flush_thread is not None:
+            self._flush_thread.join(timeout)
+
+    def flush_usage_spool(self) -> int:
+        """
+        Send every spooled usage event, SPOOL_BATCH_SIZE per request. The spool is renamed before sending,
+        so events tracked meanwhile (or by other processes) start a new spool and nothing is sent twice.
+        Events that could not be sent go back into the spool. Returns the number of events sent.
+        If usage telemetry has been turned off since the events were tracked, they are deleted instead.
+        """
+        if not self.is_usage_telemetry_enabled():
+            self.discard_usage_spool()
+            return 0
+
+        claimed = []
+        sending = self.spool_file.with_name(f'{self.spool_file.name}.{os.getpid()}-{uuid.uuid4().hex[:8]}.sending')
+        try:
+            os.replace(self.spool_file, sending)
+            claimed.append(sending)
+        except OSError:
+            pass
+
+        for stale in self.config_dir.glob(f'{self.spool_file.name}.*.sending'):
+            if stale in claimed:
+                continue
+            try:
+                if time.time() - stale.stat().st_mtime < STALE_SENDING_AGE:
+                    continue
+                taken = stale.with_name(f'{self.spool_file.name}.{os.getpid()}-{uuid.uuid4().hex[:8]}.sending')
+                os.replace(stale, taken)
+                claimed.append(taken)
+            except OSError:
+                continue
+
+        events = []
+        for path in claimed:
+            with open(path, 'rb') as f:
+                for line in f:
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        continue
+
+        sent = 0
+        try:
+            while sent < len(events):
+                chunk = events[sent:sent + SPOOL_BATCH_SIZE]
+                sent += self._send_usage_batch(chunk)
+        except Exception:
+            self._flush_failed = True
+            self._respool(events[sent:])
+        finally:
+            for path in claimed:
+                path.unlink(missing_ok=True)
+        return sent
+
+    def _send_usage_batch(self, events: list[dict[str, Any]]) -> int:
+        """
+        Send events in one request, or one by one if the server has no batch endpoint. Returns how many
+        were sent; raises if not even the first one could be.
+        """
+        if self._batch_supported:
+            try:
+                self._post('/telemetry/receive/batch', {'events': events}, expected_status=200, timeout=10)
+                return len(events)
+            except ApiError as e:
+                if e.status_code not in BATCH_UNSUPPORTED_STATUS:
+                    raise
+                self._batch_supported = False
+
+        for index, event in enumerate(events):
+            try:
+                self.send_usage_event(event)
+            except ApiError:
+                if index:
+                    return index
+                raise
+        return len(events)
 
-            if not silent and response.status_code != 200:
+    def _respool(self, events: list[dict[str, Any]]) -> None:
+        """
+        Append unsent events to the spool again, keeping at most SPOOL_MAX_EVENTS (the newest).
+        Each event carries its own timestamp, so their order in the spool does not matter.
+        """
+        if not events or not self.is_usage_telemetry_enabled():
+            return
+        with self._spool_lock:
+            try:
+                with open(self.spool_file, 'ab') as f:
+                    f.write(b''.join(dumps_line(event) for event in events[-SPOOL_MAX_EVENTS:]))
+            except OSError:
                 pass
+
+    def discard_usage_spool(self) -> None:
+        """
+        Delete every spooled usage event, including spools claimed by a flush that never finished.
+        """
+        with self._spool_lock:
+            for path in [self.spool_file, *self.config_dir.glob(f'{self.spool_file.name}.*.sending')]:
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError:
+                    continue
+
+    def build_scan_contribution(self, url: str, scan_data: dict, cli_version: str) -> dict[str, Any]:
+        """
+        Build the payload that contributes a scan to the public database.
+        """
+        score_card = scan_data.get('score_card', {})
+        protections = scan_data.get('protections', {})
         
-        except Exception:
-            pass
-    
+        protection_summary = {
+            'robots': protections.get('robots', {}),
+            'tls': protections.get('tls', {}),
+            'js': protections.get('js', {}),
+            'behavioral': protections.get('behavioral', {}),
+            'captcha': protections.get('captcha', {}),
+            'rate_limit': protections.get('rate_limit', {}),
+            'waf': protections.get('waf', {}),
+            'fingerprint': protections.get('fingerprint', {}),
+            'integrity': protections.get('integrity', {})
+        }
+        
+        return {
+            'url': url,
+            'difficulty_score': score_card.get('score', 0),
+            'difficulty_label': score_card.get('label', 'Unknown'),
+            'scan_data': scan_data,
+            'protection_summary': protection_summary,
+            'cli_version': cli_version,
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        }
+
+    def send_scan_contribution(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """
+        Send a scan contribution. Returns the server's response; raises ApiError if it was not accepted.
+        """
+        return self._post('/telemetry/contribute-scan', payload, expected_status=201, timeout=5)
+
     def contribute_scan(self, url: str, scan_data: dict, cli_version: str, silent: bool = False) -> bool:
         """
         Contribute a scan to the public database (if user opted in).
@@ -205,50 +403,31 @@ class TelemetryManager:
             return False
         
         try:
-            score_card = scan_data.get('score_card', {})
-            protections = scan_data.get('protections', {})
-            
-            protection_summary = {
-                'robots': protections.get('robots', {}),
-                'tls': protections.get('tls', {}),
-                'js': protections.get('js', {}),
-                'behavioral': protections.get('behavioral', {}),
-                'captcha': protections.get('captcha', {}),
-                'rate_limit': protections.get('rate_limit', {}),
-                'waf': protections.get('waf', {}),
-                'fingerprint': protections.get('fingerprint', {}),
-                'integrity': protections.get('integrity', {})
-            }
-            
-            payload = {
-                'url': url,
-                'difficulty_score': score_card.get('score', 0),
-                'difficulty_label': score_card.get('label', 'Unknown'),
-                'scan_data': scan_data,
-                'protection_summary': protection_summary,
-                'cli_version': cli_version,
-                'timestamp': datetime.now(timezone.utc).isoformat()
-            }
-
-            response = requests.post(
-                f'{self.api_base}/telemetry/contribute-scan',
-                json=payload,
-                timeout=5
-            )
-
-            if response.status_code == 201:
-                if not silent:
-                    data = response.json()
-                    if data.get('is_new'):
-                        print('[dim]🌍 Scan contributed to public database (new entry)[/dim]')
-                    else:
-                        print('[dim]🌍 Scan contributed to public database (updated)[/dim]')
-                return True
-            else:
-                return False
-        
+            data = self.send_scan_contribution(self.build_scan_contribution(url, scan_data, cli_version))
         except Exception:
             return False
+
+        if not silent:
+            if data.get('is_new'):
+                print('[dim]🌍 Scan contributed to public database (new entry)[/dim]')
+            else:
+                print('[dim]🌍 Scan contributed to public database (updated)[/dim]')
+        return True
+
+    def _post(self, endpoint: str, payload: dict[str, Any], expected_status: int, timeout: float) -> dict[str, Any]:
+        if self._session is None:
+            self._session = requests.Session()
+        try:
+            response = self._session.post(f'{self.api_base}{endpoint}', json=payload, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            raise ApiError(f'Network error: {str(e)}')
+
+        if response.status_code != expected_status:
+            raise ApiError(f'Telemetry endpoint returned HTTP {response.status_code}', response.status_code, parse_retry_after(response.headers.get('Retry-After')))
+        try:
+            return response.json()
+        except ValueError:
+            return {}
     
     def enable_usage_telemetry(self):
         """
@@ -268,6 +447,7 @@ class TelemetryManager:
         config['usage_telemetry_enabled'] = False
         config['usage_telemetry_decided_at'] = datetime.now(timezone.utc).isoformat()
         self._save_config(config)
+        self.discard_usage_spool()
         print("[blue]Usage telemetry disabled.[/blue]")
     
     def enable_scan_telemetry(self):
@@ -323,6 +503,8 @@ class TelemetryManager:
 
             if response.status_code == 200:
                 self.config_file.unlink()
+                invalidate(self.config_file)
+                self.discard_usage_spool()
                 print("\n[green]✅ All usage telemetry data deleted.[/green]")
                 return True
             else:
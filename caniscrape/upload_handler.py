@@ -1,96 +1,55 @@
-from rich import print
-from pathlib import Path
-import json
-import hashlib
-from datetime import datetime, timezone
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 
-from .config import Config, find_config_in_parents
-from .api_client import ApiClient, ApiError
+from .config import find_config_in_parents
+from .async_api_client import get_api_client, run_async
+from .history_store import get_scan_store
 
-def save_to_cache(url: str, scan_results: dict, cli_version: str) -> None:
+DIFF_BASELINE_WAIT = 5
+
+def save_to_cache(url: str, scan_results: dict, cli_version: str, uploaded: bool = False) -> int:
     """
-    Save scan results to local cache for later push.
+    Save scan results to the local history store (.caniscrape/history.db).
+    Scans that were not uploaded stay pending for `caniscrape push`. Returns the scan id.
     """
-    cache_dir = Path('.caniscrape/cache')
-    cache_dir.mkdir(parents=True, exist_ok=True)
-
-    url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
-    timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
-    filename = f'{timestamp}_{url_hash}.json'
-
-    cache_file = cache_dir / filename
-
-    cache_data = {
-        'url': url,
-        'scan_data': scan_results,
-        'cli_version': cli_version,
-        'cached_at': datetime.now(timezone.utc).isoformat()
-    }
-
-    with open(cache_file, 'w') as f:
-        json.dump(cache_data, f, indent=2)
+    return get_scan_store().add_scan(url, scan_results, cli_version=cli_version, upload_status='uploaded' if uploaded else 'pending')
 
-def try_upload_scan(url: str, scan_results: dict, cli_version: str = '1.0.0') -> bool:
+def prefetch_diff_baseline(url: str) -> Future:
     """
-    Try to upload scan to cloud project.
-    Returns True if successful, False otherwise.
+    Start looking up the scan to diff against while the analyzers run. The latest scan of the URL in the
+    local history store is used when there is one (so call this before the new scan is saved); otherwise
+    the project's latest scan is fetched from the cloud in the background. Join with `wait_for_diff_baseline`.
     """
-    config = find_config_in_parents()
+    try:
+        local_scan = get_scan_store().latest_scan(url=url)
+    except Exception:
+        local_scan = None
 
-    if not config or not config.is_linked():
-        return False
-    
-    project_id = config.get_project_id()
-    api_token = config.get_api_token()
-    api_endpoint = config.get_api_endpoint()
-    project_name = config.get('project_name', 'your project')
+    if local_scan is not None:
+        baseline = Future()
+        baseline.set_result(local_scan)
+        return baseline
 
-    try:
-        client = ApiClient(api_endpoint=api_endpoint, api_token=api_token)
+    config = find_config_in_parents()
 
-        scan = client.upload_scan(
-            project_id=project_id,
-            url=url,
-            scan_data=scan_results,
-            cli_version=cli_version
-        )
+    if not config or not config.is_linked():
+        baseline = Future()
+        baseline.set_result(None)
+        return baseline
 
-        print(f'\n[green]✨ Results synced to \'{project_name}\'[/green]')
-        print(f'[dim]   View: https://caniscrape.org/projects/{project_id}[/dim]')
-        return True
-    except ApiError as e:
-        error_msg = str(e)
-        
-        if 'Authentication failed' in error_msg or 'expired' in error_msg.lower():
-            print(f'\n[yellow]⚠️  Upload failed: API token expired[/yellow]')
-            print(f'[dim]   Run [cyan]caniscrape init[/cyan] to re-authenticate[/dim]')
-        elif 'Rate limit' in error_msg:
-            print(f'\n[yellow]⚠️  Upload failed: Rate limit exceeded[/yellow]')
-            print(f'[dim]   Results cached. Try again later.[/dim]')
-        else:
-            print(f'\n[yellow]⚠️  Upload failed: {error_msg}[/yellow]')
-        
-        return False
-    except Exception:
-        return False
+    client = get_api_client(api_endpoint=config.get_api_endpoint(), api_token=config.get_api_token())
+    return run_async(client.async_client.get_latest_scan(project_id=config.get_project_id(), url=url))
 
-def check_for_diff(url: str) -> dict | None:
+def wait_for_diff_baseline(baseline: Future | None, timeout: float = DIFF_BASELINE_WAIT) -> dict | None:
     """
-    Check if there's a previous scan to compare against.
+    The previous scan from `prefetch_diff_baseline`, or None if there is none, the lookup failed, or it
+    is not back within `timeout` seconds (the report is not held up for the diff).
     """
-    config = find_config_in_parents()
-
-    if not config or not config.is_linked():
+    if baseline is None:
         return None
-    
     try:
-        project_id = config.get_project_id()
-        api_token = config.get_api_token()
-        api_endpoint = config.get_api_endpoint()
-        
-        client = ApiClient(api_endpoint=api_endpoint, api_token=api_token)
-
-        previous_scan = client.get_latest_scan(project_id=project_id, url=url)
-        return previous_scan
-    except:
-        return None
\ No newline at end of file
+        return baseline.result(timeout=timeout)
+    except FutureTimeoutError:
+        baseline.cancel()
+        return None
+    except Exception:
+        return None
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Iterator
+from playwright.sync_api import Playwright, Browser, BrowserContext, Response
+
+from .playwright_proxy_parser import parse_proxy_for_playwright
+from .scan_capture import get_active_capture
+from .response_log import get_response_log
+
+def launch_browser(p: Playwright, browser_endpoint: str | None = None) -> Browser:
+    """
+    Launches a local headless Chromium, or attaches to an existing one if an endpoint is given.
+
+    Supports endpoints:
+    - http(s)://host:port or ws(s)://host:port/devtools/browser/<id> (Chrome DevTools Protocol)
+    - ws(s)://host:port/<path> (Playwright browser server, see `launchServer`)
+    """
+    if not browser_endpoint:
+        return p.chromium.launch(headless=True)
+
+    if browser_endpoint.startswith(('http://', 'https://')) or '/devtools/browser/' in browser_endpoint:
+        return p.chromium.connect_over_cdp(browser_endpoint)
+
+    return p.chromium.connect(browser_endpoint)
+
+@contextmanager
+def open_browser(p: Playwright, browser_endpoint: str | None = None) -> Iterator[Browser]:
+    """
+    Context manager around launch_browser().
+    On exit a launched browser is closed, while an attached browser only has the
+    contexts created by this scan cleared before disconnecting.
+    """
+    browser = launch_browser(p, browser_endpoint)
+    try:
+        yield browser
+    finally:
+        try:
+            browser.close()
+        except Exception:
+            pass
+
+def build_context_options(proxy: str | None = None, **options) -> dict:
+    """
+    Builds keyword arguments for browser.new_context(), applying the proxy per context
+    so it also works on browsers that were launched elsewhere.
+    """
+    if proxy:
+        proxy_config = parse_proxy_for_playwright(proxy)
+        if proxy_config:
+            options['proxy'] = proxy_config
+    return options
+
+def _log_document_response(analyzer: str, response: Response) -> None:
+    """
+    Adds top-level document responses to the response log (headers only, reading bodies here would block the event loop).
+    """
+    try:
+        request = response.request
+        if request.resource_type == 'document' and request.frame.parent_frame is None:
+            get_response_log().record(analyzer, response.url, response.status, response.headers)
+    except Exception:
+        pass
+
+@contextmanager
+def open_context(browser: Browser, analyzer: str, proxy: str | None = None, **options) -> Iterator[BrowserContext]:
+    """
+    Opens a fresh browser context for an analyzer and closes it on exit.
+    When a capture is active the context's traffic is recorded to, or replayed from, a HAR file.
+    Main document responses and the cookies set during the context are added to the response log.
+    """
+    capture = get_active_capture()
+    har_path = capture.next_har_path(analyzer) if capture else None
+
+    if capture and capture.recording:
+        har_path.parent.mkdir(parents=True, exist_ok=True)
+        options['record_har_path'] = str(har_path)
+        options['record_har_content'] = 'embed'
+
+    context = browser.new_context(**build_context_options(proxy, **options))
+    context.on('response', lambda response: _log_document_response(analyzer, response))
+    try:
+        if capture and capture.replaying:
+            if har_path.exists():
+                context.route_from_har(har_path, not_found='abort')
+            else:
+                context.route('**/*', lambda route: route.abort())
+        yield context
+    finally:
+        try:
+            get_response_log().record_cookies(cookie['name'] for cookie in context.cookies())
+        except Exception:
+            pass
+        try:
+            context.close()
+        except Exception:
+            pass
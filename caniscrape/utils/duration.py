@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import re
+
+UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+_DURATION_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*$', re.IGNORECASE)
+
+def parse_duration(text: str) -> int:
+    """
+    Parses '90', '90s', '30m', '6h', '2d' or '1w' into seconds. Plain numbers are seconds.
+    """
+    match = _DURATION_RE.match(str(text))
+    if not match:
+        raise ValueError(f"Invalid duration '{text}'. Use a number with an optional unit, e.g. 30m, 6h or 2d.")
+    value, unit = match.groups()
+    return int(float(value) * UNITS[unit.lower() or 's'])
+
+def format_duration(seconds: float) -> str:
+    """
+    Short human form of a duration, using the largest unit that fits: 45s, 12m, 6h, 2d.
+    """
+    seconds = int(seconds)
+    for unit, size in (('w', UNITS['w']), ('d', UNITS['d']), ('h', UNITS['h']), ('m', UNITS['m'])):
+        if seconds >= size:
+            return f'{seconds // size}{unit}'
+    return f'{seconds}s'
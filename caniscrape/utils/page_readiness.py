@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import time
+from playwright.sync_api import Page, Request
+
+DEFAULT_MIN_QUIET_MS = 500
+DEFAULT_MAX_QUIET_MS = 2000
+# Never wait longer than the fixed sleeps this replaced (2-3s), even on pages whose DOM keeps changing.
+DEFAULT_MAX_WAIT_MS = 3000
+DEFAULT_POLL_INTERVAL_MS = 100
+
+# Requests that stay open longer than this (long-polling, analytics beacons, streams)
+# are treated as background traffic and don't keep the page "busy".
+LONG_REQUEST_MS = 5000
+
+MUTATION_OBSERVER_SCRIPT = """
+(() => {
+    if (window.__caniscrape_last_mutation !== undefined) {
+        return;
+    }
+    window.__caniscrape_last_mutation = performance.now();
+
+    const observer = new MutationObserver(() => {
+        window.__caniscrape_last_mutation = performance.now();
+    });
+    const start = () => observer.observe(document.documentElement || document, {
+        childList: true,
+        subtree: true,
+        attributes: true,
+        characterData: true
+    });
+
+    if (document.documentElement) {
+        start();
+    } else {
+        document.addEventListener('readystatechange', start, { once: true });
+    }
+})();
+"""
+
+DOM_IDLE_SCRIPT = """
+() => window.__caniscrape_last_mutation === undefined ? null : performance.now() - window.__caniscrape_last_mutation
+"""
+
+class PageReadinessTracker:
+    """
+    Watches in-flight requests and DOM mutations on a page and waits until the page
+    has been quiet for an adaptive window, instead of sleeping for a fixed time.
+
+    Must be created before navigation so the first requests and mutations are seen.
+    """
+    def __init__(
+        self,
+        page: Page,
+        min_quiet_ms: int = DEFAULT_MIN_QUIET_MS,
+        max_quiet_ms: int = DEFAULT_MAX_QUIET_MS,
+        max_wait_ms: int = DEFAULT_MAX_WAIT_MS,
+        poll_interval_ms: int = DEFAULT_POLL_INTERVAL_MS
+    ):
+        self.page = page
+        self.min_quiet_ms = min_quiet_ms
+        self.max_quiet_ms = max_quiet_ms
+        self.max_wait_ms = max_wait_ms
+        self.poll_interval_ms = poll_interval_ms
+
+        self.quiet_window_ms = min_quiet_ms
+        self.waited_ms = 0
+
+        self._in_flight: dict[Request, float] = {}
+        self._last_network_activity = time.monotonic()
+
+        page.on('request', self._on_request)
+        page.on('requestfinished', self._on_request_done)
+        page.on('requestfailed', self._on_request_done)
+        page.add_init_script(MUTATION_OBSERVER_SCRIPT)
+
+    def _on_request(self, request: Request) -> None:
+        now = time.monotonic()
+        self._in_flight[request] = now
+        self._last_network_activity = now
+
+    def _on_request_done(self, request: Request) -> None:
+        self._in_flight.pop(request, None)
+        self._last_network_activity = time.monotonic()
+
+    def _network_idle_ms(self, now: float) -> float:
+        """
+        Milliseconds since the last network activity, or 0 if a request is still loading.
+        """
+        for started_at in self._in_flight.values():
+            if (now - started_at) * 1000 < LONG_REQUEST_MS:
+                return 0
+        return (now - self._last_network_activity) * 1000
+
+    def _dom_idle_ms(self) -> float:
+        """
+        Milliseconds since the last DOM mutation, or 0 if the page can't be inspected right now.
+        """
+        try:
+            idle = self.page.evaluate(DOM_IDLE_SCRIPT)
+        except Exception:
+            return 0
+
+        if idle is None:
+            # The init script didn't run on this document (e.g. tracker attached late).
+            try:
+                self.page.evaluate(MUTATION_OBSERVER_SCRIPT)
+            except Exception:
+                pass
+            return 0
+        return idle
+
+    def wait_until_quiet(self) -> int:
+        """
+        Blocks until there has been no network or DOM activity for the quiet window,
+        or until max_wait_ms has passed. Returns how long it actually waited in ms.
+
+        Every time the page goes quiet and then becomes active again, the quiet window
+        grows to cover that gap, so pages that load content in delayed bursts get a
+        longer window while static pages return after min_quiet_ms.
+        """
+        start = time.monotonic()
+        previous_quiet_ms = 0.0
+
+        while True:
+            now = time.monotonic()
+            elapsed_ms = (now - start) * 1000
+            if elapsed_ms >= self.max_wait_ms:
+                break
+
+            quiet_ms = min(self._network_idle_ms(now), self._dom_idle_ms())
+
+            if quiet_ms < previous_quiet_ms and previous_quiet_ms >= self.poll_interval_ms:
+                self.quiet_window_ms = min(self.max_quiet_ms, max(self.quiet_window_ms, previous_quiet_ms * 1.5))
+            previous_quiet_ms = quiet_ms
+
+            if quiet_ms >= self.quiet_window_ms:
+                break
+
+            self.page.wait_for_timeout(self.poll_interval_ms)
+
+        self.waited_ms = int((time.monotonic() - start) * 1000)
+        return self.waited_ms
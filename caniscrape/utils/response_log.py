@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import re
+import threading
+from typing import Any, NamedTuple
+
+from .scan_capture import get_active_capture
+
+MAX_RESPONSES = 500
+MAX_BODY_CHARS = 65536
+
+SET_COOKIE_NAME_RE = re.compile(r'(?:^|,\s*)([^=;,\s]+)=')
+
+class ObservedResponse(NamedTuple):
+    source: str
+    url: str
+    status_code: int
+    headers: tuple[tuple[str, str], ...]
+    text: str
+
+def _header_pairs(headers: Any) -> tuple[tuple[str, str], ...]:
+    """
+    Normalizes aiohttp, curl_cffi, requests and Playwright headers to lower-cased (name, value) pairs,
+    keeping repeated headers such as Set-Cookie.
+    """
+    if not headers:
+        return ()
+    if hasattr(headers, 'multi_items'):
+        items = headers.multi_items()
+    elif hasattr(headers, 'items'):
+        items = headers.items()
+    else:
+        items = headers
+    return tuple((str(name).lower(), str(value)) for name, value in items)
+
+class ResponseLog:
+    """
+    In-memory log of the responses the analyzers received during the current scan,
+    so later analyzers can inspect them without making new requests.
+    Bodies are truncated and the number of responses is capped to bound memory.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._responses: list[ObservedResponse] = []
+        self._cookie_names: set[str] = set()
+
+    def record(self, source: str, url: str, status_code: int, headers: Any = None, text: str | None = None) -> None:
+        pairs = _header_pairs(headers)
+        if not pairs and not text:
+            return
+
+        response = ObservedResponse(source, url, status_code, pairs, (text or '')[:MAX_BODY_CHARS])
+        with self._lock:
+            if len(self._responses) < MAX_RESPONSES:
+                self._responses.append(response)
+            for name, value in pairs:
+                if name == 'set-cookie':
+                    self._cookie_names.update(SET_COOKIE_NAME_RE.findall(value))
+
+    def record_cookies(self, names) -> None:
+        with self._lock:
+            self._cookie_names.update(names)
+
+    @property
+    def responses(self) -> list[ObservedResponse]:
+        with self._lock:
+            return list(self._responses)
+
+    @property
+    def cookie_names(self) -> set[str]:
+        with self._lock:
+            return set(self._cookie_names)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._responses.clear()
+            self._cookie_names.clear()
+
+_response_log: ResponseLog | None = None
+
+def get_response_log() -> ResponseLog:
+    """
+    Get or create the global response log.
+    """
+    global _response_log
+    if _response_log is None:
+        _response_log = ResponseLog()
+    return _response_log
+
+def observe_response(source: str, url: str, status_code: int, headers: Any = None, text: str | None = None) -> None:
+    """
+    Records a response an analyzer received: always in the response log, and in the active capture when recording.
+    """
+    get_response_log().record(source, url, status_code, headers, text)
+
+    capture = get_active_capture()
+    if capture:
+        capture.record_response(source, url, status_code, headers, text or '')
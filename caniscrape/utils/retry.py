@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, TypeVar
+
+T = TypeVar('T')
+
+DEFAULT_ATTEMPTS = 5
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 30.0
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Seconds to wait from a Retry-After header, which is either a number of seconds or an HTTP date.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+def backoff_delay(attempt: int, base_delay: float = DEFAULT_BASE_DELAY, max_delay: float = DEFAULT_MAX_DELAY) -> float:
+    """
+    Exponential backoff with full jitter: a random delay between 0 and base * 2^attempt, capped at max_delay.
+    Spreading retries out keeps many workers from hitting a recovering server at the same moment.
+    """
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+def retry_call(
+    func: Callable[[], T],
+    should_retry: Callable[[Exception], bool],
+    retry_after: Callable[[Exception], float | None] = lambda e: None,
+    attempts: int = DEFAULT_ATTEMPTS,
+    base_delay: float = DEFAULT_BASE_DELAY,
+    max_delay: float = DEFAULT_MAX_DELAY,
+    sleep: Callable[[float], None] = time.sleep
+) -> T:
+    """
+    Calls `func` until it succeeds, an exception is not retryable, or `attempts` calls have failed
+    (the last exception is re-raised). A server-provided wait (`retry_after`) takes precedence over
+    the backoff delay, but is still capped at max_delay.
+    """
+    for attempt in range(attempts):
+        try:
+            return func()
+        except Exception as e:
+            if attempt == attempts - 1 or not should_retry(e):
+                raise
+            delay = retry_after(e)
+            if delay is None:
+                delay = backoff_delay(attempt, base_delay, max_delay)
+            sleep(min(delay, max_delay))
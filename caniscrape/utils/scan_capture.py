@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+from collections import deque
+from pathlib import Path
+from typing import Any
+from requests.structures import CaseInsensitiveDict
+
+class CaptureMissError(Exception):
+    """
+    Raised in replay mode when a request was never recorded.
+    """
+    pass
+
+class CapturedResponse:
+    """
+    A recorded HTTP response. Exposes the parts of curl_cffi and aiohttp
+    responses that the analyzers use, so it can stand in for either.
+    """
+    def __init__(self, url: str, status_code: int, headers: dict[str, str] | None = None, text: str = ''):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.text = text
+
+    @property
+    def status(self) -> int:
+        return self.status_code
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise Exception(f'HTTP Error {self.status_code} (replayed): {self.url}')
+
+    def to_dict(self) -> dict[str, Any]:
+        return {'url': self.url, 'status_code': self.status_code, 'headers': dict(self.headers), 'text': self.text}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CapturedResponse:
+        return cls(data['url'], data['status_code'], data.get('headers'), data.get('text', ''))
+
+class ScanCapture:
+    """
+    Records everything a scan fetched into a directory, or replays a scan from one.
+
+    Layout:
+    - har/<analyzer>.har      Playwright traffic (one file per browser context)
+    - http.json               raw curl_cffi/aiohttp probe responses, per analyzer, in request order
+    - results.json            results of tools that can't be replayed at the HTTP level (wafw00f)
+    """
+    HTTP_FILE = 'http.json'
+    RESULTS_FILE = 'results.json'
+    HAR_DIR = 'har'
+
+    def __init__(self, directory: str | Path, mode: str):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f'Unknown capture mode "{mode}". Use "record" or "replay".')
+
+        self.directory = Path(directory)
+        self.mode = mode
+        self._har_counts: dict[str, int] = {}
+        self._http: dict[str, list[dict[str, Any]]] = {}
+        self._results: dict[str, Any] = {}
+        self._replay_queues: dict[tuple[str, str], deque] = {}
+
+        if self.replaying:
+            if not self.directory.exists():
+                raise FileNotFoundError(f'Capture directory not found: {self.directory}')
+            self._http = self._read_json(self.HTTP_FILE)
+            self._results = self._read_json(self.RESULTS_FILE)
+            for analyzer, responses in self._http.items():
+                for response in responses:
+                    self._replay_queues.setdefault((analyzer, response['url']), deque()).append(response)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == 'record'
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    def _read_json(self, filename: str) -> dict:
+        path = self.directory / filename
+        if not path.exists():
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def next_har_path(self, analyzer: str) -> Path:
+        """
+        HAR file for the next browser context opened by an analyzer.
+        Contexts are numbered in creation order, which is the same when recording and replaying.
+        """
+        count = self._har_counts.get(analyzer, 0) + 1
+        self._har_counts[analyzer] = count
+        name = analyzer if count == 1 else f'{analyzer}-{count}'
+        return self.directory / self.HAR_DIR / f'{name}.har'
+
+    def record_response(self, analyzer: str, url: str, status_code: int, headers: dict[str, str] | None = None, text: str = '') -> None:
+        if not self.recording:
+            return
+        response = CapturedResponse(url, status_code, headers and dict(headers), text)
+        self._http.setdefault(analyzer, []).append(response.to_dict())
+
+    def replay_response(self, analyzer: str, url: str) -> CapturedResponse:
+        """
+        Returns the next recorded response for this analyzer and URL.
+        The last response is repeated if the analyzer asks for more than were recorded.
+        """
+        queue = self._replay_queues.get((analyzer, url))
+        if not queue:
+            raise CaptureMissError(f'No recorded {analyzer} response for {url}')
+
+        data = queue.popleft() if len(queue) > 1 else queue[0]
+        return CapturedResponse.from_dict(data)
+
+    def record_result(self, analyzer: str, result: dict[str, Any]) -> None:
+        if self.recording:
+            self._results[analyzer] = result
+
+    def replay_result(self, analyzer: str) -> dict[str, Any] | None:
+        return self._results.get(analyzer)
+
+    def save(self) -> None:
+        """
+        Write recorded probe responses and results. HAR files are written by Playwright
+        when each browser context closes.
+        """
+        if not self.recording:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for filename, data in ((self.HTTP_FILE, self._http), (self.RESULTS_FILE, self._results)):
+            with open(self.directory / filename, 'w') as f:
+                json.dump(data, f)
+
+_active_capture: ScanCapture | None = None
+
+def get_active_capture() -> ScanCapture | None:
+    """
+    Get the capture the current scan is recording to or replaying from, if any.
+    """
+    return _active_capture
+
+def set_active_capture(capture: ScanCapture | None) -> None:
+    """
+    Set (or clear, with None) the capture used by the analyzers.
+    """
+    global _active_capture
+    _active_capture = capture
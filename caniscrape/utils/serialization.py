@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=str)
+    return str(obj)
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """
+    Serialize scan results to UTF-8 JSON. Uses orjson when it is installed, and the standard library otherwise.
+    Values JSON has no type for (sets, datetimes, ...) are converted instead of raising.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, default=_default, option=option)
+
+    if pretty:
+        return json.dumps(obj, default=_default, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, default=_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def dumps_line(obj: Any) -> bytes:
+    """
+    Serialize one record as a compact NDJSON line (including the trailing newline).
+    """
+    return dumps(obj) + b'\n'
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+
+SHINGLE_SIZE = 4
+SIGNATURE_SIZE = 64
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=4).digest(), 'big')
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> set[int]:
+    """
+    Hashes every run of `size` consecutive words in the text.
+    Texts shorter than one shingle hash to a single value (or none, if empty).
+    """
+    words = text.lower().split()
+    if not words:
+        return set()
+    if len(words) <= size:
+        return {_hash(' '.join(words))}
+    return {_hash(' '.join(words[i:i + size])) for i in range(len(words) - size + 1)}
+
+def containment(part: set[int], whole: set[int]) -> float:
+    """
+    Fraction of `part` that is also present in `whole`.
+    """
+    if not part:
+        return 1.0
+    return len(part & whole) / len(part)
+
+def jaccard(a: set[int], b: set[int]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+def build_signature(hashes: set[int], size: int = SIGNATURE_SIZE) -> dict[str, any]:
+    """
+    Builds a bottom-k MinHash signature: the `size` smallest shingle hashes plus the shingle count.
+    It is a few hundred bytes regardless of page size, and is exact for pages with fewer shingles than `size`.
+    """
+    smallest = heapq.nsmallest(size, hashes)
+    return {
+        'shingles': len(hashes),
+        'minhash': ''.join(f'{h:08x}' for h in smallest),
+    }
+
+def _decode(signature: dict[str, any]) -> list[int]:
+    encoded = signature.get('minhash', '')
+    return [int(encoded[i:i + 8], 16) for i in range(0, len(encoded), 8)]
+
+def compare_signatures(a: dict[str, any], b: dict[str, any]) -> dict[str, float]:
+    """
+    Estimates the overlap between two texts from their signatures.
+
+    Returns:
+    - jaccard: shared shingles / all shingles
+    - a_in_b: fraction of a's shingles that also appear in b
+    - b_in_a: fraction of b's shingles that also appear in a
+    """
+    hashes_a, hashes_b = set(_decode(a)), set(_decode(b))
+    count_a, count_b = a.get('shingles', 0), b.get('shingles', 0)
+
+    if not count_a and not count_b:
+        return {'jaccard': 1.0, 'a_in_b': 1.0, 'b_in_a': 1.0}
+    if not count_a or not count_b:
+        return {'jaccard': 0.0, 'a_in_b': 0.0 if count_a else 1.0, 'b_in_a': 0.0 if count_b else 1.0}
+
+    k = min(len(hashes_a), len(hashes_b))
+    union_sample = heapq.nsmallest(k, hashes_a | hashes_b)
+    estimate = sum(1 for h in union_sample if h in hashes_a and h in hashes_b) / len(union_sample)
+
+    shared = estimate * (count_a + count_b) / (1 + estimate)
+    return {
+        'jaccard': round(estimate, 4),
+        'a_in_b': round(min(shared / count_a, 1.0), 4),
+        'b_in_a': round(min(shared / count_b, 1.0), 4),
+    }
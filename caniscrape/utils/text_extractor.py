@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+from html.parser import HTMLParser
+from typing import Callable
+
+SKIPPED_TAGS = ('script', 'style')
+LANDMARK_TAGS = frozenset({'header', 'nav', 'main', 'aside', 'footer', 'section', 'article', 'form', 'dialog'})
+VOID_TAGS = frozenset({'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source', 'track', 'wbr'})
+ROOT_REGION = 'body'
+
+def _normalize_text(text: str) -> str:
+    """
+    Strips the text and puts every space-separated chunk on its own line.
+    """
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split(' '))
+    return '\n'.join(chunk for chunk in chunks if chunk)
+
+class _VisibleTextParser(HTMLParser):
+    """
+    Streaming parser that collects text nodes outside <script> and <style>
+    without building a document tree.
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self.parts.append(data)
+
+def _claim_region(region_parts: dict[str, list[str]], tag: str, element_id: str | None) -> str | None:
+    """
+    Registers the region an element opens, if any: "tag#id" for elements with an id, or the tag name of a
+    landmark. Repeated keys get a ":2", ":3", ... suffix in document order.
+    """
+    if element_id:
+        key = f'{tag}#{element_id}'
+    elif tag in LANDMARK_TAGS:
+        key = tag
+    else:
+        return None
+
+    if key in region_parts:
+        n = 2
+        while f'{key}:{n}' in region_parts:
+            n += 1
+        key = f'{key}:{n}'
+    region_parts[key] = []
+    return key
+
+class _RegionTextParser(_VisibleTextParser):
+    """
+    Also attributes each text node to the innermost enclosing region:
+    a landmark element (header, nav, main, ...) or any element with an id.
+    """
+    def __init__(self):
+        super().__init__()
+        self.region_parts: dict[str, list[str]] = {ROOT_REGION: []}
+        self._stack: list[tuple[str, str | None]] = []
+        self._regions: list[str] = [ROOT_REGION]
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        super().handle_starttag(tag, attrs)
+        if tag in VOID_TAGS or tag in SKIPPED_TAGS:
+            return
+        region = _claim_region(self.region_parts, tag, dict(attrs).get('id'))
+        self._stack.append((tag, region))
+        if region:
+            self._regions.append(region)
+
+    def handle_startendtag(self, tag: str, attrs) -> None:
+        pass
+
+    def handle_endtag(self, tag: str) -> None:
+        super().handle_endtag(tag)
+        if not any(open_tag == tag for open_tag, _ in self._stack):
+            return
+        while self._stack:
+            open_tag, region = self._stack.pop()
+            if region:
+                self._regions.pop()
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self.parts.append(data)
+            self.region_parts[self._regions[-1]].append(data)
+
+def _extract_with_stream(html_content: str) -> str:
+    parser = _VisibleTextParser()
+    parser.feed(html_content)
+    parser.close()
+    return _normalize_text(''.join(parser.parts))
+
+def _extract_with_lxml(html_content: str) -> str:
+    from lxml import etree, html as lxml_html
+
+    parser = lxml_html.HTMLParser(encoding='utf-8', remove_comments=True, remove_pis=True)
+    root = lxml_html.document_fromstring(html_content.encode('utf-8'), parser=parser)
+    etree.strip_elements(root, *SKIPPED_TAGS, with_tail=False)
+    return _normalize_text(''.join(root.itertext()))
+
+def _extract_with_bs4(html_content: str) -> str:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, 'html.parser')
+
+    for script_or_style in soup(list(SKIPPED_TAGS)):
+        script_or_style.decompose()
+
+    return _normalize_text(soup.get_text())
+
+BACKENDS: dict[str, Callable[[str], str]] = {
+    'lxml': _extract_with_lxml,
+    'stream': _extract_with_stream,
+    'bs4': _extract_with_bs4,
+}
+
+def get_default_backend() -> str:
+    """
+    The fastest available backend: lxml (C parser) if installed, otherwise the streaming parser.
+    """
+    try:
+        import lxml.html
+        return 'lxml'
+    except ImportError:
+        return 'stream'
+
+def extract_visible_text(html_content: str | None, backend: str | None = None) -> str:
+    """
+    Parses HTML and extracts the clean, visible text (one chunk per line).
+    Falls back to BeautifulSoup if the selected backend fails on the document.
+    """
+    if not html_content:
+        return ''
+
+    backend = backend or get_default_backend()
+    extractor = BACKENDS.get(backend)
+    if extractor is None:
+        raise ValueError(f'Unknown text extraction backend "{backend}". Supported backends are: {list(BACKENDS.keys())}')
+
+    try:
+        return extractor(html_content)
+    except Exception:
+        if backend == 'bs4':
+            raise
+        return _extract_with_bs4(html_content)
+
+def _regions_with_stream(html_content: str) -> tuple[list[str], dict[str, list[str]]]:
+    parser = _RegionTextParser()
+    parser.feed(html_content)
+    parser.close()
+    return parser.parts, parser.region_parts
+
+def _regions_with_lxml(html_content: str) -> tuple[list[str], dict[str, list[str]]]:
+    from lxml import etree, html as lxml_html
+
+    parser = lxml_html.HTMLParser(encoding='utf-8', remove_comments=True, remove_pis=True)
+    root = lxml_html.document_fromstring(html_content.encode('utf-8'), parser=parser)
+    etree.strip_elements(root, *SKIPPED_TAGS, with_tail=False)
+
+    parts: list[str] = []
+    region_parts: dict[str, list[str]] = {ROOT_REGION: []}
+    regions = [ROOT_REGION]
+    opened: list[bool] = []
+
+    def add(text: str | None) -> None:
+        if text:
+            parts.append(text)
+            region_parts[regions[-1]].append(text)
+
+    for event, element in etree.iterwalk(root, events=('start', 'end')):
+        if event == 'start':
+            region = _claim_region(region_parts, element.tag, element.get('id')) if isinstance(element.tag, str) else None
+            opened.append(region is not None)
+            if region:
+                regions.append(region)
+            add(element.text)
+        else:
+            if opened.pop():
+                regions.pop()
+            add(element.tail)
+    return parts, region_parts
+
+# Region extraction for each text backend. bs4 has none of its own and uses the streaming parser.
+REGION_BACKENDS: dict[str, Callable[[str], tuple[list[str], dict[str, list[str]]]]] = {
+    'lxml': _regions_with_lxml,
+    'stream': _regions_with_stream,
+}
+
+def extract_visible_text_by_region(html_content: str | None, backend: str | None = None) -> tuple[str, dict[str, str]]:
+    """
+    Extracts the visible text of the whole page and of each DOM region in a single pass.
+    Text outside any region is attributed to "body"; regions without text are omitted.
+    Uses the same backend selection as extract_visible_text, falling back to the streaming parser.
+    """
+    if not html_content:
+        return '', {}
+
+    extractor = REGION_BACKENDS.get(backend or get_default_backend(), _regions_with_stream)
+    try:
+        parts, region_parts = extractor(html_content)
+    except Exception:
+        if extractor is _regions_with_stream:
+            raise
+        parts, region_parts = _regions_with_stream(html_content)
+
+    regions = {}
+    for key, texts in region_parts.items():
+        text = _normalize_text(''.join(texts))
+        if text:
+            regions[key] = text
+    return _normalize_text(''.join(parts)), regions
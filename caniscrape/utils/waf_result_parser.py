@@ -63,4 +63,13 @@ def parse_wafw00f_output(stdout: str, stderr: str = '') -> list[tuple[str, str |
             seen.add(key)
             out.append((name, manuf))
 
-    return out
\ No newline at end of file
+    return out
+
+def parse_wafw00f_name(plugin_name: str) -> tuple[str, str | None]:
+    """
+    Split a wafw00f plugin name such as 'Cloudflare (Cloudflare Inc.)' into (waf_name, manufacturer_or_None).
+    """
+    name, sep, manuf = plugin_name.partition(' (')
+    if not sep:
+        return plugin_name.strip(), None
+    return name.strip(), manuf.rstrip(')').strip() or None
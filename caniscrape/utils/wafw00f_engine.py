@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import threading
+import time
+from functools import lru_cache
+
+import requests
+
+from .waf_result_parser import parse_wafw00f_name
+
+DEFAULT_REQUEST_TIMEOUT = 7
+MAX_RESPONSE_SIZE = 100 * 1024
+
+class WafDetectionCancelled(Exception):
+    """
+    Raised inside wafw00f's request loop once the detection deadline has passed.
+    """
+    pass
+
+_thread_local = threading.local()
+
+def get_wafw00f_session() -> requests.Session:
+    """
+    Per-thread requests session reused by every wafw00f request, so probes to the same
+    host share a kept-alive connection instead of opening a new one each time.
+    """
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.verify = False
+        _thread_local.session = session
+    return session
+
+def is_wafw00f_available() -> bool:
+    try:
+        import wafw00f.main
+        return True
+    except ImportError:
+        return False
+
+@lru_cache(maxsize=1)
+def _engine_class() -> type:
+    """
+    Builds (once) a WAFW00F subclass whose requests go through a shared session and stop at a deadline.
+    """
+    try:
+        from wafw00f.main import WAFW00F
+    except ImportError:
+        raise ImportError('In-process WAF detection requires the "wafw00f" package. Please install it using "pip install wafw00f"')
+
+    class SessionWAFW00F(WAFW00F):
+        def __init__(self, target: str, session: requests.Session, deadline: float | None = None, **kwargs):
+            self.session = session
+            self.deadline = deadline
+            super().__init__(target, **kwargs)
+
+        def Request(self, headers=None, path=None, params={}, delay=0):
+            timeout = self.timeout
+            if self.deadline is not None:
+                remaining = self.deadline - time.monotonic()
+                if remaining <= 0:
+                    raise WafDetectionCancelled()
+                timeout = min(timeout, remaining)
+
+            try:
+                response = self.session.get(
+                    self.target, proxies=self.proxies, headers=headers or self.headers, timeout=timeout,
+                    allow_redirects=self.allowredir, params=params, verify=False, stream=True
+                )
+                chunks = []
+                bytes_read = 0
+                for chunk in response.iter_content(chunk_size=8192):
+                    chunks.append(chunk)
+                    bytes_read += len(chunk)
+                    if bytes_read >= MAX_RESPONSE_SIZE:
+                        break
+                response._content = b''.join(chunks)
+                response.close()
+                self.requestnumber += 1
+                return response
+            except requests.exceptions.RequestException as e:
+                # wafw00f treats a missing response as "blocked at connection level".
+                self.log.debug('Request failed: %s' % e)
+                return None
+
+    return SessionWAFW00F
+
+def run_wafw00f_library(url: str, find_all: bool = False, proxy: str | None = None, timeout: float | None = None) -> dict[str, any]:
+    """
+    Runs wafw00f's detection in this process and returns structured results.
+    Same checks as the command line tool: vendor signatures first, then generic detection
+    when nothing matched (or always, with find_all).
+    Raises WafDetectionCancelled if `timeout` seconds pass before detection finishes.
+    """
+    engine_class = _engine_class()
+    deadline = time.monotonic() + timeout if timeout else None
+    proxies = {'http': proxy, 'https': proxy} if proxy else None
+
+    attacker = engine_class(
+        url,
+        session=get_wafw00f_session(),
+        deadline=deadline,
+        proxies=proxies,
+        timeout=DEFAULT_REQUEST_TIMEOUT
+    )
+    if attacker.rq is None:
+        return {'status': 'error', 'message': 'Site appears to be down.'}
+
+    detected, _ = attacker.identwaf(find_all)
+    wafs = [parse_wafw00f_name(name) for name in detected]
+
+    result = {'status': 'success', 'wafs': wafs}
+    if find_all or not wafs:
+        if attacker.genericdetect():
+            if not wafs:
+                wafs.append(('Generic WAF', None))
+            result['generic_reason'] = attacker.knowledge['generic']['reason']
+
+    result['requests_sent'] = attacker.requestnumber
+    return result
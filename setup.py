@@ -39,6 +39,18 @@ setup(
         'capsolver>=1.0.7',
         '2captcha-python>=1.5.1',
     ],
+    extras_require={
+        # Faster backends, each used automatically when installed: lxml for text extraction,
+        # httpx with HTTP/2 for the cloud API client and zstandard for compressed uploads.
+        'fast': [
+            'lxml>=4.9.0',
+            'httpx[http2]>=0.24.0',
+            'zstandard>=0.19.0',
+        ],
+        'parquet': [
+            'pyarrow>=10.0.0',
+        ],
+    },
     entry_points={
         'console_scripts': [
             'caniscrape=caniscrape.cli:cli',